@@ -24,6 +24,7 @@ from telegram.ext import (
     filters,
 )
 
+from sentinel.utils import codec
 from sentinel.utils.logging_config import setup_logging
 
 matplotlib.use("Agg")
@@ -218,7 +219,7 @@ def extract_votos_lista(payload: dict) -> list[int]:
 
 def load_snapshot(path: Path) -> SnapshotRecord | None:
     try:
-        payload = json.loads(path.read_text(encoding="utf-8"))
+        payload = codec.load_path(path)
     except (OSError, json.JSONDecodeError) as exc:
         logger.error("snapshot_read_failed path=%s error=%s", path, exc)
         return None
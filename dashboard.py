@@ -12,6 +12,7 @@ from pathlib import Path
 import pandas as pd
 import streamlit as st
 
+from sentinel.utils import codec
 from sentinel.utils.logging_config import setup_logging
 
 setup_logging()
@@ -79,8 +80,7 @@ def safe_read_json(
 ) -> tuple[dict, str | None]:
     """Carga JSON con manejo de errores y mensaje uniforme."""
     try:
-        with path.open("r", encoding="utf-8") as handle:
-            return json.load(handle), None
+        return codec.load_path(path), None
     except FileNotFoundError as exc:
         return {}, handle_read_exception(label, path, exc, errors)
     except (OSError, json.JSONDecodeError) as exc:
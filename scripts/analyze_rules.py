@@ -1,16 +1,26 @@
 import collections
 import glob
+import hashlib
 import json
 import logging
 import math
 import os
+import shutil
 import sqlite3
 from datetime import datetime
 
+import numpy as np
 import pandas as pd
 from dateutil import parser
 
+from sentinel.core.rules import RuleRegistry, RuleRun, benford_first_digit, load_rule_settings
+from sentinel.utils import codec
 from sentinel.utils.logging_config import setup_logging
+
+try:
+    import pyarrow  # noqa: F401 - motor de DataFrame.to_parquet / read_parquet
+except ImportError:  # pragma: no cover - dependencia opcional
+    pyarrow = None
 # PROTOCOLO PROYECTO C.E.N.T.I.N.E.L. // AUDITORÍA RESILIENTE
 # Versión optimizada para datos históricos 2025 y futuros 2029
 
@@ -19,11 +29,28 @@ logger = logging.getLogger(__name__)
 
 RELATIVE_VOTE_CHANGE_PCT = float(os.getenv("RELATIVE_VOTE_CHANGE_PCT", "15"))
 SCRUTINIO_JUMP_PCT = float(os.getenv("SCRUTINIO_JUMP_PCT", "5"))
+AUDIT_INCREMENTAL = os.getenv("AUDIT_INCREMENTAL", "false").strip().lower() in {"1", "true", "yes"}
+AUDIT_STATE_PATH = os.getenv("AUDIT_STATE_PATH", "data/state/audit_state.json")
+AUDIT_STATE_VERSION = 2
+# Partes Parquet de registros antes de compactarlas en una sola.
+AUDIT_RECORD_PARTS_MAX = 64
+RECORD_COLUMNS = [
+    "timestamp",
+    "departamento",
+    "total_votes",
+    "actas_procesadas",
+    "actas_totales",
+    "porcentaje_escrutado",
+    "valid_votes",
+    "null_votes",
+    "blank_votes",
+]
+RECORD_FLOAT_COLUMNS = {"porcentaje_escrutado"}
+OUTLIER_COLUMNS = ["zscore_delta", "outlier_zscore", "outlier_iqr", "change_point"]
 
 def load_json(file_path):
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return codec.load_path(file_path)
     except Exception as e:
         logger.error("load_error file_path=%s error=%s", file_path, e)
         return None
@@ -186,6 +213,11 @@ def parse_timestamp(data, file_name):
     meta = data.get("meta") or data.get("metadata") or {}
     raw_ts = raw_ts or meta.get("timestamp_utc")
     if raw_ts:
+        # ISO 8601 (lo que escriben normalize y download_and_hash) sin pasar por dateutil.
+        try:
+            return datetime.fromisoformat(str(raw_ts).replace("Z", "+00:00"))
+        except ValueError:
+            pass
         try:
             return parser.parse(raw_ts)
         except (ValueError, TypeError):
@@ -287,28 +319,9 @@ def extract_department_records(data, file_name):
             })
     return records
 
-def apply_benford_law(votos_lista):
+def apply_benford_law(votos_lista, min_samples=10, min_first_digit_pct=20.0):
     """Analiza la distribución del primer dígito (Ley de Benford)."""
-    # Solo procesamos si hay suficientes datos para evitar falsos positivos
-    if len(votos_lista) < 10: 
-        return None
-
-    first_digits = []
-    for c in votos_lista:
-        votos_str = str(c.get('votos') or c.get("votes") or '').strip()
-        if votos_str and votos_str not in ['0', 'None']:
-            first_digits.append(int(votos_str[0]))
-    
-    if not first_digits: return None
-    
-    counts = collections.Counter(first_digits)
-    total = len(first_digits)
-    
-    # Análisis de anomalía: el '1' debe ser ~30%. Si es < 20%, se marca como sospecha.
-    dist_1 = (counts[1] / total) * 100
-    is_anomaly = dist_1 < 20.0
-    
-    return {"is_anomaly": is_anomaly, "prop_1": dist_1}
+    return benford_first_digit(votos_lista, min_samples, min_first_digit_pct)
 
 def check_arithmetic_consistency(data, file_name):
     totals = data.get("totals") or {}
@@ -393,76 +406,219 @@ def build_prediction(series_df, trend_metrics):
         "interval_95": interval,
     }
 
-def run_audit(target_directory='data/normalized'):
-    peak_votos = {}
-    anomalies_log = []
-    records = []
-    relative_threshold = float(os.getenv("RELATIVE_DELTA_THRESHOLD", "10.0"))
-    scrutiny_jump_threshold = float(os.getenv("SCRUTINY_JUMP_THRESHOLD", "5.0"))
-
-    file_list = sorted(glob.glob(os.path.join(target_directory, '*.json')))
-    if not file_list:
-        logger.warning("no_files_found target_directory=%s", target_directory)
-        return
-
-    logger.info(
-        "processing_snapshots count=%s target_directory=%s",
-        len(file_list),
-        target_directory,
-    )
-
-    for file_path in file_list:
-        data = load_json(file_path)
-        if not data:
-            continue
-
+def load_documents(target_directory, names=None):
+    """Lee los snapshots normalizados como [(file_name, data)] ordenados por nombre."""
+    documents = []
+    for file_path in sorted(glob.glob(os.path.join(target_directory, '*.json'))):
         file_name = os.path.basename(file_path)
-        votos_actuales = data.get('votos') or data.get('candidates') or []
-        records.extend(extract_department_records(data, file_name))
+        if names is not None and file_name not in names:
+            continue
+        documents.append((file_name, load_json(file_path)))
+    return documents
 
-        arithmetic_issue = check_arithmetic_consistency(data, file_name)
-        if arithmetic_issue:
-            anomalies_log.append(arithmetic_issue)
+def file_fingerprint(file_path):
+    """Huella barata (mtime_ns, tamaño) para detectar archivos modificados."""
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
 
-        breakdown_issues = check_vote_breakdown_consistency(data, file_name)
-        if breakdown_issues:
-            anomalies_log.extend(breakdown_issues)
+def load_audit_state(state_path, settings):
+    if not state_path or not os.path.exists(state_path):
+        return None
+    try:
+        with open(state_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning("audit_state_load_failed path=%s error=%s", state_path, e)
+        return None
+    # Los umbrales y reglas activas cambian el resultado: con otra configuración no sirve.
+    if state.get("version") != AUDIT_STATE_VERSION or state.get("settings") != settings:
+        return None
+    records_dir, flags_dir = _state_dirs(state_path)
+    expected = [os.path.join(records_dir, name) for name in state["record_parts"]]
+    expected += [os.path.join(flags_dir, _flags_file(dept)) for dept in state["departments"]]
+    if not all(os.path.exists(path) for path in expected):
+        logger.warning("audit_state_incomplete path=%s", state_path)
+        return None
+    return state
+
+def save_audit_state(state_path, state):
+    os.makedirs(os.path.dirname(state_path) or ".", exist_ok=True)
+    tmp_path = f"{state_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(tmp_path, state_path)
+
+def plan_incremental(state, fingerprints):
+    """
+    Devuelve los archivos nuevos a procesar, o None si hace falta una corrida completa.
+
+    El estado solo es reutilizable si los archivos ya procesados siguen intactos y los
+    nuevos van después en orden de nombre (peak_votos depende del orden de archivos).
+    """
+    if state is None:
+        return None
+    processed = state["files"]
+    for file_name, entry in processed.items():
+        if entry["fingerprint"] is None or fingerprints.get(file_name) != entry["fingerprint"]:
+            return None
+    new_files = [name for name in sorted(fingerprints) if name not in processed]
+    if processed and new_files and new_files[0] < max(processed):
+        return None
+    return new_files
+
+def records_frame(records):
+    """
+    Registros de departamento como DataFrame de columnas tipadas (enteros y floats anulables).
+
+    timestamp queda en texto ISO 8601: así se guarda en Parquet y se parsea de una vez
+    con restore_record_dtypes.
+    """
+    columns = {name: [record[name] for record in records] for name in RECORD_COLUMNS}
+    frame = {"timestamp": [value.isoformat() for value in columns["timestamp"]]}
+    frame["departamento"] = pd.array(columns["departamento"], dtype=object)
+    for name in RECORD_COLUMNS[2:]:
+        frame[name] = pd.array(columns[name], dtype="Float64" if name in RECORD_FLOAT_COLUMNS else "Int64")
+    return pd.DataFrame(frame, columns=RECORD_COLUMNS)
+
+def restore_record_dtypes(frame):
+    """
+    Tipos que tendría pd.DataFrame(registros): con nulos un entero pasa a float y una
+    columna sin valores queda como object con None. El tipo de cada columna depende de
+    todo el historial, por eso se decide al armar el frame completo.
+    """
+    restored = {
+        "timestamp": pd.to_datetime(frame["timestamp"], format="ISO8601"),
+        "departamento": frame["departamento"].astype(object),
+    }
+    for name in RECORD_COLUMNS[2:]:
+        column = frame[name]
+        missing = column.isna()
+        if missing.all():
+            restored[name] = pd.Series([None] * len(column), index=column.index, dtype=object)
+        elif missing.any() or name in RECORD_FLOAT_COLUMNS:
+            restored[name] = column.astype("float64")
+        else:
+            restored[name] = column.astype("int64")
+    return pd.DataFrame(restored, columns=RECORD_COLUMNS)
+
+def _state_dirs(state_path):
+    root = os.path.splitext(state_path)[0]
+    return f"{root}_records", f"{root}_flags"
+
+def _flags_file(departamento):
+    return hashlib.sha256(departamento.encode("utf-8")).hexdigest()[:16] + ".parquet"
+
+def append_record_part(state, state_path, frame):
+    """Agrega los registros nuevos como una parte Parquet; compacta al pasar AUDIT_RECORD_PARTS_MAX."""
+    records_dir, _ = _state_dirs(state_path)
+    os.makedirs(records_dir, exist_ok=True)
+    parts = state["record_parts"]
+    if len(parts) >= AUDIT_RECORD_PARTS_MAX:
+        frame = pd.concat([load_record_parts(state, state_path), frame], ignore_index=True)
+        for name in parts:
+            os.remove(os.path.join(records_dir, name))
+        parts.clear()
+    name = f"part-{state['next_part']:06d}.parquet"
+    state["next_part"] += 1
+    frame.to_parquet(os.path.join(records_dir, name), index=False)
+    parts.append(name)
+
+def load_record_parts(state, state_path):
+    records_dir, _ = _state_dirs(state_path)
+    frames = [pd.read_parquet(os.path.join(records_dir, name)) for name in state["record_parts"]]
+    if not frames:
+        return records_frame([])
+    return pd.concat(frames, ignore_index=True)
+
+def save_department_flags(state_path, departamento, flags):
+    _, flags_dir = _state_dirs(state_path)
+    os.makedirs(flags_dir, exist_ok=True)
+    frame = pd.DataFrame({
+        "zscore_delta": pd.array(flags["zscore_delta"], dtype="Float64"),
+        **{column: pd.array(flags[column], dtype="boolean") for column in OUTLIER_COLUMNS[1:]},
+    })
+    path = os.path.join(flags_dir, _flags_file(departamento))
+    tmp_path = f"{path}.tmp"
+    frame.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+def load_department_flags(state_path, departamento):
+    _, flags_dir = _state_dirs(state_path)
+    frame = pd.read_parquet(os.path.join(flags_dir, _flags_file(departamento)))
+    flags = {column: frame[column].astype(object).tolist() for column in OUTLIER_COLUMNS}
+    flags["zscore_delta"] = [None if pd.isna(value) else value for value in flags["zscore_delta"]]
+    return flags
+
+RULES = RuleRegistry()
+
+@RULES.register("arithmetic_mismatch", anomaly_type="ARITHMETIC_MISMATCH", scope="snapshot")
+def _rule_arithmetic_mismatch(data, file_name, peak_votos, params):
+    issue = check_arithmetic_consistency(data, file_name)
+    return [issue] if issue else []
+
+@RULES.register("vote_breakdown_mismatch", anomaly_type="VOTE_BREAKDOWN_MISMATCH", scope="snapshot")
+def _rule_vote_breakdown_mismatch(data, file_name, peak_votos, params):
+    return check_vote_breakdown_consistency(data, file_name)
+
+@RULES.register("negative_delta", anomaly_type="NEGATIVE_DELTA", scope="snapshot")
+def _rule_negative_delta(data, file_name, peak_votos, params):
+    anomalies_log = []
+    for c in data.get('votos') or data.get('candidates') or []:
+        c_id = str(c.get('id') or c.get('candidate_id') or c.get('nombre') or c.get("name") or 'unknown')
+        v_actual = safe_int(c.get('votos') or c.get("votes"))
+
+        if c_id in peak_votos:
+            if v_actual < peak_votos[c_id]['valor']:
+                diff = v_actual - peak_votos[c_id]['valor']
+                logger.warning(
+                    "negative_delta candidate_id=%s loss=%s file=%s",
+                    c_id,
+                    diff,
+                    file_name,
+                )
+                anomalies_log.append({
+                    "file": file_name,
+                    "type": "NEGATIVE_DELTA",
+                    "entity": c_id,
+                    "loss": diff
+                })
 
-        for c in votos_actuales:
-            c_id = str(c.get('id') or c.get('candidate_id') or c.get('nombre') or c.get("name") or 'unknown')
-            v_actual = safe_int(c.get('votos') or c.get("votes"))
-
-            if c_id in peak_votos:
-                if v_actual < peak_votos[c_id]['valor']:
-                    diff = v_actual - peak_votos[c_id]['valor']
-                    logger.warning(
-                        "negative_delta candidate_id=%s loss=%s file=%s",
-                        c_id,
-                        diff,
-                        file_name,
-                    )
-                    anomalies_log.append({
-                        "file": file_name,
-                        "type": "NEGATIVE_DELTA",
-                        "entity": c_id,
-                        "loss": diff
-                    })
-
-            if c_id not in peak_votos or v_actual > peak_votos[c_id]['valor']:
-                peak_votos[c_id] = {'valor': v_actual, 'file': file_name}
-
-        benford = apply_benford_law(votos_actuales)
-        if benford and benford['is_anomaly']:
-            logger.warning(
-                "benford_anomaly file=%s prop_1=%s",
-                file_name,
-                f"{benford['prop_1']:.1f}",
-            )
-
-    if not records:
-        logger.warning("no_department_records")
-        return
+        if c_id not in peak_votos or v_actual > peak_votos[c_id]['valor']:
+            peak_votos[c_id] = {'valor': v_actual, 'file': file_name}
+    return anomalies_log
+
+@RULES.register("benford", anomaly_type="BENFORD_ANOMALY", scope="snapshot")
+def _rule_benford(data, file_name, peak_votos, params):
+    # Solo se registra en el log: no forma parte de anomalies_report.json.
+    benford = apply_benford_law(
+        data.get('votos') or data.get('candidates') or [],
+        min_samples=params["min_samples"],
+        min_first_digit_pct=params["min_first_digit_pct"],
+    )
+    if benford and benford['is_anomaly']:
+        logger.warning(
+            "benford_anomaly file=%s prop_1=%s",
+            file_name,
+            f"{benford['prop_1']:.1f}",
+        )
+    return []
 
+def process_document(data, file_name, peak_votos, rule_run=None):
+    """Reglas por archivo; actualiza peak_votos y devuelve (registros, anomalías)."""
+    rule_run = rule_run or RuleRun(RULES)
+    records = extract_department_records(data, file_name)
+    anomalies_log = []
+    for rule in rule_run.enabled("snapshot"):
+        with rule_run.measure(rule.name, rows=1) as stats:
+            found = rule.func(data, file_name, peak_votos, rule_run.params(rule.name))
+            stats.hits += len(found)
+        anomalies_log.extend(found)
+    return records, anomalies_log
+
+def build_department_frame(records):
     df = pd.DataFrame(records)
     df = df.sort_values(["departamento", "timestamp"]).reset_index(drop=True)
     df["delta_votes"] = df.groupby("departamento")["total_votes"].diff()
@@ -478,114 +634,357 @@ def run_audit(target_directory='data/normalized'):
         df.loc[mask_scrutinio, "actas_procesadas"] / df.loc[mask_scrutinio, "actas_totales"] * 100
     )
     df["delta_escrutado"] = df.groupby("departamento")["porcentaje_escrutado_calc"].diff()
+    return df
+
+def compute_outlier_flags(df, sigma=3.0, zscore_limit=3.0, iqr_factor=1.5):
+    """
+    Columnas de outliers por fila para todo el frame, con estadísticas por departamento.
+
+    zscore_delta queda en None cuando el departamento no tiene deltas y en 0.0 cuando
+    su desviación es cero, igual que el cálculo por grupo.
+    """
+    delta = df["delta_votes"].astype(float)
+    grouped = delta.groupby(df["departamento"], sort=False)
+    count = grouped.transform("count").to_numpy()
+    mean = grouped.transform("mean").to_numpy()
+    std = np.where(count > 1, grouped.transform("std").to_numpy(), 0.0)
+    q1 = df["departamento"].map(grouped.quantile(0.25)).to_numpy(dtype=float)
+    q3 = df["departamento"].map(grouped.quantile(0.75)).to_numpy(dtype=float)
+    iqr = q3 - q1
+    values = delta.to_numpy()
+
+    has_delta = count > 0
+    has_std = has_delta & (std != 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        zscore = np.where(has_std, (values - mean) / np.where(has_std, std, 1.0), 0.0)
+        outlier_zscore = has_std & (np.abs(zscore) > zscore_limit)
+        outlier_iqr = has_delta & ((values < q1 - iqr_factor * iqr) | (values > q3 + iqr_factor * iqr))
+        change_point = has_std & (np.abs(values) > mean + sigma * std)
+
+    zscore = zscore.astype(object)
+    zscore[~has_delta] = None
+    return pd.DataFrame(
+        {
+            "zscore_delta": zscore.tolist(),
+            "outlier_zscore": outlier_zscore.tolist(),
+            "outlier_iqr": outlier_iqr.tolist(),
+            "change_point": change_point.tolist(),
+        },
+        index=df.index,
+        dtype=object,
+    )
 
-    anomalies = []
-    metrics_by_dept = {}
-    predictions = {}
+class RuleFrame:
+    """Vista del frame compartido por las reglas: columnas numéricas cacheadas y flags."""
+
+    def __init__(self, df, flags):
+        self.df = df
+        self.flags = flags
+        self._numeric = {}
+
+    def __len__(self):
+        return len(self.df)
+
+    def numeric(self, column):
+        if column not in self._numeric:
+            self._numeric[column] = pd.to_numeric(self.df[column], errors="coerce").to_numpy(dtype=float)
+        return self._numeric[column]
+
+    def flag(self, column):
+        return self.flags[column].to_numpy(dtype=bool)
+
+    def not_none(self, column):
+        # Los nulos en columnas numéricas son NaN (cuentan como presentes y "verdaderos");
+        # solo una columna object conserva None.
+        series = self.df[column]
+        if series.dtype != object:
+            return np.ones(len(series), dtype=bool)
+        return np.array([value is not None for value in series.to_numpy()], dtype=bool)
+
+# Reglas de frame: devuelven (máscara, constructor) donde el constructor recibe la
+# fila como dict de valores Python (solo las columnas declaradas) y arma los campos.
+
+@RULES.register("change_point", anomaly_type="CHANGE_POINT", scope="frame", columns=("delta_votes",))
+def _rule_change_point(frame, params):
+    return frame.flag("change_point"), lambda row: {"delta_votes": row["delta_votes"]}
+
+@RULES.register(
+    "outlier",
+    anomaly_type="OUTLIER",
+    scope="frame",
+    columns=("delta_votes", "outlier_zscore"),
+)
+def _rule_outlier(frame, params):
+    mask = frame.flag("outlier_zscore") | frame.flag("outlier_iqr")
+    return mask, lambda row: {
+        "delta_votes": row["delta_votes"],
+        "method": "zscore" if row["outlier_zscore"] else "iqr",
+    }
 
-    for departamento, group in df.groupby("departamento"):
-        group = group.copy()
-        delta_votes = group["delta_votes"].dropna()
-        if not delta_votes.empty:
-            mean_delta = delta_votes.mean()
-            std_delta = delta_votes.std(ddof=1) if len(delta_votes) > 1 else 0.0
-            q1 = delta_votes.quantile(0.25)
-            q3 = delta_votes.quantile(0.75)
-            iqr = q3 - q1
-
-            group["zscore_delta"] = (group["delta_votes"] - mean_delta) / std_delta if std_delta else 0.0
-            group["outlier_zscore"] = group["zscore_delta"].abs() > 3
-            group["outlier_iqr"] = (group["delta_votes"] < q1 - 1.5 * iqr) | (group["delta_votes"] > q3 + 1.5 * iqr)
-            group["change_point"] = group["delta_votes"].abs() > mean_delta + 3 * std_delta if std_delta else False
-        else:
-            group["zscore_delta"] = None
-            group["outlier_zscore"] = False
-            group["outlier_iqr"] = False
-            group["change_point"] = False
-
-        for _, row in group.iterrows():
-            if row["change_point"]:
-                anomalies.append({
-                    "departamento": departamento,
-                    "type": "CHANGE_POINT",
-                    "timestamp": row["timestamp"].isoformat(),
-                    "delta_votes": row["delta_votes"],
-                })
-            if row["outlier_zscore"] or row["outlier_iqr"]:
-                anomalies.append({
-                    "departamento": departamento,
-                    "type": "OUTLIER",
-                    "timestamp": row["timestamp"].isoformat(),
-                    "delta_votes": row["delta_votes"],
-                    "method": "zscore" if row["outlier_zscore"] else "iqr",
-                })
-            if (row["delta_votes"] or 0) > 0 and (row["delta_actas"] or 0) <= 0:
-                anomalies.append({
-                    "departamento": departamento,
-                    "type": "ACTAS_DESVIO",
-                    "timestamp": row["timestamp"].isoformat(),
-                    "delta_votes": row["delta_votes"],
-                    "delta_actas": row["delta_actas"],
-                })
-            if row.get("relative_change_pct") is not None:
-                if abs(row["relative_change_pct"]) >= RELATIVE_VOTE_CHANGE_PCT:
-                    anomalies.append({
-                        "departamento": departamento,
-                        "type": "RELATIVE_CHANGE",
-                        "timestamp": row["timestamp"].isoformat(),
-                        "delta_votes": row["delta_votes"],
-                        "relative_pct": row["relative_change_pct"],
-                        "threshold_pct": RELATIVE_VOTE_CHANGE_PCT,
-                    })
-            if row.get("delta_escrutado") is not None:
-                if row["delta_escrutado"] >= SCRUTINIO_JUMP_PCT:
-                    anomalies.append({
-                        "departamento": departamento,
-                        "type": "SCRUTINIO_SALTO",
-                        "timestamp": row["timestamp"].isoformat(),
-                        "delta_escrutado": row["delta_escrutado"],
-                        "threshold_pct": SCRUTINIO_JUMP_PCT,
-                    })
-            valid_votes = row.get("valid_votes")
-            null_votes = row.get("null_votes")
-            blank_votes = row.get("blank_votes")
-            if all(v is not None for v in [valid_votes, null_votes, blank_votes]):
-                total_votes = row.get("total_votes") or 0
-                sum_votes = (valid_votes or 0) + (null_votes or 0) + (blank_votes or 0)
-                if total_votes and sum_votes and total_votes != sum_votes:
-                    anomalies.append({
-                        "departamento": departamento,
-                        "type": "VOTOS_TOTALES_MISMATCH",
-                        "timestamp": row["timestamp"].isoformat(),
-                        "total_votes": total_votes,
-                        "sum_votes": sum_votes,
-                    })
-            if row.get("actas_totales"):
-                if row["actas_procesadas"] > row["actas_totales"]:
-                    anomalies.append({
-                        "departamento": departamento,
-                        "type": "ACTAS_OVERFLOW",
-                        "timestamp": row["timestamp"].isoformat(),
-                        "actas_procesadas": row["actas_procesadas"],
-                        "actas_totales": row["actas_totales"],
-                    })
+@RULES.register("actas_desvio", anomaly_type="ACTAS_DESVIO", scope="frame", columns=("delta_votes", "delta_actas"))
+def _rule_actas_desvio(frame, params):
+    with np.errstate(invalid="ignore"):
+        mask = (frame.numeric("delta_votes") > 0) & (frame.numeric("delta_actas") <= 0)
+    return mask, lambda row: {"delta_votes": row["delta_votes"], "delta_actas": row["delta_actas"]}
+
+@RULES.register(
+    "relative_change",
+    anomaly_type="RELATIVE_CHANGE",
+    scope="frame",
+    columns=("delta_votes", "relative_change_pct"),
+)
+def _rule_relative_change(frame, params):
+    threshold = params["threshold_pct"]
+    with np.errstate(invalid="ignore"):
+        mask = np.abs(frame.numeric("relative_change_pct")) >= threshold
+    return mask, lambda row: {
+        "delta_votes": row["delta_votes"],
+        "relative_pct": row["relative_change_pct"],
+        "threshold_pct": threshold,
+    }
+
+@RULES.register("scrutinio_salto", anomaly_type="SCRUTINIO_SALTO", scope="frame", columns=("delta_escrutado",))
+def _rule_scrutinio_salto(frame, params):
+    threshold = params["threshold_pct"]
+    with np.errstate(invalid="ignore"):
+        mask = frame.numeric("delta_escrutado") >= threshold
+    return mask, lambda row: {"delta_escrutado": row["delta_escrutado"], "threshold_pct": threshold}
+
+@RULES.register(
+    "votos_totales_mismatch",
+    anomaly_type="VOTOS_TOTALES_MISMATCH",
+    scope="frame",
+    columns=("total_votes", "valid_votes", "null_votes", "blank_votes"),
+)
+def _rule_votos_totales_mismatch(frame, params):
+    present = frame.not_none("valid_votes") & frame.not_none("null_votes") & frame.not_none("blank_votes")
+    total_votes = frame.numeric("total_votes")
+    sum_votes = frame.numeric("valid_votes") + frame.numeric("null_votes") + frame.numeric("blank_votes")
+    mask = present & (total_votes != 0) & (sum_votes != 0) & (total_votes != sum_votes)
+    return mask, lambda row: {
+        "total_votes": row["total_votes"] or 0,
+        "sum_votes": (row["valid_votes"] or 0) + (row["null_votes"] or 0) + (row["blank_votes"] or 0),
+    }
+
+@RULES.register(
+    "actas_overflow",
+    anomaly_type="ACTAS_OVERFLOW",
+    scope="frame",
+    columns=("actas_procesadas", "actas_totales"),
+)
+def _rule_actas_overflow(frame, params):
+    actas_totales = frame.numeric("actas_totales")
+    with np.errstate(invalid="ignore"):
+        mask = (actas_totales != 0) & (frame.numeric("actas_procesadas") > actas_totales)
+    return mask, lambda row: {
+        "actas_procesadas": row["actas_procesadas"],
+        "actas_totales": row["actas_totales"],
+    }
+
+def evaluate_department_rules(df, flags, rule_run=None):
+    """
+    Reglas de frame activas evaluadas en lote sobre todo el frame.
+
+    Devuelve {departamento: [anomalías]} con el mismo orden que recorrer cada
+    departamento fila por fila: por timestamp y, dentro de la fila, por regla.
+    """
+    rule_run = rule_run or RuleRun(RULES)
+    frame = RuleFrame(df, flags)
+    evaluated = []
+    for rule in rule_run.enabled("frame"):
+        with rule_run.measure(rule.name, rows=len(frame)) as stats:
+            mask, build = rule.func(frame, rule_run.params(rule.name))
+            stats.hits += int(mask.sum())
+        evaluated.append((rule, mask, build))
+    if not evaluated:
+        return {}
+
+    # Solo las filas con alguna anomalía se convierten a objetos Python, como en iterrows.
+    hit_rows = np.flatnonzero(np.logical_or.reduce([mask for _, mask, _ in evaluated]))
+    hit_frame = pd.concat([df.iloc[hit_rows], flags.iloc[hit_rows]], axis=1)
+    needed = {column for rule, _, _ in evaluated for column in rule.columns}
+    columns = {column: hit_frame[column].to_numpy(dtype=object) for column in needed}
+    departamentos = hit_frame["departamento"].to_numpy(dtype=object)
+    timestamps = [timestamp.isoformat() for timestamp in hit_frame["timestamp"]]
+
+    hits = []
+    for rank, (rule, mask, build) in enumerate(evaluated):
+        with rule_run.measure(rule.name):
+            for i in np.flatnonzero(mask[hit_rows]):
+                row = {column: columns[column][i] for column in rule.columns}
+                hits.append((i, rank, {
+                    "departamento": departamentos[i],
+                    "type": rule.anomaly_type,
+                    "timestamp": timestamps[i],
+                    **build(row),
+                }))
+    hits.sort(key=lambda hit: (hit[0], hit[1]))
+
+    anomalies_by_dept = {}
+    for _, _, anomaly in hits:
+        anomalies_by_dept.setdefault(anomaly["departamento"], []).append(anomaly)
+    return anomalies_by_dept
+
+def audit_departments(df, departments=None, rule_run=None):
+    """
+    Reglas de serie temporal para los departamentos indicados (todos si es None).
+
+    Devuelve {departamento: resultado} con anomalías, métricas de tendencia,
+    predicción y las columnas de outliers por fila (listas) para el frame global.
+    """
+    rule_run = rule_run or RuleRun(RULES)
+    if departments is not None:
+        df = df[df["departamento"].isin(departments)]
+    flags = compute_outlier_flags(
+        df,
+        sigma=rule_run.params("change_point")["sigma"],
+        zscore_limit=rule_run.params("outlier")["zscore"],
+        iqr_factor=rule_run.params("outlier")["iqr_factor"],
+    )
+    anomalies_by_dept = evaluate_department_rules(df, flags, rule_run)
 
+    results = {}
+    for departamento, group in df.groupby("departamento"):
         trend_metrics = compute_trend_metrics(group)
-        metrics_by_dept[departamento] = trend_metrics
-        prediction = build_prediction(group, trend_metrics)
-        if prediction:
-            predictions[departamento] = prediction
+        group_flags = flags.loc[group.index]
+        results[departamento] = {
+            "anomalies": anomalies_by_dept.get(departamento, []),
+            "metrics": trend_metrics,
+            "prediction": build_prediction(group, trend_metrics),
+            "flags": {column: group_flags[column].tolist() for column in OUTLIER_COLUMNS},
+        }
+    return results
+
+def run_audit(
+    target_directory='data/normalized',
+    documents=None,
+    incremental=None,
+    state_path=None,
+    rule_settings=None,
+):
+    """
+    Ejecuta la auditoría y devuelve el resultado escrito en analysis_results.json.
+
+    documents permite pasar [(file_name, data)] ya cargados en memoria en lugar de leer target_directory.
+    Con incremental=True solo se procesan los archivos nuevos respecto al estado persistido
+    en state_path; el resultado es idéntico al de una corrida completa.
+    rule_settings reemplaza la sección `rules` de config.yaml (ver sentinel.core.rules).
+    """
+    if incremental is None:
+        incremental = AUDIT_INCREMENTAL
+    if incremental and pyarrow is None:
+        logger.warning("audit_incremental_unavailable reason=pyarrow_missing")
+        incremental = False
+    state_path = state_path or AUDIT_STATE_PATH
+    rule_run = RuleRun(RULES, rule_settings if rule_settings is not None else load_rule_settings())
+
+    if documents is None:
+        file_names = [os.path.basename(path) for path in sorted(glob.glob(os.path.join(target_directory, '*.json')))]
+    else:
+        documents = dict(documents)
+        file_names = sorted(documents)
+    if not file_names:
+        logger.warning("no_files_found target_directory=%s", target_directory)
+        return None
+
+    fingerprints = {name: file_fingerprint(os.path.join(target_directory, name)) for name in file_names}
+    state = load_audit_state(state_path, rule_run.settings) if incremental else None
+    new_files = plan_incremental(state, fingerprints)
+    if new_files is None:
+        state = {
+            "version": AUDIT_STATE_VERSION,
+            "settings": rule_run.settings,
+            "files": {},
+            "peak_votos": {},
+            "dtypes": None,
+            "departments": {},
+            "record_parts": [],
+            "next_part": 0,
+        }
+        new_files = file_names
+        if incremental:
+            for directory in _state_dirs(state_path):
+                shutil.rmtree(directory, ignore_errors=True)
+
+    logger.info(
+        "processing_snapshots count=%s new=%s target_directory=%s",
+        len(file_names),
+        len(new_files),
+        target_directory,
+    )
+
+    if documents is None:
+        loaded = load_documents(target_directory, names=set(new_files))
+    else:
+        loaded = [(name, documents[name]) for name in new_files]
+
+    peak_votos = state["peak_votos"]
+    touched_departments = set()
+    new_records = []
+    for file_name, data in loaded:
+        file_records, file_anomalies = ([], []) if not data else process_document(data, file_name, peak_votos, rule_run)
+        touched_departments.update(record["departamento"] for record in file_records)
+        new_records.extend(file_records)
+        state["files"][file_name] = {
+            "fingerprint": fingerprints[file_name],
+            "anomalies": file_anomalies,
+        }
+
+    anomalies_log = []
+    for entry in state["files"].values():
+        anomalies_log.extend(entry["anomalies"])
+
+    # Los registros ya procesados se leen tipados desde Parquet; solo los nuevos se
+    # convierten desde dicts y se agregan como una parte más.
+    new_frame = records_frame(new_records)
+    if incremental:
+        if new_records:
+            append_record_part(state, state_path, new_frame)
+        stored = load_record_parts(state, state_path)
+    else:
+        stored = new_frame
+
+    if stored.empty:
+        logger.warning("no_department_records")
+        return None
+
+    df = build_department_frame(restore_record_dtypes(stored))
 
-        df.loc[group.index, "zscore_delta"] = group["zscore_delta"].values
-        df.loc[group.index, "outlier_zscore"] = group["outlier_zscore"].values
-        df.loc[group.index, "outlier_iqr"] = group["outlier_iqr"].values
-        df.loc[group.index, "change_point"] = group["change_point"].values
+    # El tipo de cada columna depende de todo el historial (p. ej. un None convierte
+    # enteros en float): si cambia, los resultados cacheados ya no son comparables.
+    dtypes = {column: dtype.kind for column, dtype in df.dtypes.items()}
+    cached_departments = state["departments"] if state["dtypes"] == dtypes else {}
+
+    departments = sorted(df["departamento"].unique())
+    pending = [dept for dept in departments if dept not in cached_departments or dept in touched_departments]
+    departments_state = {
+        dept: {**cached_departments[dept], "flags": load_department_flags(state_path, dept)}
+        for dept in departments
+        if dept not in pending
+    }
+    if pending:
+        departments_state.update(audit_departments(df, pending, rule_run))
+
+    anomalies = []
+    metrics_by_dept = {}
+    predictions = {}
+    flag_values = {column: [] for column in OUTLIER_COLUMNS}
+    for departamento in departments:
+        result = departments_state[departamento]
+        anomalies.extend(result["anomalies"])
+        metrics_by_dept[departamento] = result["metrics"]
+        if result["prediction"]:
+            predictions[departamento] = result["prediction"]
+        for column in OUTLIER_COLUMNS:
+            flag_values[column].extend(result["flags"][column])
+
+    # df está ordenado por departamento: las filas de cada uno son contiguas.
+    for column in OUTLIER_COLUMNS:
+        df[column] = pd.Series(flag_values[column], index=df.index, dtype=object)
 
     series_payload = {}
     for dept, group in df.groupby("departamento"):
-        payload = group.drop(
-            columns=["zscore_delta", "outlier_zscore", "outlier_iqr", "change_point"]
-        ).copy()
+        payload = group.drop(columns=OUTLIER_COLUMNS).copy()
         payload["timestamp"] = payload["timestamp"].astype(str)
         series_payload[dept] = payload.to_dict(orient="records")
 
@@ -616,7 +1015,22 @@ def run_audit(target_directory='data/normalized'):
         f.write(build_plain_summary(output, language="en"))
 
     persist_to_sqlite(output, os.path.join(reports_dir, "centinel.db"))
+
+    if incremental:
+        # Las flags por fila van a Parquet (solo las de departamentos recalculados);
+        # el JSON de estado guarda lo que no crece con el historial de filas.
+        for departamento in pending:
+            save_department_flags(state_path, departamento, departments_state[departamento]["flags"])
+        state["dtypes"] = dtypes
+        state["departments"] = {
+            dept: {key: value for key, value in result.items() if key != "flags"}
+            for dept, result in departments_state.items()
+        }
+        save_audit_state(state_path, state)
+
+    rule_run.log_summary()
     logger.info("audit_completed reports_dir=%s", reports_dir)
+    return output
 
 
 def persist_to_sqlite(output, sqlite_path):
@@ -707,4 +1121,16 @@ def format_metric(value):
     return f"{value:.2f}"
 
 if __name__ == "__main__":
-    run_audit()
+    import argparse
+
+    cli = argparse.ArgumentParser(description="Auditoría de reglas sobre snapshots normalizados.")
+    cli.add_argument("target_directory", nargs="?", default="data/normalized")
+    cli.add_argument(
+        "--incremental",
+        action="store_true",
+        default=AUDIT_INCREMENTAL,
+        help="Procesa solo snapshots nuevos usando el estado persistido (también AUDIT_INCREMENTAL=true).",
+    )
+    cli.add_argument("--state-path", default=AUDIT_STATE_PATH)
+    args = cli.parse_args()
+    run_audit(args.target_directory, incremental=args.incremental, state_path=args.state_path)
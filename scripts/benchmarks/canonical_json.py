@@ -0,0 +1,104 @@
+"""
+Microbenchmark de serialización canónica + hash por snapshot (camino caliente de la ingesta).
+
+Compara el camino anterior (json.dumps(sort_keys=True) del snapshot y otra vez
+de los candidatos para candidates_json) con snapshot_to_canonical_parts, que
+recorre los dataclasses una sola vez y devuelve ambos segmentos.
+
+Uso:
+    python -m scripts.benchmarks.canonical_json --snapshots 20000 --candidates 10
+"""
+
+import argparse
+import json
+import random
+import time
+from dataclasses import asdict
+
+from sentinel.core.hashchain import compute_hash
+from sentinel.core.normalyze import normalize_snapshot, snapshot_to_canonical_parts
+
+DEPARTMENTS = ["Atlántida", "Copán", "Cortés", "El Paraíso", "Francisco Morazán", "Intibucá", "Yoro"]
+
+
+def synthetic_snapshots(snapshots=20000, candidates=10, seed=2029):
+    rng = random.Random(seed)
+    result = []
+    for index in range(snapshots):
+        raw = {
+            "registered_voters": 500000,
+            "total_votes": 1000 + index,
+            "valid_votes": 970 + index,
+            "null_votes": 20,
+            "blank_votes": 10,
+            "candidatos": [
+                {
+                    "posicion": slot,
+                    "votos": rng.randint(0, 10**6),
+                    "candidato": f"Candidato {slot} Núñez",
+                    "partido": f"Partido {slot}",
+                    "id": f"c-{slot}",
+                }
+                for slot in range(1, candidates + 1)
+            ],
+        }
+        timestamp = f"2029-11-30T{index % 24:02d}:{index % 60:02d}:00Z"
+        result.append(normalize_snapshot(raw, DEPARTMENTS[index % len(DEPARTMENTS)], timestamp, candidate_count=candidates))
+    return result
+
+
+def legacy_parts(snapshot):
+    canonical_json = json.dumps(
+        {
+            "meta": asdict(snapshot.meta),
+            "totals": asdict(snapshot.totals),
+            "candidates": [asdict(c) for c in snapshot.candidates],
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    candidates_json = json.dumps(
+        [asdict(candidate) for candidate in snapshot.candidates],
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return canonical_json, candidates_json
+
+
+def _time(serializer, snapshots, with_hash):
+    previous_hash = None
+    started = time.perf_counter()
+    for snapshot in snapshots:
+        canonical_json, _ = serializer(snapshot)
+        if with_hash:
+            previous_hash = compute_hash(canonical_json, previous_hash)
+    return time.perf_counter() - started
+
+
+def run_benchmark(snapshots=20000, candidates=10, seed=2029, repeat=3):
+    data = synthetic_snapshots(snapshots, candidates, seed)
+    mismatches = sum(legacy_parts(snapshot) != snapshot_to_canonical_parts(snapshot) for snapshot in data)
+    report = {"snapshots": snapshots, "candidates": candidates, "mismatches": mismatches}
+    for label, with_hash in (("serialize", False), ("serialize_hash", True)):
+        legacy = min(_time(legacy_parts, data, with_hash) for _ in range(repeat))
+        single_pass = min(_time(snapshot_to_canonical_parts, data, with_hash) for _ in range(repeat))
+        report[label] = {
+            "legacy_us_per_snapshot": round(legacy / snapshots * 1e6, 3),
+            "single_pass_us_per_snapshot": round(single_pass / snapshots * 1e6, 3),
+            "speedup": round(legacy / single_pass, 2),
+        }
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Microbenchmark de JSON canónico + hash por snapshot.")
+    parser.add_argument("--snapshots", type=int, default=20000)
+    parser.add_argument("--candidates", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=2029)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+    print(json.dumps(run_benchmark(args.snapshots, args.candidates, args.seed, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark de memoria de `cli.py run`: pipeline en streaming vs. todo en memoria.
+
+Genera N snapshots crudos sintéticos y mide el pico de memoria (tracemalloc)
+del pipeline anterior (listas de snapshots, normalizados y eslabones, y registro
+releyendo cada archivo) y de run_pipeline, para varios tamaños de N.
+
+Uso:
+    python -m scripts.benchmarks.cli_run --snapshots 1000 4000
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import random
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from scripts import cli
+
+
+def write_inputs(data_dir, snapshots, candidates=10, seed=2029):
+    rng = random.Random(seed)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    for index in range(snapshots):
+        payload = {
+            "timestamp": f"2029-11-30T{index // 3600 % 24:02d}:{index // 60 % 60:02d}:{index % 60:02d}Z",
+            "total_votes": 1000 + index * 10,
+            "valid_votes": 970 + index * 10,
+            "null_votes": 20,
+            "blank_votes": 10,
+            "candidates": [
+                {"id": slot, "nombre": f"Candidato {slot}", "votos": 100 * slot + index + rng.randint(0, 5)}
+                for slot in range(1, candidates + 1)
+            ],
+        }
+        (data_dir / f"snapshot_{index:07d}.json").write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+
+def legacy_run(data_dir, output_dir, department="Francisco Morazán", year=2025):
+    """Pipeline anterior, con todo en memoria."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    snapshots = cli.load_snapshots(data_dir)
+    normalized = cli.normalize_snapshots(snapshots, department, year)
+    normalized_paths = cli.write_normalized_outputs(normalized, output_dir)
+    chain_path, hash_entries = cli.write_hashchain(normalized, output_dir)
+    anomalies = cli.audit_snapshots(snapshots)
+    anomalies_path = cli.write_anomalies(anomalies, output_dir)
+    status = cli.build_status(snapshots, normalized, hash_entries, anomalies, output_dir, data_dir)
+    status_path = cli.write_status(status, output_dir)
+    cli.write_registry(normalized_paths + [chain_path, anomalies_path, status_path], output_dir)
+
+
+def streaming_run(data_dir, output_dir, department="Francisco Morazán", year=2025):
+    args = argparse.Namespace(
+        data_dir=str(data_dir),
+        output_dir=str(output_dir),
+        department=department,
+        year=year,
+        workers=1,
+    )
+    with contextlib.redirect_stdout(io.StringIO()):
+        cli.run_pipeline(args)
+
+
+def _measure(run, data_dir, output_dir):
+    tracemalloc.start()
+    started = time.perf_counter()
+    run(data_dir, output_dir)
+    seconds = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": round(seconds, 3), "peak_mib": round(peak / 2**20, 2)}
+
+
+def run_benchmark(sizes=(1000, 4000), candidates=10):
+    report = {}
+    for snapshots in sizes:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            data_dir = Path(tmp_dir) / "data"
+            write_inputs(data_dir, snapshots, candidates)
+            legacy = _measure(legacy_run, data_dir, Path(tmp_dir) / "legacy")
+            streaming = _measure(streaming_run, data_dir, Path(tmp_dir) / "streaming")
+            identical = (Path(tmp_dir) / "legacy" / "hashchain.json").read_bytes() == (
+                Path(tmp_dir) / "streaming" / "hashchain.json"
+            ).read_bytes()
+        report[str(snapshots)] = {"legacy": legacy, "streaming": streaming, "identical_hashchain": identical}
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de memoria del pipeline cli run.")
+    parser.add_argument("--snapshots", type=int, nargs="+", default=[1000, 4000])
+    parser.add_argument("--candidates", type=int, default=10)
+    args = parser.parse_args(argv)
+    print(json.dumps(run_benchmark(tuple(args.snapshots), args.candidates), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark del backend HTTP asíncrono (AsyncHttpClient) contra un servidor local.
+
+Un servidor HTTP/1.1 keep-alive en 127.0.0.1 imita la API del CNE; se lanzan
+N solicitudes por fuente y se compara el pool keep-alive de aiohttp con
+requests.Session (una por hilo, como fetch_round). Informa solicitudes por
+segundo por fuente y cuántas conexiones TCP abrió cada backend.
+
+Uso:
+    python -m scripts.benchmarks.http_async --sources 5 --requests 50
+"""
+
+import argparse
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+
+from sentinel.core.http_async import AsyncHttpClient
+
+
+class _CneStandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    connections: set = set()
+
+    def do_GET(self):  # noqa: N802
+        query = parse_qs(urlsplit(self.path).query)
+        body = json.dumps({"dept": query.get("dept", [None])[0], "resultados": {"1": 100, "2": 50}}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        type(self).connections.add(self.client_address)
+
+    def log_message(self, *args):
+        pass
+
+
+def _requests(sources, per_source):
+    return [f"{idx:02d}" for idx in range(1, sources + 1) for _ in range(per_source)]
+
+
+def run_async(endpoint, depts, connections):
+    async def _run():
+        async with AsyncHttpClient(max_connections=connections, max_per_host=connections) as client:
+            responses = await asyncio.gather(*[client.get(endpoint, params={"dept": dept}) for dept in depts])
+        assert all(response.ok for response in responses)
+
+    asyncio.run(_run())
+
+
+def run_sync(endpoint, depts, connections):
+    local = threading.local()
+
+    def _get(dept):
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+        response = session.get(endpoint, params={"dept": dept}, timeout=10)
+        assert response.ok
+
+    with ThreadPoolExecutor(max_workers=connections) as executor:
+        list(executor.map(_get, depts))
+
+
+def run_benchmark(sources=5, per_source=50, connections=4):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _CneStandInHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    endpoint = f"http://127.0.0.1:{server.server_address[1]}/resultados"
+    depts = _requests(sources, per_source)
+    results = {"sources": sources, "requests_per_source": per_source, "connections": connections}
+    try:
+        for name, runner in (("async", run_async), ("sync", run_sync)):
+            _CneStandInHandler.connections = set()
+            started = time.perf_counter()
+            runner(endpoint, depts, connections)
+            elapsed = time.perf_counter() - started
+            results[name] = {
+                "req_per_sec_per_source": round(per_source / elapsed, 1),
+                "tcp_connections": len(_CneStandInHandler.connections),
+            }
+    finally:
+        server.shutdown()
+        server.server_close()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark del backend HTTP asíncrono vs. requests.")
+    parser.add_argument("--sources", type=int, default=5)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--connections", type=int, default=4)
+    args = parser.parse_args(argv)
+    print(json.dumps(run_benchmark(args.sources, args.requests, args.connections), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark del codec JSON (sentinel.utils.codec) contra json de la stdlib.
+
+Usa las formas reales de docs/examples y tests/fixtures: snapshots crudos,
+snapshots normalizados, hashchain/status/registry y resultados de análisis.
+Mide lectura desde bytes y escritura con indent=2 (persist_snapshot) y compacta
+(export JSONL).
+
+Uso:
+    python -m scripts.benchmarks.json_codec --iterations 20000
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+from sentinel.utils import codec
+
+ROOT = Path(__file__).resolve().parents[2]
+SHAPE_DIRS = [ROOT / "docs" / "examples", ROOT / "tests" / "fixtures"]
+
+
+def example_payloads():
+    return {
+        str(path.relative_to(ROOT)): path.read_bytes()
+        for directory in SHAPE_DIRS
+        for path in sorted(directory.rglob("*.json"))
+    }
+
+
+def _best(func, iterations, repeat=3):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best / iterations * 1e6
+
+
+def run_benchmark(iterations=20000):
+    report = {"backend": codec.backend(), "iterations": iterations, "shapes": {}}
+    totals = {"stdlib_us": 0.0, "codec_us": 0.0}
+    for name, data in example_payloads().items():
+        obj = json.loads(data)
+        cases = {
+            "loads": (lambda: json.loads(data), lambda: codec.loads(data)),
+            "dumps_indent2": (
+                lambda: json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8"),
+                lambda: codec.dumps_bytes(obj, indent=2),
+            ),
+            "dumps_compact": (
+                lambda: json.dumps(obj, ensure_ascii=False, separators=(",", ":")),
+                lambda: codec.dumps(obj),
+            ),
+        }
+        shape = {"bytes": len(data)}
+        for case, (stdlib_call, codec_call) in cases.items():
+            stdlib_us = _best(stdlib_call, iterations)
+            codec_us = _best(codec_call, iterations)
+            totals["stdlib_us"] += stdlib_us
+            totals["codec_us"] += codec_us
+            shape[case] = {
+                "stdlib_us": round(stdlib_us, 2),
+                "codec_us": round(codec_us, 2),
+                "speedup": round(stdlib_us / codec_us, 2),
+            }
+        report["shapes"][name] = shape
+    report["total_speedup"] = round(totals["stdlib_us"] / totals["codec_us"], 2)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark del codec JSON frente a la stdlib.")
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args(argv)
+    print(json.dumps(run_benchmark(args.iterations), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Benchmark de los modelos con slots y del decodificador con esquema.
+
+Compara contra copias de los dataclasses anteriores (frozen, sin slots):
+memoria de N snapshots con sus candidatos (tracemalloc), costo de construcción,
+y bytes crudos → Snapshot (json + normalize_snapshot con field_map dict vs.
+SnapshotDecoder con codec y field_map compilado).
+
+Uso:
+    python -m scripts.benchmarks.models --snapshots 20000 --candidates 10
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import List, Optional
+
+from scripts.benchmarks.normalize import FIELD_MAP, synthetic_payloads
+from sentinel.core.decoder import SnapshotDecoder, snapshot_from_canonical
+from sentinel.core.models import CandidateResult, Meta, Snapshot, Totals
+from sentinel.core.normalyze import normalize_snapshot, snapshot_to_canonical_json
+from sentinel.utils import codec
+
+
+@dataclass(frozen=True)
+class LegacyCandidateResult:
+    slot: int
+    votes: int
+    candidate_id: Optional[str] = None
+    name: Optional[str] = None
+    party: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class LegacyTotals:
+    registered_voters: int
+    total_votes: int
+    valid_votes: int
+    null_votes: int
+    blank_votes: int
+
+
+@dataclass(frozen=True)
+class LegacyMeta:
+    election: str
+    year: int
+    source: str
+    scope: str
+    department_code: str
+    timestamp_utc: str
+
+
+@dataclass(frozen=True)
+class LegacySnapshot:
+    meta: LegacyMeta
+    totals: LegacyTotals
+    candidates: List[LegacyCandidateResult]
+
+
+LEGACY = (LegacySnapshot, LegacyMeta, LegacyTotals, LegacyCandidateResult)
+SLOTTED = (Snapshot, Meta, Totals, CandidateResult)
+
+
+def build_snapshots(classes, snapshots, candidates):
+    """Los textos se comparten entre snapshots: se mide el costo de los objetos, no de los strings."""
+    snapshot_cls, meta_cls, totals_cls, candidate_cls = classes
+    labels = {slot: (f"c-{slot}", f"Candidato {slot}", f"P{slot}") for slot in range(1, candidates + 1)}
+    return [
+        snapshot_cls(
+            meta=meta_cls("HN-PRESIDENTIAL", 2025, "CNE", "DEPARTMENT", "08", "2029-11-30T18:00:00Z"),
+            totals=totals_cls(500000, 1000 + index, 970 + index, 20, 10),
+            candidates=[
+                candidate_cls(slot, index * slot, *labels[slot])
+                for slot in range(1, candidates + 1)
+            ],
+        )
+        for index in range(snapshots)
+    ]
+
+
+def _memory(classes, snapshots, candidates):
+    tracemalloc.start()
+    built = build_snapshots(classes, snapshots, candidates)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del built
+    return current
+
+
+def _seconds(func):
+    started = time.perf_counter()
+    func()
+    return time.perf_counter() - started
+
+
+def run_benchmark(snapshots=20000, candidates=10, seed=2029):
+    legacy_bytes = _memory(LEGACY, snapshots, candidates)
+    slotted_bytes = _memory(SLOTTED, snapshots, candidates)
+    legacy_build = min(_seconds(lambda: build_snapshots(LEGACY, snapshots, candidates)) for _ in range(3))
+    slotted_build = min(_seconds(lambda: build_snapshots(SLOTTED, snapshots, candidates)) for _ in range(3))
+
+    payloads = [json.dumps(raw).encode("utf-8") for raw in synthetic_payloads(snapshots, candidates, seed)]
+    decoder = SnapshotDecoder("Francisco Morazán", candidate_count=candidates, field_map=FIELD_MAP)
+    legacy_decode = _seconds(lambda: [
+        normalize_snapshot(json.loads(data), "Francisco Morazán", "2029-11-30T18:00:00Z",
+                           candidate_count=candidates, field_map=FIELD_MAP)
+        for data in payloads
+    ])
+    decoded = []
+    schema_decode = _seconds(lambda: decoded.extend(decoder.decode(data, "2029-11-30T18:00:00Z") for data in payloads))
+
+    canonical = [snapshot_to_canonical_json(snapshot).encode("utf-8") for snapshot in decoded]
+    canonical_decode = _seconds(lambda: [snapshot_from_canonical(data) for data in canonical])
+
+    return {
+        "snapshots": snapshots,
+        "candidates": candidates,
+        "codec_backend": codec.backend(),
+        "memory": {
+            "legacy_bytes_per_snapshot": round(legacy_bytes / snapshots),
+            "slotted_bytes_per_snapshot": round(slotted_bytes / snapshots),
+            "reduction": round(legacy_bytes / slotted_bytes, 2),
+        },
+        "build": {
+            "legacy_us_per_snapshot": round(legacy_build / snapshots * 1e6, 2),
+            "slotted_us_per_snapshot": round(slotted_build / snapshots * 1e6, 2),
+        },
+        "decode_raw": {
+            "json_normalize_us_per_snapshot": round(legacy_decode / snapshots * 1e6, 2),
+            "schema_decoder_us_per_snapshot": round(schema_decode / snapshots * 1e6, 2),
+            "speedup": round(legacy_decode / schema_decode, 2),
+        },
+        "decode_canonical_us_per_snapshot": round(canonical_decode / snapshots * 1e6, 2),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de modelos con slots y decodificación con esquema.")
+    parser.add_argument("--snapshots", type=int, default=20000)
+    parser.add_argument("--candidates", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=2029)
+    args = parser.parse_args(argv)
+    print(json.dumps(run_benchmark(args.snapshots, args.candidates, args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
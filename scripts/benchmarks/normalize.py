@@ -0,0 +1,175 @@
+"""
+Benchmark de normalize_snapshot con el field_map de config.yaml: rutas compiladas vs. resolución por llamada.
+
+La variante "legacy" reproduce la resolución anterior (split de cada ruta con
+puntos en cada campo de cada snapshot y la raíz de candidatos evaluada dos
+veces); "compiled" usa un FieldMapPlan compilado una sola vez por corrida.
+
+Uso:
+    python -m scripts.benchmarks.normalize --payloads 100000
+"""
+
+import argparse
+import json
+import random
+import time
+
+from sentinel.core.models import Meta, Snapshot, Totals
+from sentinel.core.normalyze import (
+    DEFAULT_CANDIDATE_ROOTS,
+    DEFAULT_TOTALS_PATHS,
+    _iter_candidates,
+    _safe_int,
+    compile_field_map,
+    normalize_snapshot,
+    snapshot_to_canonical_json,
+)
+
+# Mismo field_map que config.yaml.
+FIELD_MAP = {
+    "totals": {
+        "valid_votes": ["estadisticas.distribucion_votos.validos"],
+        "null_votes": ["estadisticas.distribucion_votos.nulos"],
+        "blank_votes": ["estadisticas.distribucion_votos.blancos"],
+        "total_votes": ["estadisticas.distribucion_votos.total"],
+    },
+    "candidate_roots": ["resultados"],
+}
+
+
+def synthetic_payloads(payloads=100000, candidates=10, seed=2029):
+    rng = random.Random(seed)
+    result = []
+    for index in range(payloads):
+        valid = 1000 + index
+        result.append({
+            "estadisticas": {
+                "distribucion_votos": {
+                    "validos": f"{valid:,}",
+                    "nulos": rng.randint(0, 50),
+                    "blancos": rng.randint(0, 50),
+                    "total": valid + 100,
+                },
+                "totalizacion_actas": {"actas_totales": 5000, "actas_divulgadas": index % 5000},
+            },
+            "resultados": [
+                {"posicion": slot, "votos": rng.randint(0, valid), "candidato": f"Candidato {slot}", "partido": f"P{slot}"}
+                for slot in range(1, candidates + 1)
+            ],
+        })
+    return result
+
+
+def _legacy_get(payload, path):
+    current = payload
+    for part in path.split("."):
+        if not isinstance(current, dict):
+            return None
+        current = current.get(part)
+    return current
+
+
+def _legacy_first(payload, keys):
+    for key in keys:
+        value = _legacy_get(payload, key) if "." in key else payload.get(key)
+        if value is not None:
+            return value
+    return None
+
+
+def _legacy_candidates_root(raw, candidate_roots):
+    for key in candidate_roots:
+        value = _legacy_get(raw, key) if "." in key else raw.get(key)
+        if isinstance(value, dict) and "candidatos" in value:
+            return value["candidatos"]
+        if isinstance(value, (list, dict)):
+            return value
+    return None
+
+
+def legacy_normalize(raw, department_name, timestamp_utc, candidate_count=10, field_map=None):
+    """Resolución anterior del field_map, para comparar."""
+    field_map = field_map or {}
+    totals_map = field_map.get("totals", {})
+    candidate_roots = field_map.get("candidate_roots", DEFAULT_CANDIDATE_ROOTS)
+    values = {
+        field: _safe_int(_legacy_first(raw, totals_map.get(field, default_paths)))
+        for field, default_paths in DEFAULT_TOTALS_PATHS.items()
+    }
+    if values["total_votes"] == 0 and any([values["valid_votes"], values["null_votes"], values["blank_votes"]]):
+        values["total_votes"] = values["valid_votes"] + values["null_votes"] + values["blank_votes"]
+    raw_candidates = _legacy_candidates_root(raw, candidate_roots)
+    if isinstance(raw_candidates, list):
+        candidate_count = max(candidate_count, len(raw_candidates))
+    candidates = list(_iter_candidates(_legacy_candidates_root(raw, candidate_roots), candidate_count))
+    meta = Meta("HN-PRESIDENTIAL", 2025, "CNE", "DEPARTMENT", "08", timestamp_utc)
+    return Snapshot(meta=meta, totals=Totals(**values), candidates=candidates)
+
+
+def _time(normalize, payloads, field_map):
+    started = time.perf_counter()
+    for raw in payloads:
+        normalize(raw, "Francisco Morazán", "2029-11-30T18:00:00Z", candidate_count=10, field_map=field_map)
+    return time.perf_counter() - started
+
+
+def _time_field_resolution(payloads, plan):
+    """Solo la resolución de totales y raíz de candidatos, sin construir el Snapshot."""
+    totals_map = FIELD_MAP["totals"]
+    candidate_roots = FIELD_MAP["candidate_roots"]
+    started = time.perf_counter()
+    for raw in payloads:
+        for field, default_paths in DEFAULT_TOTALS_PATHS.items():
+            _safe_int(_legacy_first(raw, totals_map.get(field, default_paths)))
+        _legacy_candidates_root(raw, candidate_roots)
+        _legacy_candidates_root(raw, candidate_roots)
+    legacy = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for raw in payloads:
+        for field in DEFAULT_TOTALS_PATHS:
+            plan.total(raw, field)
+        plan.candidates_root(raw)
+    return legacy, time.perf_counter() - started
+
+
+def run_benchmark(payloads=100000, candidates=10, seed=2029):
+    data = synthetic_payloads(payloads, candidates, seed)
+    plan = compile_field_map(FIELD_MAP)
+    sample = data[: min(len(data), 1000)]
+    mismatches = sum(
+        snapshot_to_canonical_json(legacy_normalize(raw, "Francisco Morazán", "t", field_map=FIELD_MAP))
+        != snapshot_to_canonical_json(normalize_snapshot(raw, "Francisco Morazán", "t", field_map=plan))
+        for raw in sample
+    )
+    legacy = _time(legacy_normalize, data, FIELD_MAP)
+    compiled = _time(normalize_snapshot, data, plan)
+    legacy_fields, compiled_fields = _time_field_resolution(data, plan)
+    return {
+        "payloads": payloads,
+        "candidates": candidates,
+        "mismatches": mismatches,
+        "normalize": {
+            "legacy_seconds": round(legacy, 4),
+            "compiled_seconds": round(compiled, 4),
+            "speedup": round(legacy / compiled, 2),
+        },
+        "field_resolution": {
+            "legacy_seconds": round(legacy_fields, 4),
+            "compiled_seconds": round(compiled_fields, 4),
+            "speedup": round(legacy_fields / compiled_fields, 2),
+        },
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de normalize_snapshot con field_map compilado.")
+    parser.add_argument("--payloads", type=int, default=100000)
+    parser.add_argument("--candidates", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=2029)
+    args = parser.parse_args(argv)
+    print(json.dumps(run_benchmark(args.payloads, args.candidates, args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+Benchmark del motor de reglas de analyze_rules: máscaras vectorizadas vs. iterrows.
+
+Uso:
+    python -m scripts.benchmarks.rule_engine --departments 18 --snapshots 10000
+"""
+
+import argparse
+import json
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from scripts.analyze_rules import (
+    OUTLIER_COLUMNS,
+    RELATIVE_VOTE_CHANGE_PCT,
+    SCRUTINIO_JUMP_PCT,
+    audit_departments,
+    build_department_frame,
+    build_prediction,
+    compute_trend_metrics,
+)
+
+
+def synthetic_records(departments=18, snapshots=10000, seed=2029):
+    """Historias sintéticas con saltos, regresiones y desgloses incompletos."""
+    rng = np.random.default_rng(seed)
+    start = datetime(2029, 11, 30, 18, 0, tzinfo=timezone.utc)
+    records = []
+    for dept_index in range(departments):
+        departamento = f"DEP-{dept_index + 1:02d}"
+        deltas = rng.poisson(120, snapshots)
+        deltas[rng.random(snapshots) < 0.01] *= 40
+        deltas[rng.random(snapshots) < 0.005] = -rng.integers(1, 500)
+        totals = np.cumsum(deltas) + 1000
+        actas = np.cumsum(rng.integers(0, 3, snapshots)) + 10
+        actas_totales = int(actas[-1] * 0.98)
+        for step in range(snapshots):
+            total_votes = int(totals[step])
+            null_votes = int(total_votes * 0.02)
+            blank_votes = int(total_votes * 0.01)
+            valid_votes = total_votes - null_votes - blank_votes
+            if step % 997 == 0:
+                valid_votes += 7
+            records.append({
+                "timestamp": start + timedelta(minutes=5 * step),
+                "departamento": departamento,
+                "total_votes": total_votes,
+                "actas_procesadas": int(actas[step]),
+                "actas_totales": actas_totales if step % 3 else None,
+                "porcentaje_escrutado": None if step % 2 else round(100 * step / snapshots, 2),
+                "valid_votes": valid_votes,
+                "null_votes": null_votes,
+                "blank_votes": blank_votes,
+            })
+    return records
+
+
+def legacy_audit_departments(df):
+    """Recorrido anterior: groupby + iterrows + escritura df.loc por grupo."""
+    df = df.copy()
+    results = {}
+    for departamento, group in df.groupby("departamento"):
+        result = legacy_audit_department(departamento, group)
+        results[departamento] = result
+        for column in OUTLIER_COLUMNS:
+            df.loc[group.index, column] = np.asarray(result["flags"][column], dtype=object)
+    return results
+
+
+def legacy_audit_department(departamento, group):
+    """
+    Motor anterior (fila por fila con iterrows), conservado como referencia
+    de paridad y línea base del benchmark.
+    """
+    group = group.copy()
+    anomalies = []
+    delta_votes = group["delta_votes"].dropna()
+    if not delta_votes.empty:
+        mean_delta = delta_votes.mean()
+        std_delta = delta_votes.std(ddof=1) if len(delta_votes) > 1 else 0.0
+        q1 = delta_votes.quantile(0.25)
+        q3 = delta_votes.quantile(0.75)
+        iqr = q3 - q1
+
+        group["zscore_delta"] = (group["delta_votes"] - mean_delta) / std_delta if std_delta else 0.0
+        group["outlier_zscore"] = group["zscore_delta"].abs() > 3
+        group["outlier_iqr"] = (group["delta_votes"] < q1 - 1.5 * iqr) | (group["delta_votes"] > q3 + 1.5 * iqr)
+        group["change_point"] = group["delta_votes"].abs() > mean_delta + 3 * std_delta if std_delta else False
+    else:
+        group["zscore_delta"] = None
+        group["outlier_zscore"] = False
+        group["outlier_iqr"] = False
+        group["change_point"] = False
+
+    for _, row in group.iterrows():
+        if row["change_point"]:
+            anomalies.append({
+                "departamento": departamento,
+                "type": "CHANGE_POINT",
+                "timestamp": row["timestamp"].isoformat(),
+                "delta_votes": row["delta_votes"],
+            })
+        if row["outlier_zscore"] or row["outlier_iqr"]:
+            anomalies.append({
+                "departamento": departamento,
+                "type": "OUTLIER",
+                "timestamp": row["timestamp"].isoformat(),
+                "delta_votes": row["delta_votes"],
+                "method": "zscore" if row["outlier_zscore"] else "iqr",
+            })
+        if (row["delta_votes"] or 0) > 0 and (row["delta_actas"] or 0) <= 0:
+            anomalies.append({
+                "departamento": departamento,
+                "type": "ACTAS_DESVIO",
+                "timestamp": row["timestamp"].isoformat(),
+                "delta_votes": row["delta_votes"],
+                "delta_actas": row["delta_actas"],
+            })
+        if row.get("relative_change_pct") is not None:
+            if abs(row["relative_change_pct"]) >= RELATIVE_VOTE_CHANGE_PCT:
+                anomalies.append({
+                    "departamento": departamento,
+                    "type": "RELATIVE_CHANGE",
+                    "timestamp": row["timestamp"].isoformat(),
+                    "delta_votes": row["delta_votes"],
+                    "relative_pct": row["relative_change_pct"],
+                    "threshold_pct": RELATIVE_VOTE_CHANGE_PCT,
+                })
+        if row.get("delta_escrutado") is not None:
+            if row["delta_escrutado"] >= SCRUTINIO_JUMP_PCT:
+                anomalies.append({
+                    "departamento": departamento,
+                    "type": "SCRUTINIO_SALTO",
+                    "timestamp": row["timestamp"].isoformat(),
+                    "delta_escrutado": row["delta_escrutado"],
+                    "threshold_pct": SCRUTINIO_JUMP_PCT,
+                })
+        valid_votes = row.get("valid_votes")
+        null_votes = row.get("null_votes")
+        blank_votes = row.get("blank_votes")
+        if all(v is not None for v in [valid_votes, null_votes, blank_votes]):
+            total_votes = row.get("total_votes") or 0
+            sum_votes = (valid_votes or 0) + (null_votes or 0) + (blank_votes or 0)
+            if total_votes and sum_votes and total_votes != sum_votes:
+                anomalies.append({
+                    "departamento": departamento,
+                    "type": "VOTOS_TOTALES_MISMATCH",
+                    "timestamp": row["timestamp"].isoformat(),
+                    "total_votes": total_votes,
+                    "sum_votes": sum_votes,
+                })
+        if row.get("actas_totales"):
+            if row["actas_procesadas"] > row["actas_totales"]:
+                anomalies.append({
+                    "departamento": departamento,
+                    "type": "ACTAS_OVERFLOW",
+                    "timestamp": row["timestamp"].isoformat(),
+                    "actas_procesadas": row["actas_procesadas"],
+                    "actas_totales": row["actas_totales"],
+                })
+
+    trend_metrics = compute_trend_metrics(group)
+    return {
+        "anomalies": anomalies,
+        "metrics": trend_metrics,
+        "prediction": build_prediction(group, trend_metrics),
+        "flags": {column: group[column].tolist() for column in OUTLIER_COLUMNS},
+    }
+
+
+def _canonical(results):
+    return json.dumps(
+        {dept: result["anomalies"] for dept, result in results.items()},
+        sort_keys=True,
+        default=str,
+    )
+
+
+def run_benchmark(departments=18, snapshots=10000, repeat=1, seed=2029):
+    df = build_department_frame(synthetic_records(departments, snapshots, seed))
+    timings = {}
+    results = {}
+    for name, engine in (("iterrows", legacy_audit_departments), ("vectorizado", audit_departments)):
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            results[name] = engine(df)
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        timings[name] = best
+
+    return {
+        "rows": len(df),
+        "departments": departments,
+        "anomalies": sum(len(result["anomalies"]) for result in results["vectorizado"].values()),
+        "parity": _canonical(results["iterrows"]) == _canonical(results["vectorizado"]),
+        "seconds": timings,
+        "speedup": timings["iterrows"] / timings["vectorizado"] if timings["vectorizado"] else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark del motor de reglas de analyze_rules.")
+    parser.add_argument("--departments", type=int, default=18)
+    parser.add_argument("--snapshots", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=2029)
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.departments, args.snapshots, args.repeat, args.seed)
+    print(json.dumps(report, indent=2))
+    if not report["parity"]:
+        raise SystemExit("Los motores difieren: revisar paridad de anomalías.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Benchmark de lectores concurrentes contra LocalSnapshotStore durante una ingesta.
+
+Un proceso escribe rondas de 19 snapshots (store_snapshots) mientras varios
+procesos lectores consultan snapshot_index; se compara el perfil "default"
+(journal rollback) con "tuned" (WAL). Con WAL los lectores no esperan el
+commit del escritor.
+
+Uso:
+    python -m scripts.benchmarks.sqlite_concurrency --rounds 300 --readers 4
+"""
+
+import argparse
+import json
+import multiprocessing
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from sentinel.core.normalyze import normalize_snapshot
+from sentinel.core.storage import STORAGE_PROFILES, LocalSnapshotStore
+
+DEPARTMENTS = [
+    "Atlántida", "Choluteca", "Colón", "Comayagua", "Copán", "Cortés",
+    "El Paraíso", "Francisco Morazán", "Gracias a Dios", "Intibucá",
+    "Islas de la Bahía", "La Paz", "Lempira", "Ocotepeque", "Olancho",
+    "Santa Bárbara", "Valle", "Yoro",
+]
+
+
+def synthetic_round(round_index, start, rng):
+    """Una ronda de descarga: un snapshot por departamento más el nacional."""
+    timestamp = (start + timedelta(minutes=5 * round_index)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    snapshots = []
+    for department in DEPARTMENTS + ["Nacional"]:
+        total_votes = 1000 + round_index * 50 + rng.randint(0, 40)
+        raw = {
+            "registered_voters": 500000,
+            "total_votes": total_votes,
+            "valid_votes": total_votes - 30,
+            "null_votes": 20,
+            "blank_votes": 10,
+            "candidates": {str(slot): total_votes // (slot + 2) for slot in range(1, 11)},
+        }
+        snapshots.append(normalize_snapshot(raw, department, timestamp, candidate_count=10))
+    return snapshots
+
+
+def _percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def _reader(db_path, profile, seed, done, queue):
+    store = LocalSnapshotStore(db_path, profile=profile)
+    rng = random.Random(seed)
+    latencies = []
+    errors = 0
+    while not done.is_set():
+        code = f"{rng.randint(1, 18):02d}"
+        started = time.perf_counter()
+        try:
+            store.get_index_entries(code)
+        except sqlite3.OperationalError:
+            errors += 1
+        latencies.append(time.perf_counter() - started)
+    store.close()
+    queue.put((latencies, errors))
+
+
+def run_profile(profile, rounds=300, readers=4, seed=2029):
+    rng = random.Random(seed)
+    start = datetime(2029, 11, 30, 18, 0, tzinfo=timezone.utc)
+    batches = [synthetic_round(index, start, rng) for index in range(rounds)]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = str(Path(tmp_dir) / "snapshots.db")
+        # Crea esquema y journal antes de arrancar los lectores.
+        writer = LocalSnapshotStore(db_path, profile=profile)
+        writer.store_snapshots(batches[0])
+
+        done = multiprocessing.Event()
+        queue = multiprocessing.Queue()
+        processes = [
+            multiprocessing.Process(target=_reader, args=(db_path, profile, seed + index, done, queue))
+            for index in range(readers)
+        ]
+        for process in processes:
+            process.start()
+
+        write_started = time.perf_counter()
+        for batch in batches[1:]:
+            writer.store_snapshots(batch)
+        write_seconds = time.perf_counter() - write_started
+        writer.close()
+
+        done.set()
+        latencies = []
+        errors = 0
+        for _ in processes:
+            reader_latencies, reader_errors = queue.get()
+            latencies.extend(reader_latencies)
+            errors += reader_errors
+        for process in processes:
+            process.join()
+
+    return {
+        "profile": profile,
+        "rounds": rounds,
+        "snapshots": rounds * len(batches[0]),
+        "write_seconds": round(write_seconds, 4),
+        "reads": len(latencies),
+        "read_errors": errors,
+        "read_ms": {
+            "p50": round(statistics.median(latencies) * 1000, 3) if latencies else None,
+            "p99": round(_percentile(latencies, 99) * 1000, 3) if latencies else None,
+            "max": round(max(latencies) * 1000, 3) if latencies else None,
+        },
+    }
+
+
+def run_benchmark(rounds=300, readers=4, seed=2029, profiles=("default", "tuned")):
+    return {profile: run_profile(profile, rounds, readers, seed) for profile in profiles}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de lectura concurrente durante la ingesta SQLite.")
+    parser.add_argument("--rounds", type=int, default=300)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=2029)
+    parser.add_argument("--profile", action="append", choices=sorted(STORAGE_PROFILES))
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.rounds, args.readers, args.seed, tuple(args.profile or ("default", "tuned")))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Benchmark de VoteMatrix contra los recorridos en Python de los análisis actuales.
+
+Serie sintética de un departamento (N snapshots × C candidatos, con retrocesos
+ocasionales). Se comparan:
+- deltas consecutivos: _diff_candidates de replay_2025 por cada par vs. deltas();
+- pérdidas respecto al máximo previo: el recorrido con peak_votos de la regla
+  negative_delta vs. negative_deltas(from_peak=True);
+- participación por candidato: dicts por snapshot vs. shares().
+La construcción de la matriz (desde dicts normalizados y desde LocalSnapshotStore)
+se informa aparte.
+
+Uso:
+    python -m scripts.benchmarks.vote_matrix --snapshots 5000 --candidates 10
+"""
+
+import argparse
+import json
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from scripts.replay_2025 import _diff_candidates
+from sentinel.core.normalyze import normalize_snapshot, snapshot_to_dict
+from sentinel.core.storage import LocalSnapshotStore
+from sentinel.core.vote_matrix import VoteMatrix
+
+START = datetime(2029, 11, 30, 18, 0)
+
+
+def synthetic_series(snapshots, candidates, seed):
+    rng = random.Random(seed)
+    votes = [0] * candidates
+    series = []
+    for index in range(snapshots):
+        for slot in range(candidates):
+            # 1 de cada 200 celdas retrocede: el caso que buscan las reglas.
+            step = -rng.randint(1, 50) if rng.random() < 0.005 else rng.randint(0, 400)
+            votes[slot] = max(0, votes[slot] + step)
+        timestamp = (START + timedelta(minutes=5 * index)).strftime("%Y-%m-%dT%H:%M:%SZ")
+        raw = {"candidates": {str(slot): value for slot, value in enumerate(votes, start=1)}}
+        series.append(normalize_snapshot(raw, "Francisco Morazán", timestamp, candidate_count=candidates))
+    return series
+
+
+def python_peak_losses(payloads):
+    peak_votos = {}
+    losses = 0
+    for payload in payloads:
+        for candidate in payload["candidates"]:
+            c_id = str(candidate["slot"])
+            v_actual = int(candidate["votes"])
+            if c_id in peak_votos and v_actual < peak_votos[c_id]:
+                losses += 1
+            if c_id not in peak_votos or v_actual > peak_votos[c_id]:
+                peak_votos[c_id] = v_actual
+    return losses
+
+
+def python_shares(payloads):
+    shares = []
+    for payload in payloads:
+        total = sum(candidate["votes"] for candidate in payload["candidates"])
+        shares.append({
+            candidate["slot"]: candidate["votes"] / total if total else 0.0
+            for candidate in payload["candidates"]
+        })
+    return shares
+
+
+def _best(func, repeat=3):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run_benchmark(snapshots=5000, candidates=10, seed=2029):
+    series = synthetic_series(snapshots, candidates, seed)
+    payloads = [snapshot_to_dict(snapshot) for snapshot in series]
+
+    build_json, matrix = _best(lambda: VoteMatrix.from_json(payloads))
+    with tempfile.TemporaryDirectory() as tmp:
+        store = LocalSnapshotStore(str(Path(tmp) / "snapshots.db"))
+        store.store_snapshots(series)
+        build_store, from_store = _best(lambda: VoteMatrix.from_store(store, "08"))
+        store.close()
+    assert (from_store.votes == matrix.votes).all()
+
+    python_deltas, diffs = _best(lambda: [_diff_candidates(prev, curr) for prev, curr in zip(payloads, payloads[1:])])
+    matrix_deltas, deltas = _best(matrix.deltas)
+    assert [item["delta_votes"] for item in diffs[-1]] == deltas[-1].tolist()
+
+    python_peaks, python_losses = _best(lambda: python_peak_losses(payloads))
+    matrix_peaks, mask = _best(lambda: matrix.negative_deltas(from_peak=True))
+    assert python_losses == int(mask.sum())
+
+    python_share, _ = _best(lambda: python_shares(payloads))
+    matrix_share, _ = _best(matrix.shares)
+
+    def compare(python_seconds, matrix_seconds):
+        return {
+            "python_ms": round(python_seconds * 1e3, 2),
+            "vote_matrix_ms": round(matrix_seconds * 1e3, 3),
+            "speedup": round(python_seconds / matrix_seconds, 1),
+        }
+
+    return {
+        "snapshots": snapshots,
+        "candidates": candidates,
+        "matrix_bytes": matrix.votes.nbytes + matrix.present.nbytes + matrix.timestamps.nbytes,
+        "build_ms": {
+            "from_json": round(build_json * 1e3, 2),
+            "from_store": round(build_store * 1e3, 2),
+        },
+        "deltas": compare(python_deltas, matrix_deltas),
+        "peak_losses": {**compare(python_peaks, matrix_peaks), "losses": python_losses},
+        "shares": compare(python_share, matrix_share),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de VoteMatrix vs. recorridos en Python.")
+    parser.add_argument("--snapshots", type=int, default=5000)
+    parser.add_argument("--candidates", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=2029)
+    args = parser.parse_args(argv)
+    print(json.dumps(run_benchmark(args.snapshots, args.candidates, args.seed), indent=2))
+
+
+if __name__ == "__main__":
+    main()
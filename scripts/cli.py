@@ -2,13 +2,19 @@
 import argparse
 import hashlib
 import json
-from collections import Counter
+import os
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 from sentinel.core.hashchain import compute_hash
+from sentinel.core.merkle import MerkleLedger, verify_proof
 from sentinel.core.normalyze import normalize_snapshot, snapshot_to_canonical_json
+from sentinel.core.rules import benford_first_digit, load_rule_settings
+from sentinel.core.storage import STORAGE_PROFILES, migrate_department_tables
+from sentinel.core.verify import verify_hashchain_file, verify_store
 
 
 @dataclass(frozen=True)
@@ -24,14 +30,21 @@ class NormalizedSnapshot:
     canonical_json: str
 
 
+NORMALIZE_CHUNK_SIZE = 64
+
+
+def snapshot_paths(data_dir: Path) -> List[Path]:
+    return sorted(data_dir.glob("*.json"))
+
+
+def read_snapshot(path: Path) -> SnapshotInput:
+    raw = json.loads(path.read_text(encoding="utf-8"))
+    timestamp = raw.get("timestamp") or raw.get("timestamp_utc") or path.stem
+    return SnapshotInput(path=path, timestamp=timestamp, raw=raw)
+
+
 def load_snapshots(data_dir: Path) -> List[SnapshotInput]:
-    files = sorted(data_dir.glob("*.json"))
-    snapshots: List[SnapshotInput] = []
-    for path in files:
-        raw = json.loads(path.read_text(encoding="utf-8"))
-        timestamp = raw.get("timestamp") or raw.get("timestamp_utc") or path.stem
-        snapshots.append(SnapshotInput(path=path, timestamp=timestamp, raw=raw))
-    return snapshots
+    return [read_snapshot(path) for path in snapshot_paths(data_dir)]
 
 
 def normalize_snapshots(
@@ -39,26 +52,81 @@ def normalize_snapshots(
     department: str,
     year: int,
 ) -> List[NormalizedSnapshot]:
-    normalized: List[NormalizedSnapshot] = []
-    for snapshot in snapshots:
-        normalized_snapshot = normalize_snapshot(
-            snapshot.raw,
-            department,
-            snapshot.timestamp,
-            year=year,
-        )
-        canonical_json = snapshot_to_canonical_json(normalized_snapshot)
-        normalized.append(
-            NormalizedSnapshot(
-                name=snapshot.path.stem,
-                canonical_json=canonical_json,
-            )
-        )
-    return normalized
+    return [_normalize_input(snapshot, department, year) for snapshot in snapshots]
+
+
+def _normalize_input(snapshot: SnapshotInput, department: str, year: int) -> NormalizedSnapshot:
+    normalized_snapshot = normalize_snapshot(
+        snapshot.raw,
+        department,
+        snapshot.timestamp,
+        year=year,
+    )
+    return NormalizedSnapshot(
+        name=snapshot.path.stem,
+        canonical_json=snapshot_to_canonical_json(normalized_snapshot),
+    )
+
+
+def _normalize_chunk(
+    paths: Sequence[Path],
+    department: str,
+    year: int,
+) -> List[Tuple[SnapshotInput, NormalizedSnapshot]]:
+    # Corre en el proceso worker: lectura, parseo JSON y normalización.
+    items = []
+    for path in paths:
+        snapshot = read_snapshot(path)
+        items.append((snapshot, _normalize_input(snapshot, department, year)))
+    return items
+
+
+def _chunks(paths: Iterable[Path], size: int) -> Iterator[List[Path]]:
+    chunk: List[Path] = []
+    for path in paths:
+        chunk.append(path)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def iter_normalized(
+    paths: Iterable[Path],
+    department: str,
+    year: int,
+    workers: int = 1,
+    chunk_size: Optional[int] = None,
+) -> Iterator[Tuple[SnapshotInput, NormalizedSnapshot]]:
+    """
+    Lee y normaliza snapshots por bloques, en paralelo, y los entrega en el orden de `paths`.
+
+    Con workers > 1 cada bloque se procesa en un proceso aparte; como mucho hay
+    2 × workers bloques en vuelo, así la memoria no crece con el número de
+    archivos y la cadena de hashes sigue siendo determinista. workers=0 usa
+    todos los núcleos; workers=1 normaliza en el proceso actual.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunk_size = chunk_size or NORMALIZE_CHUNK_SIZE
+    chunks = _chunks(paths, chunk_size)
+    if workers == 1:
+        for chunk in chunks:
+            yield from _normalize_chunk(chunk, department, year)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: deque = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(_normalize_chunk, chunk, department, year))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
 
 
 def write_normalized_outputs(
-    normalized: List[NormalizedSnapshot],
+    normalized: Iterable[NormalizedSnapshot],
     output_dir: Path,
 ) -> List[Path]:
     normalized_dir = output_dir / "normalized"
@@ -72,7 +140,7 @@ def write_normalized_outputs(
 
 
 def write_hashchain(
-    normalized: List[NormalizedSnapshot],
+    normalized: Iterable[NormalizedSnapshot],
     output_dir: Path,
 ) -> Tuple[Path, List[Dict[str, Optional[str]]]]:
     hash_entries: List[Dict[str, Optional[str]]] = []
@@ -102,6 +170,98 @@ def write_hashchain(
     return chain_path, hash_entries
 
 
+def _write_with_digest(path: Path, text: str) -> str:
+    """Escribe `text` y devuelve el SHA-256 de los bytes escritos, sin releer el archivo."""
+    data = text.encode("utf-8")
+    path.write_bytes(data)
+    return hashlib.sha256(data).hexdigest()
+
+
+def _write_json_with_digest(path: Path, payload: Any) -> str:
+    """json.dumps(payload, indent=2, sort_keys=True) + salto de línea, codificado por partes."""
+    with _DigestWriter(path) as handle:
+        for chunk in json.JSONEncoder(indent=2, sort_keys=True).iterencode(payload):
+            handle.write(chunk)
+        handle.write("\n")
+    return handle.hexdigest()
+
+
+class _DigestWriter:
+    """Archivo de texto UTF-8 que calcula el SHA-256 de lo escrito."""
+
+    def __init__(self, path: Path) -> None:
+        self._handle = path.open("wb")
+        self._digest = hashlib.sha256()
+
+    def __enter__(self) -> "_DigestWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def write(self, text: str) -> None:
+        data = text.encode("utf-8")
+        self._handle.write(data)
+        self._digest.update(data)
+
+    def close(self) -> None:
+        self._handle.close()
+
+    def hexdigest(self) -> str:
+        return self._digest.hexdigest()
+
+
+class JsonArrayWriter:
+    """
+    Escribe un arreglo JSON elemento por elemento, con el mismo texto que
+    json.dumps(lista, indent=2, sort_keys=True) + salto de línea.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.length = 0
+        self._writer = _DigestWriter(path)
+
+    def __enter__(self) -> "JsonArrayWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._writer.close()
+
+    def append(self, item: Any) -> None:
+        # Cada elemento va indentado un nivel dentro del arreglo.
+        body = json.dumps(item, indent=2, sort_keys=True).replace("\n", "\n  ")
+        self._writer.write(("[\n  " if self.length == 0 else ",\n  ") + body)
+        self.length += 1
+
+    def close(self) -> str:
+        """Cierra el arreglo y devuelve el SHA-256 del archivo."""
+        self._writer.write("[]\n" if self.length == 0 else "\n]\n")
+        self._writer.close()
+        return self._writer.hexdigest()
+
+
+class HashchainWriter(JsonArrayWriter):
+    """
+    Escribe hashchain.json eslabón por eslabón, con el mismo formato que write_hashchain.
+
+    Cada eslabón también queda en hashes/<snapshot>.sha256.
+    """
+
+    def __init__(self, output_dir: Path) -> None:
+        self.hashes_dir = output_dir / "hashes"
+        self.hashes_dir.mkdir(parents=True, exist_ok=True)
+        self.head: Optional[str] = None
+        super().__init__(output_dir / "hashchain.json")
+
+    def append_snapshot(self, item: NormalizedSnapshot) -> str:
+        current_hash = compute_hash(item.canonical_json, self.head)
+        self.append({"snapshot": item.name, "hash": current_hash, "previous_hash": self.head})
+        (self.hashes_dir / f"{item.name}.sha256").write_text(current_hash + "\n", encoding="utf-8")
+        self.head = current_hash
+        return current_hash
+
+
 def _safe_int(value: Any, default: int = 0) -> int:
     try:
         if value is None:
@@ -111,35 +271,22 @@ def _safe_int(value: Any, default: int = 0) -> int:
         return default
 
 
-def _apply_benford(votos_lista: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
-    if len(votos_lista) < 10:
-        return None
-
-    first_digits = []
-    for candidate in votos_lista:
-        votos_str = str(candidate.get("votos", "")).strip()
-        if votos_str and votos_str not in ["0", "None"]:
-            first_digits.append(int(votos_str[0]))
-
-    if not first_digits:
-        return None
+class SnapshotAuditor:
+    """Auditoría incremental (delta negativo y Benford): un snapshot a la vez, con el estado de picos."""
 
-    counts = Counter(first_digits)
-    total = len(first_digits)
-    dist_1 = (counts[1] / total) * 100
-    is_anomaly = dist_1 < 20.0
-    return {"is_anomaly": is_anomaly, "prop_1": dist_1}
-
-
-def audit_snapshots(snapshots: List[SnapshotInput]) -> List[Dict[str, Any]]:
-    peak_votes: Dict[str, Dict[str, Any]] = {}
-    anomalies: List[Dict[str, Any]] = []
+    def __init__(self, rule_settings: Optional[Dict[str, Dict[str, Any]]] = None) -> None:
+        settings = rule_settings if rule_settings is not None else load_rule_settings()
+        self.check_negative_delta = settings["negative_delta"]["enabled"]
+        self.benford_settings = settings["benford"]
+        self.peak_votes: Dict[str, Dict[str, Any]] = {}
 
-    for snapshot in snapshots:
+    def feed(self, snapshot: SnapshotInput) -> List[Dict[str, Any]]:
+        peak_votes = self.peak_votes
+        anomalies: List[Dict[str, Any]] = []
         raw = snapshot.raw
         votos_actuales = raw.get("votos") or raw.get("candidates") or []
 
-        for candidate in votos_actuales:
+        for candidate in votos_actuales if self.check_negative_delta else []:
             candidate_id = str(candidate.get("id") or candidate.get("nombre") or "unknown")
             current_votes = _safe_int(candidate.get("votos"))
 
@@ -161,7 +308,13 @@ def audit_snapshots(snapshots: List[SnapshotInput]) -> List[Dict[str, Any]]:
                     "file": snapshot.path.name,
                 }
 
-        benford = _apply_benford(votos_actuales)
+        benford = None
+        if self.benford_settings["enabled"]:
+            benford = benford_first_digit(
+                votos_actuales,
+                min_samples=self.benford_settings["min_samples"],
+                min_first_digit_pct=self.benford_settings["min_first_digit_pct"],
+            )
         if benford and benford["is_anomaly"]:
             anomalies.append(
                 {
@@ -170,16 +323,23 @@ def audit_snapshots(snapshots: List[SnapshotInput]) -> List[Dict[str, Any]]:
                     "prop_1": round(benford["prop_1"], 2),
                 }
             )
+        return anomalies
 
+
+def audit_snapshots(
+    snapshots: Iterable[SnapshotInput],
+    rule_settings: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> List[Dict[str, Any]]:
+    auditor = SnapshotAuditor(rule_settings)
+    anomalies: List[Dict[str, Any]] = []
+    for snapshot in snapshots:
+        anomalies.extend(auditor.feed(snapshot))
     return anomalies
 
 
 def write_anomalies(anomalies: List[Dict[str, Any]], output_dir: Path) -> Path:
     anomalies_path = output_dir / "anomalies.json"
-    anomalies_path.write_text(
-        json.dumps(anomalies, indent=2, sort_keys=True) + "\n",
-        encoding="utf-8",
-    )
+    _write_json_with_digest(anomalies_path, anomalies)
     return anomalies_path
 
 
@@ -192,15 +352,16 @@ def _sha256_file(path: Path) -> str:
 
 
 def write_registry(paths: List[Path], output_dir: Path) -> Path:
-    entries = [
-        {"path": str(path), "sha256": _sha256_file(path)}
-        for path in sorted(paths, key=lambda p: str(p))
-    ]
+    return write_registry_digests({str(path): _sha256_file(path) for path in paths}, output_dir)
+
+
+def write_registry_digests(digests: Dict[str, str], output_dir: Path) -> Path:
+    """Registro a partir de digests ya calculados al escribir ({ruta: sha256})."""
     registry_path = output_dir / "registry.json"
-    registry_path.write_text(
-        json.dumps(entries, indent=2, sort_keys=True) + "\n",
-        encoding="utf-8",
-    )
+    with JsonArrayWriter(registry_path) as registry:
+        for path in sorted(digests):
+            registry.append({"path": path, "sha256": digests[path]})
+        registry.close()
     return registry_path
 
 
@@ -212,16 +373,34 @@ def build_status(
     output_dir: Path,
     data_dir: Path,
 ) -> Dict[str, Any]:
-    latest_snapshot = snapshots[-1].path.name if snapshots else None
-    latest_timestamp = snapshots[-1].timestamp if snapshots else None
-    head_hash = hash_entries[-1]["hash"] if hash_entries else None
+    return _status_payload(
+        snapshot_count=len(snapshots),
+        latest_snapshot=snapshots[-1].path.name if snapshots else None,
+        latest_timestamp=snapshots[-1].timestamp if snapshots else None,
+        chain_length=len(hash_entries),
+        head_hash=hash_entries[-1]["hash"] if hash_entries else None,
+        anomaly_types=Counter([a["type"] for a in anomalies]),
+        snapshot_names=[item.name for item in normalized],
+        output_dir=output_dir,
+        data_dir=data_dir,
+    )
 
-    anomaly_types = Counter([a["type"] for a in anomalies])
 
+def _status_payload(
+    snapshot_count: int,
+    latest_snapshot: Optional[str],
+    latest_timestamp: Optional[str],
+    chain_length: int,
+    head_hash: Optional[str],
+    anomaly_types: Counter,
+    snapshot_names: List[str],
+    output_dir: Path,
+    data_dir: Path,
+) -> Dict[str, Any]:
     return {
         "inputs": {
             "data_dir": str(data_dir),
-            "snapshot_count": len(snapshots),
+            "snapshot_count": snapshot_count,
             "latest_snapshot": latest_snapshot,
             "latest_timestamp": latest_timestamp,
         },
@@ -233,60 +412,75 @@ def build_status(
             "registry": str(output_dir / "registry.json"),
         },
         "hashchain": {
-            "length": len(hash_entries),
+            "length": chain_length,
             "head": head_hash,
         },
         "anomalies": {
-            "count": len(anomalies),
+            "count": sum(anomaly_types.values()),
             "by_type": dict(sorted(anomaly_types.items())),
         },
         "normalized": {
-            "count": len(normalized),
-            "snapshots": [item.name for item in normalized],
+            "count": len(snapshot_names),
+            "snapshots": snapshot_names,
         },
     }
 
 
 def write_status(status: Dict[str, Any], output_dir: Path) -> Path:
     status_path = output_dir / "status.json"
-    status_path.write_text(
-        json.dumps(status, indent=2, sort_keys=True) + "\n",
-        encoding="utf-8",
-    )
+    _write_json_with_digest(status_path, status)
     return status_path
 
 
 def run_pipeline(args: argparse.Namespace) -> None:
+    """
+    Pipeline en streaming: cada snapshot pasa por leer → normalizar → escribir →
+    encadenar → auditar y se descarta, así la memoria no crece con el número de
+    snapshots. El registro usa los SHA-256 calculados al escribir cada archivo.
+    """
     data_dir = Path(args.data_dir)
     output_dir = Path(args.output_dir)
-    output_dir.mkdir(parents=True, exist_ok=True)
-
-    snapshots = load_snapshots(data_dir)
-    normalized = normalize_snapshots(snapshots, args.department, args.year)
-
-    normalized_paths = write_normalized_outputs(normalized, output_dir)
-    hashchain_path, hash_entries = write_hashchain(normalized, output_dir)
-    anomalies = audit_snapshots(snapshots)
-    anomalies_path = write_anomalies(anomalies, output_dir)
-
-    status = build_status(
-        snapshots,
-        normalized,
-        hash_entries,
-        anomalies,
-        output_dir,
-        data_dir,
-    )
-    status_path = write_status(status, output_dir)
-    registry_path = write_registry(
-        normalized_paths + [hashchain_path, anomalies_path, status_path],
-        output_dir,
+    normalized_dir = output_dir / "normalized"
+    normalized_dir.mkdir(parents=True, exist_ok=True)
+
+    digests: Dict[str, str] = {}
+    snapshot_names: List[str] = []
+    anomaly_types: Counter = Counter()
+    auditor = SnapshotAuditor()
+    latest_snapshot, latest_timestamp = None, None
+
+    with HashchainWriter(output_dir) as chain, JsonArrayWriter(output_dir / "anomalies.json") as anomalies:
+        for snapshot, item in iter_normalized(snapshot_paths(data_dir), args.department, args.year, args.workers):
+            out_path = normalized_dir / f"{item.name}.json"
+            digests[str(out_path)] = _write_with_digest(out_path, item.canonical_json + "\n")
+            chain.append_snapshot(item)
+            for anomaly in auditor.feed(snapshot):
+                anomalies.append(anomaly)
+                anomaly_types[anomaly["type"]] += 1
+            snapshot_names.append(item.name)
+            latest_snapshot, latest_timestamp = snapshot.path.name, snapshot.timestamp
+        digests[str(chain.path)] = chain.close()
+        digests[str(anomalies.path)] = anomalies.close()
+
+    status = _status_payload(
+        snapshot_count=len(snapshot_names),
+        latest_snapshot=latest_snapshot,
+        latest_timestamp=latest_timestamp,
+        chain_length=chain.length,
+        head_hash=chain.head,
+        anomaly_types=anomaly_types,
+        snapshot_names=snapshot_names,
+        output_dir=output_dir,
+        data_dir=data_dir,
     )
+    status_path = output_dir / "status.json"
+    digests[str(status_path)] = _write_json_with_digest(status_path, status)
+    registry_path = write_registry_digests(digests, output_dir)
 
     summary = {
-        "normalized": len(normalized_paths),
-        "hashchain": str(hashchain_path),
-        "anomalies": len(anomalies),
+        "normalized": len(snapshot_names),
+        "hashchain": str(chain.path),
+        "anomalies": anomalies.length,
         "status": str(status_path),
         "registry": str(registry_path),
     }
@@ -304,6 +498,73 @@ def show_status(args: argparse.Namespace) -> None:
     print(json.dumps(status, indent=2, sort_keys=True))
 
 
+def migrate_store(args: argparse.Namespace) -> None:
+    db_path = Path(args.db)
+    if not db_path.exists():
+        raise SystemExit(f"No existe la base SQLite {db_path}.")
+    migrated = migrate_department_tables(str(db_path), drop_legacy=args.drop_legacy, profile=args.profile)
+    print(json.dumps({"db": str(db_path), "migrated": migrated, "dropped_legacy": args.drop_legacy}, indent=2, sort_keys=True))
+
+
+def verify_chains(args: argparse.Namespace) -> None:
+    if args.db:
+        db_path = Path(args.db)
+        if not db_path.exists():
+            raise SystemExit(f"No existe la base SQLite {db_path}.")
+        results = verify_store(
+            str(db_path),
+            department_codes=args.department or None,
+            checkpoints_path=Path(args.checkpoints) if args.checkpoints else None,
+            workers=args.workers,
+            full=args.full,
+        )
+    else:
+        output_dir = Path(args.output_dir)
+        if not (output_dir / "hashchain.json").exists():
+            raise SystemExit(
+                f"No existe hashchain.json en {output_dir}. "
+                "Ejecuta 'run' primero."
+            )
+        result = verify_hashchain_file(output_dir)
+        results = {result.chain: result}
+
+    report = {chain: result.to_dict() for chain, result in results.items()}
+    print(json.dumps(report, indent=2, sort_keys=True))
+    broken = [result.broken for result in results.values() if result.broken]
+    if broken:
+        first = broken[0]
+        raise SystemExit(
+            f"Cadena rota: {first.chain} en la posición {first.position} "
+            f"({first.timestamp_utc}, {first.reason})."
+        )
+
+
+def merkle_proof(args: argparse.Namespace) -> None:
+    ledger = MerkleLedger(args.merkle_dir)
+    try:
+        proof = ledger.prove(args.hash, round_id=args.round_id)
+    except KeyError as exc:
+        raise SystemExit(str(exc.args[0])) from exc
+    print(json.dumps(proof, indent=2, sort_keys=True))
+
+
+def merkle_verify(args: argparse.Namespace) -> None:
+    proof = json.loads(Path(args.proof).read_text(encoding="utf-8"))
+    round_root, day_root = args.round_root, args.day_root
+    if round_root is None and day_root is None:
+        if not args.merkle_dir:
+            raise SystemExit("Indica --round-root/--day-root publicados o --merkle-dir para leerlos del ledger.")
+        # La raíz de una ronda no cambia; la del día sí, con cada ronda nueva.
+        record = MerkleLedger(args.merkle_dir).load_round(proof["round_id"])
+        if record is None:
+            raise SystemExit(f"Ronda {proof['round_id']} no registrada en {args.merkle_dir}.")
+        round_root = record["root"]
+    valid = verify_proof(proof, round_root=round_root, day_root=day_root)
+    print(json.dumps({"valid": valid, "round_root": round_root, "day_root": day_root}, indent=2))
+    if not valid:
+        raise SystemExit("La prueba de inclusión no coincide con las raíces publicadas.")
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="CLI para ejecutar el pipeline Proyecto C.E.N.T.I.N.E.L. y consultar estado."
@@ -332,6 +593,12 @@ def build_parser() -> argparse.ArgumentParser:
         default=2025,
         help="Año electoral para metadatos.",
     )
+    run_parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Procesos para leer y normalizar snapshots (0 = todos los núcleos).",
+    )
     run_parser.set_defaults(func=run_pipeline)
 
     status_parser = subparsers.add_parser(
@@ -344,6 +611,74 @@ def build_parser() -> argparse.ArgumentParser:
     )
     status_parser.set_defaults(func=show_status)
 
+    migrate_parser = subparsers.add_parser(
+        "migrate-store",
+        help="Migra las tablas dept_XX_snapshots a la tabla única snapshots.",
+    )
+    migrate_parser.add_argument("--db", required=True, help="Ruta de la base SQLite.")
+    migrate_parser.add_argument(
+        "--drop-legacy",
+        action="store_true",
+        help="Elimina las tablas por departamento y snapshot_index tras migrar.",
+    )
+    migrate_parser.add_argument(
+        "--profile",
+        choices=sorted(STORAGE_PROFILES),
+        default="default",
+        help="Perfil de conexión SQLite; 'tuned' pasa la base a WAL de forma persistente.",
+    )
+    migrate_parser.set_defaults(func=migrate_store)
+
+    verify_parser = subparsers.add_parser(
+        "verify",
+        help="Verifica las cadenas de hashes (por departamento, en paralelo e incremental).",
+    )
+    verify_source = verify_parser.add_mutually_exclusive_group()
+    verify_source.add_argument("--db", help="Base SQLite de LocalSnapshotStore a verificar.")
+    verify_source.add_argument(
+        "--output-dir",
+        default="reports/pipeline",
+        help="Directorio con hashchain.json y normalized/ de 'run'.",
+    )
+    verify_parser.add_argument(
+        "--department",
+        action="append",
+        help="Código de departamento a verificar (repetible); por defecto todos.",
+    )
+    verify_parser.add_argument("--workers", type=int, default=None, help="Procesos en paralelo.")
+    verify_parser.add_argument(
+        "--checkpoints",
+        help="Archivo de checkpoints (por defecto <db>.verified.json).",
+    )
+    verify_parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Ignora los checkpoints y verifica cada cadena desde el inicio.",
+    )
+    verify_parser.set_defaults(func=verify_chains)
+
+    proof_parser = subparsers.add_parser(
+        "merkle-proof",
+        help="Genera la prueba de inclusión Merkle de un hash de snapshot.",
+    )
+    proof_parser.add_argument("--hash", required=True, help="Hash SHA-256 del snapshot.")
+    proof_parser.add_argument("--round-id", help="Ronda que lo contiene (por defecto se busca).")
+    proof_parser.add_argument("--merkle-dir", default="hashes/merkle", help="Directorio del ledger Merkle.")
+    proof_parser.set_defaults(func=merkle_proof)
+
+    proof_verify_parser = subparsers.add_parser(
+        "merkle-verify",
+        help="Verifica una prueba de inclusión Merkle contra las raíces publicadas.",
+    )
+    proof_verify_parser.add_argument("--proof", required=True, help="Archivo JSON generado por merkle-proof.")
+    proof_verify_parser.add_argument("--round-root", help="Raíz publicada de la ronda (p. ej. la de la alerta).")
+    proof_verify_parser.add_argument("--day-root", help="Raíz diaria publicada.")
+    proof_verify_parser.add_argument(
+        "--merkle-dir",
+        help="Ledger Merkle del que leer la raíz de la ronda si no se indican raíces.",
+    )
+    proof_verify_parser.set_defaults(func=merkle_verify)
+
     return parser
 
 
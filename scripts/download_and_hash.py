@@ -1,24 +1,41 @@
+import argparse
+import asyncio
+import copy
+import hashlib
 import json
 import logging
 import os
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Iterator
+from urllib.parse import urlsplit
 
 import requests
 import yaml
 from dotenv import load_dotenv
 
+from sentinel.core.columnar import ColumnarSnapshotStore
 from sentinel.core.hashchain import compute_hash
-from sentinel.core.normalyze import DEPARTMENT_CODES, normalize_snapshot, snapshot_to_canonical_json
-from sentinel.core.scraping import fetch_payload_with_playwright
+from sentinel.core.http_async import AsyncHttpClient
+from sentinel.core.merkle import MerkleLedger
+from sentinel.core.normalyze import DEPARTMENT_CODES, compile_field_map, normalize_snapshot, snapshot_to_canonical_json
+from sentinel.core.scraping import BrowserPool, fetch_payload_with_playwright, get_browser_pool
+from sentinel.utils import codec
 from sentinel.utils.logging_config import setup_logging
 
 # Directorios
 data_dir = Path("data")
 hash_dir = Path("hashes")
 config_path = Path(__file__).resolve().parents[1] / "config.yaml"
+# Último hash por departamento; evita recorrer hashes/ en cada snapshot.
+CHAIN_HEADS_FILE = "chain_heads.json"
+CHAIN_HEADS_VERSION = 1
+MERKLE_DIR = "merkle"
+_chain_heads_lock = threading.Lock()
 
 data_dir.mkdir(exist_ok=True)
 hash_dir.mkdir(exist_ok=True)
@@ -65,6 +82,20 @@ def load_config() -> Dict[str, Any]:
     playwright_locale = config.get("playwright_locale")
     playwright_timezone = config.get("playwright_timezone")
     playwright_viewport = config.get("playwright_viewport")
+    playwright_pool_size = max(1, int(config.get("playwright_pool_size", 2)))
+    playwright_max_pages_per_context = max(1, int(config.get("playwright_max_pages_per_context", 50)))
+    max_concurrency = max(1, int(os.getenv("MAX_CONCURRENCY") or config.get("max_concurrency", 1)))
+    max_requests_per_host = max(1, int(config.get("max_requests_per_host", max_concurrency)))
+    round_deadline = config.get("round_deadline_seconds")
+    round_deadline = float(round_deadline) if round_deadline else None
+    http_backend = str(os.getenv("HTTP_BACKEND") or config.get("http_backend", "sync")).strip().lower()
+    if http_backend not in {"sync", "async"}:
+        raise ValueError(f"http_backend inválido: {http_backend} (usa 'sync' o 'async').")
+    http_keepalive_seconds = float(config.get("http_keepalive_seconds", 30))
+    conditional_requests = bool(config.get("conditional_requests", True))
+    validators_path = Path(config.get("validators_path", "data/state/source_validators.json"))
+    columnar_store_path = os.getenv("COLUMNAR_STORE_PATH", config.get("columnar_store_path", "data/columnar"))
+    columnar_store_path = Path(columnar_store_path) if columnar_store_path else None
 
     sources = config.get("sources")
     if not sources:
@@ -101,25 +132,227 @@ def load_config() -> Dict[str, Any]:
         "sources": resolved_sources,
         "required_keys": required_keys,
         "field_map": field_map,
+        "field_plan": compile_field_map(field_map),
         "use_playwright": use_playwright,
         "playwright_stealth": playwright_stealth,
         "playwright_user_agent": playwright_user_agent,
         "playwright_locale": playwright_locale,
         "playwright_timezone": playwright_timezone,
         "playwright_viewport": playwright_viewport,
+        "playwright_pool_size": playwright_pool_size,
+        "playwright_max_pages_per_context": playwright_max_pages_per_context,
+        "max_concurrency": max_concurrency,
+        "max_requests_per_host": max_requests_per_host,
+        "round_deadline": round_deadline,
+        "http_backend": http_backend,
+        "http_keepalive_seconds": http_keepalive_seconds,
+        "conditional_requests": conditional_requests,
+        "validators_path": validators_path,
+        "columnar_store_path": columnar_store_path,
     }
 
 
+class HostLimiter:
+    """
+    Limita las solicitudes simultáneas por host del endpoint.
+    """
+
+    def __init__(self, max_per_host: int) -> None:
+        self.max_per_host = max(1, max_per_host)
+        self._lock = threading.Lock()
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+
+    @contextmanager
+    def limit(self, url: str) -> Iterator[None]:
+        host = urlsplit(url).netloc
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.max_per_host)
+                self._semaphores[host] = semaphore
+        with semaphore:
+            yield
+
+
 def get_previous_hash(department_code: str) -> str | None:
     """
-    Busca el hash previo más reciente para el departamento.
+    Devuelve el último hash del departamento desde el índice de cabezas de cadena.
+
+    Si el índice aún no existe se reconstruye una vez desde los archivos .sha256.
+    """
+    heads = load_chain_heads()
+    if heads is None:
+        heads = rebuild_chain_heads()
+    head = heads.get(department_code)
+    return head["hash"] if head else None
+
+
+def chain_heads_path() -> Path:
+    return hash_dir / CHAIN_HEADS_FILE
+
+
+def load_chain_heads(path: Path | None = None) -> Dict[str, Dict[str, str]] | None:
+    """Lee el índice de cabezas; None si no existe o es ilegible (hay que reconstruirlo)."""
+    path = path or chain_heads_path()
+    if not path.exists():
+        return None
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError) as exc:
+        logger.warning("chain_heads_load_failed path=%s error=%s", path, exc)
+        return None
+    if payload.get("version") != CHAIN_HEADS_VERSION:
+        return None
+    return payload.get("heads", {})
+
+
+def save_chain_heads(heads: Dict[str, Dict[str, str]], path: Path | None = None) -> None:
+    path = path or chain_heads_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_text(
+        json.dumps({"version": CHAIN_HEADS_VERSION, "heads": heads}, indent=2, sort_keys=True),
+        encoding="utf-8",
+    )
+    os.replace(tmp_path, path)
+
+
+def update_chain_head(department_code: str, hash_value: str, timestamp_utc: str, hash_path: Path) -> None:
+    with _chain_heads_lock:
+        heads = load_chain_heads()
+        if heads is None:
+            heads = rebuild_chain_heads()
+        heads[department_code] = {
+            "hash": hash_value,
+            "timestamp_utc": timestamp_utc,
+            "hash_file": hash_path.name,
+        }
+        save_chain_heads(heads)
+
+
+def _hash_file_key(path: Path) -> tuple[str, datetime] | None:
+    # snapshot_{code}_{timestamp con ":" → "-"}.sha256; el timestamp no lleva "_".
+    if not path.stem.startswith("snapshot_"):
+        return None
+    department_code, _, timestamp = path.stem[len("snapshot_"):].rpartition("_")
+    date_part, _, time_part = timestamp.partition("T")
+    try:
+        parsed = datetime.fromisoformat(f"{date_part}T{time_part.replace('-', ':')}")
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return department_code, parsed
+
+
+def rebuild_chain_heads(directory: Path | None = None) -> Dict[str, Dict[str, str]]:
+    """
+    Reconstruye el índice desde hashes/*.sha256 ordenando por el timestamp del nombre
+    (no por mtime) y lo guarda de forma atómica.
+    """
+    directory = directory or hash_dir
+    latest: Dict[str, tuple[datetime, Path]] = {}
+    for path in directory.glob("snapshot_*.sha256"):
+        key = _hash_file_key(path)
+        if key is None:
+            logger.warning("chain_heads_skipped_file path=%s", path)
+            continue
+        department_code, timestamp = key
+        if department_code not in latest or timestamp > latest[department_code][0]:
+            latest[department_code] = (timestamp, path)
+
+    heads = {
+        department_code: {
+            "hash": path.read_text(encoding="utf-8").strip(),
+            "timestamp_utc": timestamp.isoformat(),
+            "hash_file": path.name,
+        }
+        for department_code, (timestamp, path) in sorted(latest.items())
+    }
+    save_chain_heads(heads, directory / CHAIN_HEADS_FILE)
+    logger.info("chain_heads_rebuilt path=%s departments=%s", directory / CHAIN_HEADS_FILE, len(heads))
+    return heads
+
+
+def load_validators(path: Path) -> Dict[str, Dict[str, Any]]:
+    """
+    Lee los validadores HTTP guardados por fuente (ETag, Last-Modified, hash de contenido).
+    """
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError) as exc:
+        logger.warning("validators_load_failed path=%s error=%s", path, exc)
+        return {}
+
+
+def save_validators(path: Path, validators: Dict[str, Dict[str, Any]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_text(json.dumps(validators, indent=2, sort_keys=True), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def conditional_headers(headers: Dict[str, str], validators: Dict[str, Any] | None) -> Dict[str, str]:
+    if not validators:
+        return headers
+    request_headers = dict(headers)
+    if validators.get("etag"):
+        request_headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        request_headers["If-Modified-Since"] = validators["last_modified"]
+    return request_headers
+
+
+def record_validators(validators: Dict[str, Any], response_headers: Any, content_hash: str) -> None:
+    lowered = {key.lower(): value for key, value in response_headers.items()}
+    validators["etag"] = lowered.get("etag")
+    validators["last_modified"] = lowered.get("last-modified")
+    validators["content_hash"] = content_hash
+
+
+def build_request_params(source: Dict[str, Any]) -> Dict[str, Any]:
+    params = {"level": source.get("level", "PD")}
+    department_code = source.get("department_code")
+    if department_code:
+        params["dept"] = department_code
+    if source.get("params"):
+        params.update(source["params"])
+    return params
+
+
+def backoff_seconds(attempt: int, backoff_base: float, backoff_max: float) -> float:
+    return min(backoff_base * (2 ** (attempt - 1)), backoff_max)
+
+
+def request_timeout(timeout: float, deadline: float | None) -> float:
+    """
+    Timeout de una solicitud acotado al plazo de la ronda (`deadline` en time.monotonic()).
+
+    Con el plazo vencido lanza TimeoutError sin hacer la solicitud.
     """
-    pattern = f"snapshot_{department_code}_*.sha256"
-    hash_files = sorted(hash_dir.glob(pattern), key=lambda p: p.stat().st_mtime, reverse=True)
-    if hash_files:
-        with open(hash_files[0], "r", encoding="utf-8") as handle:
-            return handle.read().strip()
-    return None
+    if deadline is None:
+        return timeout
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise TimeoutError("Plazo de ronda excedido antes de la solicitud.")
+    return min(timeout, remaining)
+
+
+def _looks_like_html_or_captcha(text: str) -> bool:
+    lowered = text.lower()
+    if "<html" in lowered or "<!doctype html" in lowered or "<body" in lowered:
+        return True
+    captcha_markers = (
+        "captcha",
+        "verify you are human",
+        "recaptcha",
+        "hcaptcha",
+        "cf-turnstile",
+        "cloudflare",
+    )
+    return any(marker in lowered for marker in captcha_markers)
 
 
 def fetch_source_data(
@@ -138,56 +371,75 @@ def fetch_source_data(
     playwright_locale: str | None,
     playwright_timezone: str | None,
     playwright_viewport: Dict[str, int] | None,
-) -> Dict[str, Any]:
+    host_limiter: HostLimiter | None = None,
+    browser_pool: BrowserPool | None = None,
+    validators: Dict[str, Any] | None = None,
+    deadline: float | None = None,
+) -> Dict[str, Any] | None:
+    """
+    Descarga el payload JSON de una fuente con reintentos y fallbacks.
+
+    Si se pasan `validators`, envía una solicitud condicional y devuelve
+    `None` cuando la fuente responde 304 o el cuerpo es idéntico al anterior;
+    en una descarga nueva, `validators` se actualiza en sitio.
+
+    Con `deadline` (time.monotonic() del fin de la ronda) cada solicitud usa
+    como timeout lo que queda del plazo y, vencido, no se reintenta.
+    """
     if not endpoints:
         raise ValueError("No hay endpoints configurados para la fuente.")
-    params = {"level": source.get("level", "PD")}
+    params = build_request_params(source)
+    request_headers = conditional_headers(headers, validators)
     department_code = source.get("department_code")
-    if department_code:
-        params["dept"] = department_code
-    if source.get("params"):
-        params.update(source["params"])
     source_id = source.get("source_id") or department_code or source.get("name")
     last_error: Exception | None = None
     last_endpoint: str | None = None
 
-    def _looks_like_html_or_captcha(text: str) -> bool:
-        lowered = text.lower()
-        if "<html" in lowered or "<!doctype html" in lowered or "<body" in lowered:
-            return True
-        captcha_markers = (
-            "captcha",
-            "verify you are human",
-            "recaptcha",
-            "hcaptcha",
-            "cf-turnstile",
-            "cloudflare",
-        )
-        return any(marker in lowered for marker in captcha_markers)
-
     def _fetch_with_playwright(endpoint: str) -> Dict[str, Any]:
         return fetch_payload_with_playwright(
             base_url=endpoint,
             params=params,
-            timeout=timeout,
+            timeout=request_timeout(timeout, deadline),
             headers=headers,
             user_agent=playwright_user_agent,
             viewport=playwright_viewport,
             locale=playwright_locale,
-            timezone=playwright_timezone,
+            timezone_id=playwright_timezone,
             stealth=playwright_stealth,
+            pool=browser_pool,
         )
 
     for endpoint in endpoints:
         last_endpoint = endpoint
         for attempt in range(1, retries + 1):
+            # Fuera del try: con el plazo vencido no hay reintento ni fallback.
+            attempt_timeout = request_timeout(timeout, deadline)
             try:
-                response = session.get(endpoint, params=params, timeout=timeout, headers=headers)
+                if host_limiter:
+                    with host_limiter.limit(endpoint):
+                        response = session.get(
+                            endpoint, params=params, timeout=request_timeout(timeout, deadline), headers=request_headers
+                        )
+                else:
+                    response = session.get(endpoint, params=params, timeout=attempt_timeout, headers=request_headers)
+                if validators is not None and response.status_code == 304:
+                    logger.info("fetch_not_modified source_id=%s endpoint=%s reason=304", source_id, endpoint)
+                    return None
                 if not response.ok:
                     raise requests.HTTPError(
                         f"HTTP {response.status_code}",
                         response=response,
                     )
+                content_hash = None
+                if validators is not None:
+                    content_hash = hashlib.sha256(response.content).hexdigest()
+                    if content_hash == validators.get("content_hash"):
+                        logger.info(
+                            "fetch_not_modified source_id=%s endpoint=%s reason=content_hash",
+                            source_id,
+                            endpoint,
+                        )
+                        return None
                 try:
                     payload = response.json()
                 except ValueError as exc:
@@ -220,6 +472,8 @@ def fetch_source_data(
 
                 if not isinstance(payload, dict):
                     raise ValueError("Respuesta JSON no es un objeto.")
+                if validators is not None:
+                    record_validators(validators, response.headers, content_hash)
 
                 logger.info(
                     "fetch_success source_id=%s endpoint=%s status_code=%s attempt=%s",
@@ -239,8 +493,10 @@ def fetch_source_data(
                     exc,
                 )
                 if attempt < retries:
-                    sleep_time = min(backoff_base * (2 ** (attempt - 1)), backoff_max)
-                    time.sleep(sleep_time)
+                    delay = backoff_seconds(attempt, backoff_base, backoff_max)
+                    if deadline is not None:
+                        delay = min(delay, max(0.0, deadline - time.monotonic()))
+                    time.sleep(delay)
 
         logger.warning(
             "endpoint_failed source_id=%s endpoint=%s error=%s",
@@ -265,13 +521,14 @@ def fetch_source_data(
                 payload = fetch_payload_with_playwright(
                     base_url=base_url,
                     params=params,
-                    timeout=timeout,
+                    timeout=request_timeout(timeout, deadline),
                     headers=headers,
                     user_agent=playwright_user_agent,
                     locale=playwright_locale,
                     timezone_id=playwright_timezone,
                     viewport=playwright_viewport,
                     stealth=playwright_stealth,
+                    pool=browser_pool,
                 )
                 logger.info(
                     "fetch_fallback_success source_id=%s",
@@ -296,6 +553,152 @@ def fetch_source_data(
     raise last_error or RuntimeError("Fallo desconocido al descargar datos.")
 
 
+async def fetch_source_data_async(
+    client: AsyncHttpClient,
+    endpoints: list[str],
+    source: Dict[str, Any],
+    base_url: str | None,
+    timeout: float,
+    headers: Dict[str, str],
+    retries: int,
+    backoff_base: float,
+    backoff_max: float,
+    use_playwright: bool,
+    playwright_stealth: bool,
+    playwright_user_agent: str | None,
+    playwright_locale: str | None,
+    playwright_timezone: str | None,
+    playwright_viewport: Dict[str, int] | None,
+    browser_pool: BrowserPool | None = None,
+    validators: Dict[str, Any] | None = None,
+) -> Dict[str, Any] | None:
+    """
+    Variante asíncrona de `fetch_source_data` sobre el pool de `AsyncHttpClient`.
+
+    Mantiene los mismos reintentos, backoff y fallbacks Playwright; estos
+    últimos se ejecutan en un hilo para no bloquear el event loop.
+    """
+    if not endpoints:
+        raise ValueError("No hay endpoints configurados para la fuente.")
+    params = build_request_params(source)
+    request_headers = conditional_headers(headers, validators)
+    source_id = _source_id(source)
+    last_error: Exception | None = None
+    playwright_kwargs = {
+        "params": params,
+        "timeout": timeout,
+        "headers": headers,
+        "user_agent": playwright_user_agent,
+        "locale": playwright_locale,
+        "timezone_id": playwright_timezone,
+        "viewport": playwright_viewport,
+        "stealth": playwright_stealth,
+        "pool": browser_pool,
+    }
+
+    for endpoint in endpoints:
+        for attempt in range(1, retries + 1):
+            try:
+                response = await client.get(endpoint, params=params, headers=request_headers, timeout=timeout)
+                if validators is not None and response.status_code == 304:
+                    logger.info("fetch_not_modified source_id=%s endpoint=%s reason=304", source_id, endpoint)
+                    return None
+                if not response.ok:
+                    raise requests.HTTPError(f"HTTP {response.status_code}")
+                content_hash = None
+                if validators is not None:
+                    content_hash = hashlib.sha256(response.content).hexdigest()
+                    if content_hash == validators.get("content_hash"):
+                        logger.info(
+                            "fetch_not_modified source_id=%s endpoint=%s reason=content_hash",
+                            source_id,
+                            endpoint,
+                        )
+                        return None
+                try:
+                    payload = response.json()
+                except ValueError as exc:
+                    if use_playwright and _looks_like_html_or_captcha(response.text):
+                        logger.info(
+                            "fetch_fallback_playwright_html source_id=%s endpoint=%s status_code=%s",
+                            source_id,
+                            endpoint,
+                            response.status_code,
+                        )
+                        try:
+                            payload = await asyncio.to_thread(
+                                fetch_payload_with_playwright, base_url=endpoint, **playwright_kwargs
+                            )
+                            logger.info("fetch_fallback_success source_id=%s endpoint=%s", source_id, endpoint)
+                            return payload
+                        except Exception as fallback_exc:  # noqa: BLE001
+                            last_error = fallback_exc
+                            logger.error(
+                                "fetch_fallback_failed source_id=%s endpoint=%s error=%s",
+                                source_id,
+                                endpoint,
+                                fallback_exc,
+                            )
+                            break
+                    raise ValueError("Respuesta no es JSON válido.") from exc
+
+                if not isinstance(payload, dict):
+                    raise ValueError("Respuesta JSON no es un objeto.")
+                if validators is not None:
+                    record_validators(validators, response.headers, content_hash)
+
+                logger.info(
+                    "fetch_success source_id=%s endpoint=%s status_code=%s attempt=%s backend=async",
+                    source_id,
+                    endpoint,
+                    response.status_code,
+                    attempt,
+                )
+                return payload
+            except Exception as exc:  # noqa: BLE001 - queremos loggear y reintentar
+                last_error = exc
+                logger.warning(
+                    "fetch_retry source_id=%s endpoint=%s attempt=%s error=%s",
+                    source_id,
+                    endpoint,
+                    attempt,
+                    exc,
+                )
+                if attempt < retries:
+                    await asyncio.sleep(backoff_seconds(attempt, backoff_base, backoff_max))
+
+        logger.warning(
+            "endpoint_failed source_id=%s endpoint=%s error=%s",
+            source_id,
+            endpoint,
+            last_error or "Unknown error",
+        )
+
+    if use_playwright:
+        if not base_url:
+            logger.error("fetch_fallback_missing_base_url source_id=%s", source_id)
+        else:
+            logger.info("fetch_fallback_playwright source_id=%s", source_id)
+            try:
+                payload = await asyncio.to_thread(
+                    fetch_payload_with_playwright, base_url=base_url, **playwright_kwargs
+                )
+                logger.info("fetch_fallback_success source_id=%s", source_id)
+                return payload
+            except Exception as exc:  # noqa: BLE001
+                last_error = exc
+                logger.error("fetch_fallback_failed source_id=%s error=%s", source_id, exc)
+
+    logger.error(
+        "fetch_failed source_id=%s endpoint=%s error=%s retries=%s",
+        source_id,
+        endpoints[-1],
+        last_error or "Unknown error",
+        retries,
+    )
+    raise last_error or RuntimeError("Fallo desconocido al descargar datos.")
+
+
 def build_snapshot(payload: Dict[str, Any], source: Dict[str, Any]) -> Dict[str, Any]:
     timestamp = datetime.now(timezone.utc).isoformat()
     return {
@@ -320,14 +723,14 @@ def persist_snapshot(
     json_path = data_dir / f"snapshot_{department_code}_{timestamp}.json"
     hash_path = hash_dir / f"snapshot_{department_code}_{timestamp}.sha256"
 
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(snapshot, f, indent=2, ensure_ascii=False)
+    codec.write_path(json_path, snapshot, indent=2)
 
     previous_hash = get_previous_hash(department_code)
     hash_value = compute_hash(canonical_json, previous_hash)
 
     with open(hash_path, "w", encoding="utf-8") as f:
         f.write(hash_value)
+    update_chain_head(department_code, hash_value, snapshot["metadata"]["timestamp_utc"], hash_path)
 
     logger.info(
         "snapshot_saved source_id=%s json_path=%s hash_path=%s previous_hash=%s hash=%s",
@@ -342,53 +745,361 @@ def persist_snapshot(
 
 def persist_normalized(snapshot: Dict[str, Any], source_id: str, timestamp: str) -> None:
     normalized_path = normalized_dir / f"snapshot_{source_id}_{timestamp}.json"
-    with open(normalized_path, "w", encoding="utf-8") as handle:
-        json.dump(snapshot, handle, indent=2, ensure_ascii=False)
+    codec.write_path(normalized_path, snapshot, indent=2)
 
 
-def main() -> None:
-    config = load_config()
-    failures = []
-    session = requests.Session()
+def _source_id(source: Dict[str, Any]) -> str:
+    return source.get("source_id") or source.get("department_code") or source.get("name")
 
-    for source in config["sources"]:
-        try:
-            department_name = source.get("name") or "Desconocido"
-            department_code = source.get("department_code") or source.get("source_id") or "NA"
-            source_id = source.get("source_id") or department_code or department_name
-            payload = fetch_source_data(
-                session=session,
-                endpoints=source["endpoints"],
-                source=source,
-                base_url=config.get("base_url"),
-                timeout=config["timeout"],
-                headers=config["headers"],
-                retries=config["retries"],
-                backoff_base=config["backoff_base"],
-                backoff_max=config["backoff_max"],
-                use_playwright=config["use_playwright"],
-                playwright_stealth=config["playwright_stealth"],
-                playwright_user_agent=config["playwright_user_agent"],
-                playwright_locale=config["playwright_locale"],
-                playwright_timezone=config["playwright_timezone"],
-                playwright_viewport=config["playwright_viewport"],
+
+def _source_validators(
+    validators: Dict[str, Dict[str, Any]] | None,
+    source: Dict[str, Any],
+) -> Dict[str, Any] | None:
+    if validators is None:
+        return None
+    return validators.setdefault(_source_id(source), {})
+
+
+def _browser_pool_for(config: Dict[str, Any]) -> BrowserPool | None:
+    if not config["use_playwright"]:
+        return None
+    return get_browser_pool(
+        size=config["playwright_pool_size"],
+        max_pages_per_context=config["playwright_max_pages_per_context"],
+    )
+
+
+def fetch_round(
+    config: Dict[str, Any],
+    sources: list[Dict[str, Any]],
+    validators: Dict[str, Dict[str, Any]] | None = None,
+) -> tuple[Dict[str, Dict[str, Any] | None], list[tuple[str, str]]]:
+    """
+    Descarga todas las fuentes de una ronda en paralelo.
+
+    Respeta `max_concurrency`, el límite por host y el plazo total de la ronda.
+    Devuelve los payloads por source_id (en el orden de `sources`) y los fallos;
+    con `validators`, las fuentes sin cambios quedan con payload `None`.
+
+    Cada solicitud lleva como timeout lo que resta del plazo, así los hilos
+    terminan poco después de vencerlo (concurrent.futures los espera al salir
+    del intérprete). Límite: el timeout de requests es por operación de socket
+    (conexión y cada lectura), no total; un servidor que envía bytes muy
+    despacio puede alargar una solicitud más allá del plazo.
+    """
+    deadline = config.get("round_deadline")
+    started = time.monotonic()
+    round_ends = started + deadline if deadline is not None else None
+    host_limiter = HostLimiter(config["max_requests_per_host"])
+    browser_pool = _browser_pool_for(config)
+    local = threading.local()
+
+    def _fetch(source: Dict[str, Any]) -> Dict[str, Any] | None:
+        session = getattr(local, "session", None)
+        if session is None:
+            session = requests.Session()
+            local.session = session
+        return fetch_source_data(
+            session=session,
+            endpoints=source["endpoints"],
+            source=source,
+            base_url=config.get("base_url"),
+            timeout=config["timeout"],
+            headers=config["headers"],
+            retries=config["retries"],
+            backoff_base=config["backoff_base"],
+            backoff_max=config["backoff_max"],
+            use_playwright=config["use_playwright"],
+            playwright_stealth=config["playwright_stealth"],
+            playwright_user_agent=config["playwright_user_agent"],
+            playwright_locale=config["playwright_locale"],
+            playwright_timezone=config["playwright_timezone"],
+            playwright_viewport=config["playwright_viewport"],
+            host_limiter=host_limiter,
+            browser_pool=browser_pool,
+            validators=_source_validators(validators, source),
+            deadline=round_ends,
+        )
+
+    payloads: Dict[str, Dict[str, Any] | None] = {}
+    failures: list[tuple[str, str]] = []
+    timed_out = False
+
+    executor = ThreadPoolExecutor(
+        max_workers=min(config["max_concurrency"], max(1, len(sources))),
+        thread_name_prefix="fetch",
+    )
+    try:
+        pending = {executor.submit(_fetch, source): source for source in sources}
+        while pending:
+            remaining = None
+            if deadline is not None:
+                remaining = deadline - (time.monotonic() - started)
+                if remaining <= 0:
+                    timed_out = True
+                    break
+            done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            if not done:
+                timed_out = True
+                break
+            for future in done:
+                source = pending.pop(future)
+                try:
+                    payloads[_source_id(source)] = future.result()
+                except Exception as exc:  # noqa: BLE001
+                    failures.append((_source_id(source), str(exc)))
+        for future, source in pending.items():
+            future.cancel()
+            failures.append((_source_id(source), f"Plazo de ronda excedido ({deadline}s)"))
+            logger.error(
+                "fetch_deadline_exceeded source_id=%s deadline_seconds=%s",
+                _source_id(source),
+                deadline,
             )
-            snapshot = build_snapshot(payload, source)
-            timestamp_utc = snapshot["metadata"]["timestamp_utc"]
-            canonical_snapshot = normalize_snapshot(
-                payload,
-                department_name=department_name,
-                timestamp_utc=timestamp_utc,
-                scope=source.get("scope", "DEPARTMENT"),
-                department_code=department_code if source.get("department_code") else None,
-                candidate_count=config["candidate_count"],
-                field_map=config["field_map"],
+    finally:
+        # Con plazo vencido no esperamos a los hilos en curso: su timeout ya está
+        # acotado al plazo, así que terminan por su cuenta y sus resultados se descartan.
+        executor.shutdown(wait=not timed_out, cancel_futures=True)
+
+    logger.info(
+        "fetch_round_completed sources=%s ok=%s failed=%s elapsed_seconds=%.2f max_concurrency=%s",
+        len(sources),
+        len(payloads),
+        len(failures),
+        time.monotonic() - started,
+        config["max_concurrency"],
+    )
+    ordered = {
+        _source_id(source): payloads[_source_id(source)]
+        for source in sources
+        if _source_id(source) in payloads
+    }
+    return ordered, failures
+
+
+async def fetch_round_async(
+    config: Dict[str, Any],
+    sources: list[Dict[str, Any]],
+    validators: Dict[str, Dict[str, Any]] | None = None,
+) -> tuple[Dict[str, Dict[str, Any] | None], list[tuple[str, str]]]:
+    """
+    Equivalente de `fetch_round` para `http_backend: async`.
+
+    Todas las fuentes comparten un único `AsyncHttpClient`, de modo que las
+    solicitudes al mismo host reutilizan conexiones keep-alive y sesiones TLS.
+    """
+    started = time.monotonic()
+    semaphore = asyncio.Semaphore(config["max_concurrency"])
+    browser_pool = _browser_pool_for(config)
+    payloads: Dict[str, Dict[str, Any] | None] = {}
+    failures: list[tuple[str, str]] = []
+
+    async with AsyncHttpClient(
+        max_connections=config["max_concurrency"],
+        max_per_host=config["max_requests_per_host"],
+        keepalive_timeout=config["http_keepalive_seconds"],
+    ) as client:
+
+        async def _fetch(source: Dict[str, Any]) -> Dict[str, Any] | None:
+            async with semaphore:
+                return await fetch_source_data_async(
+                    client=client,
+                    endpoints=source["endpoints"],
+                    source=source,
+                    base_url=config.get("base_url"),
+                    timeout=config["timeout"],
+                    headers=config["headers"],
+                    retries=config["retries"],
+                    backoff_base=config["backoff_base"],
+                    backoff_max=config["backoff_max"],
+                    use_playwright=config["use_playwright"],
+                    playwright_stealth=config["playwright_stealth"],
+                    playwright_user_agent=config["playwright_user_agent"],
+                    playwright_locale=config["playwright_locale"],
+                    playwright_timezone=config["playwright_timezone"],
+                    playwright_viewport=config["playwright_viewport"],
+                    browser_pool=browser_pool,
+                    validators=_source_validators(validators, source),
+                )
+
+        tasks = {asyncio.create_task(_fetch(source)): source for source in sources}
+        done, pending = await asyncio.wait(tasks, timeout=config.get("round_deadline"))
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    for task, source in tasks.items():
+        source_id = _source_id(source)
+        if task in pending:
+            failures.append((source_id, f"Plazo de ronda excedido ({config.get('round_deadline')}s)"))
+            logger.error(
+                "fetch_deadline_exceeded source_id=%s deadline_seconds=%s",
+                source_id,
+                config.get("round_deadline"),
             )
-            canonical_json = snapshot_to_canonical_json(canonical_snapshot)
-            timestamp = snapshot["metadata"]["timestamp_utc"].replace(":", "-")
-            persist_snapshot(snapshot, canonical_json, department_code, timestamp, source_id)
+        elif task.exception() is not None:
+            failures.append((source_id, str(task.exception())))
+        else:
+            payloads[source_id] = task.result()
+
+    logger.info(
+        "fetch_round_completed sources=%s ok=%s failed=%s elapsed_seconds=%.2f max_concurrency=%s backend=async",
+        len(sources),
+        len(payloads),
+        len(failures),
+        time.monotonic() - started,
+        config["max_concurrency"],
+    )
+    return payloads, failures
+
+
+def _department_code(source: Dict[str, Any]) -> str:
+    """Clave de la cadena (y de chain_heads.json) de una fuente."""
+    return source.get("department_code") or source.get("source_id") or "NA"
+
+
+def process_source(config: Dict[str, Any], source: Dict[str, Any], payload: Dict[str, Any]) -> Dict[str, Any]:
+    department_name = source.get("name") or "Desconocido"
+    department_code = _department_code(source)
+    source_id = source.get("source_id") or department_code or department_name
+    snapshot = build_snapshot(payload, source)
+    timestamp_utc = snapshot["metadata"]["timestamp_utc"]
+    canonical_snapshot = normalize_snapshot(
+        payload,
+        department_name=department_name,
+        timestamp_utc=timestamp_utc,
+        scope=source.get("scope", "DEPARTMENT"),
+        department_code=department_code if source.get("department_code") else None,
+        candidate_count=config["candidate_count"],
+        field_map=config["field_plan"],
+    )
+    canonical_json = snapshot_to_canonical_json(canonical_snapshot)
+    timestamp = snapshot["metadata"]["timestamp_utc"].replace(":", "-")
+    hash_value = persist_snapshot(snapshot, canonical_json, department_code, timestamp, source_id)
+    return {
+        "source_id": source_id,
+        "json_path": data_dir / f"snapshot_{department_code}_{timestamp}.json",
+        "snapshot": snapshot,
+        "canonical_snapshot": canonical_snapshot,
+        "hash": hash_value,
+    }
+
+
+def append_columnar(config: Dict[str, Any], written: list[Dict[str, Any]]) -> None:
+    """
+    Agrega los snapshots de la ronda al almacén columnar (una reescritura por partición).
+
+    El layout JSON sigue siendo la fuente de verdad: un fallo aquí solo se registra.
+    """
+    store_path = config.get("columnar_store_path")
+    if not store_path or not written:
+        return
+    try:
+        store = ColumnarSnapshotStore(store_path)
+        count = store.append_many(
+            (item["canonical_snapshot"], item["source_id"], item["hash"]) for item in written
+        )
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("columnar_append_failed path=%s error=%s", store_path, exc)
+        return
+    logger.info("columnar_append_ok path=%s snapshots=%s", store_path, count)
+
+
+def merkle_ledger() -> MerkleLedger:
+    return MerkleLedger(hash_dir / MERKLE_DIR)
+
+
+def round_leaves(sources: list[Dict[str, Any]], written: list[Dict[str, Any]]) -> list[tuple[str, str]]:
+    """
+    Hojas (source_id, hash) de la ronda para todas las fuentes configuradas.
+
+    Las fuentes sin snapshot nuevo (304, mismo contenido, sondeo adaptativo que no
+    les tocaba o fallo) aportan su cabeza actual de chain_heads.json; las que aún
+    no tienen ningún snapshot quedan fuera.
+    """
+    leaves = {item["source_id"]: item["hash"] for item in written}
+    heads = None
+    for source in sources:
+        source_id = _source_id(source)
+        if source_id in leaves:
+            continue
+        if heads is None:
+            heads = load_chain_heads() or rebuild_chain_heads()
+        head = heads.get(_department_code(source))
+        if head:
+            leaves[source_id] = head["hash"]
+    return sorted(leaves.items())
+
+
+def record_merkle_round(
+    sources: list[Dict[str, Any]],
+    written: list[Dict[str, Any]],
+    timestamp_utc: str,
+) -> Dict[str, Any] | None:
+    """
+    Registra la raíz Merkle de la ronda (una hoja por fuente configurada) y actualiza la raíz del día.
+
+    Solo se registra si la ronda escribió algún snapshot. Igual que el almacén
+    columnar, un fallo aquí no invalida los snapshots ya escritos.
+    """
+    if not written:
+        return None
+    try:
+        record = merkle_ledger().record_round(round_leaves(sources, written), timestamp_utc)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("merkle_round_failed error=%s", exc)
+        return None
+    logger.info(
+        "merkle_round_recorded round_id=%s root=%s leaves=%s",
+        record["round_id"],
+        record["root"],
+        len(record["leaves"]),
+    )
+    return record
+
+
+def run_round(source_ids: list[str] | None = None) -> tuple[list[Dict[str, Any]], list[tuple[str, str]]]:
+    """
+    Ejecuta una ronda completa: descarga, normaliza, encadena y persiste.
+
+    Devuelve los snapshots escritos (con su ruta y hash) y los fallos por fuente.
+    """
+    config = load_config()
+    round_started = datetime.now(timezone.utc).isoformat()
+    sources = configured_sources = config["sources"]
+    if source_ids:
+        selected = set(source_ids)
+        sources = [source for source in sources if _source_id(source) in selected]
+    stored_validators = load_validators(config["validators_path"]) if config["conditional_requests"] else None
+    validators = copy.deepcopy(stored_validators) if stored_validators is not None else None
+    # Los setdefault se hacen aquí: los hilos de la ronda no deben mutar el dict compartido.
+    if validators is not None:
+        for source in sources:
+            validators.setdefault(_source_id(source), {})
+
+    if config["http_backend"] == "async":
+        payloads, failures = asyncio.run(fetch_round_async(config, sources, validators))
+    else:
+        payloads, failures = fetch_round(config, sources, validators)
+
+    written: list[Dict[str, Any]] = []
+    for source in sources:
+        source_id = _source_id(source)
+        if source_id not in payloads:
+            if validators is not None:
+                validators[source_id] = copy.deepcopy(stored_validators.get(source_id, {}))
+            continue
+        payload = payloads[source_id]
+        if payload is None:
+            logger.info("snapshot_skipped_not_modified source_id=%s", source_id)
+            continue
+        try:
+            written.append(process_source(config, source, payload))
         except Exception as exc:  # noqa: BLE001
-            source_id = source.get("source_id") or source.get("department_code") or source.get("name")
+            if validators is not None:
+                validators[source_id] = copy.deepcopy(stored_validators.get(source_id, {}))
             failures.append((source_id, str(exc)))
             logger.error(
                 "snapshot_failed source_id=%s error=%s",
@@ -396,6 +1107,36 @@ def main() -> None:
                 exc,
             )
 
+    append_columnar(config, written)
+    record_merkle_round(configured_sources, written, round_started)
+    if validators is not None:
+        save_validators(config["validators_path"], validators)
+    return written, failures
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Descarga y hash de snapshots por fuente.")
+    parser.add_argument(
+        "--sources",
+        help="Lista de source_id separados por coma; por defecto descarga todas las fuentes.",
+    )
+    parser.add_argument(
+        "--rebuild-chain-heads",
+        action="store_true",
+        help="Reconstruye hashes/chain_heads.json desde los archivos .sha256 y termina.",
+    )
+    args = parser.parse_args(argv)
+
+    if args.rebuild_chain_heads:
+        heads = rebuild_chain_heads()
+        print(json.dumps(heads, indent=2, sort_keys=True))
+        return
+
+    source_ids = None
+    if args.sources:
+        source_ids = [item.strip() for item in args.sources.split(",") if item.strip()]
+    _, failures = run_round(source_ids)
+
     if failures:
         failure_summary = ", ".join(f"{dept}:{err}" for dept, err in failures)
         raise SystemExit(f"Fallos al descargar snapshots: {failure_summary}")
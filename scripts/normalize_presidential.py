@@ -5,7 +5,6 @@ from datetime import datetime
 
 INPUT_DIR = Path("data")
 OUTPUT_DIR = Path("normalized")
-OUTPUT_DIR.mkdir(exist_ok=True)
 
 def to_int(x):
     return int(re.sub(r"[^\d]", "", x))
@@ -13,10 +12,8 @@ def to_int(x):
 def to_float(x):
     return float(x.replace(",", "."))
 
-for file in sorted(INPUT_DIR.glob("*.json")):
-    raw = json.loads(file.read_text(encoding="utf-8"))
-
-    timestamp = file.stem.split(" ", 1)[-1]
+def normalize_payload(raw, stem):
+    timestamp = stem.split(" ", 1)[-1]
     timestamp = timestamp.replace("_", ":").replace(" ", "T") + "Z"
 
     normalized = {
@@ -45,6 +42,31 @@ for file in sorted(INPUT_DIR.glob("*.json")):
         "nulos": to_int(est["distribucion_votos"]["nulos"]),
         "blancos": to_int(est["distribucion_votos"]["blancos"]),
     }
+    return normalized
+
+def normalize_directory(input_dir=INPUT_DIR, output_dir=OUTPUT_DIR, preloaded=None):
+    """
+    Normaliza todos los snapshots de input_dir y devuelve [(ruta_salida, normalizado)].
+
+    preloaded permite pasar payloads ya parseados ({ruta: raw}) para no releerlos.
+    """
+    output_dir.mkdir(exist_ok=True)
+    preloaded = preloaded or {}
+    results = []
+    for file in sorted(input_dir.glob("*.json")):
+        raw = preloaded.get(file)
+        if raw is None:
+            raw = json.loads(file.read_text(encoding="utf-8"))
+
+        normalized = normalize_payload(raw, file.stem)
+
+        out = output_dir / f"{file.stem}.normalized.json"
+        text = json.dumps(normalized, indent=2)
+        # No reescribir salidas idénticas: el mtime estable permite auditorías incrementales.
+        if not out.exists() or out.read_text(encoding="utf-8") != text:
+            out.write_text(text, encoding="utf-8")
+        results.append((out, normalized))
+    return results
 
-    out = OUTPUT_DIR / f"{file.stem}.normalized.json"
-    out.write_text(json.dumps(normalized, indent=2), encoding="utf-8")
+if __name__ == "__main__":
+    normalize_directory()
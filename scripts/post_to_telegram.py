@@ -2,10 +2,12 @@ import datetime
 import logging
 import os
 import sys
+from pathlib import Path
 
 import requests
 from dotenv import load_dotenv
 
+from sentinel.core.merkle import MerkleLedger
 from sentinel.utils.logging_config import setup_logging
 
 load_dotenv()
@@ -13,6 +15,7 @@ load_dotenv()
 TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
 DEFAULT_TEMPLATE = os.getenv("TELEGRAM_TEMPLATE", "neutral").strip().lower()
+MERKLE_DIR = Path(os.getenv("MERKLE_DIR", "hashes/merkle"))
 
 setup_logging()
 logger = logging.getLogger(__name__)
@@ -33,7 +36,18 @@ def get_stored_hash(hash_path):
         return f"HASH_READ_ERROR: {str(e)}"
 
 
-def format_as_neutral(raw_data, stored_hash=None):
+def get_latest_merkle_root(merkle_dir=MERKLE_DIR):
+    """
+    Última raíz Merkle de ronda (cubre todas las fuentes de esa ronda), o None.
+    """
+    try:
+        return MerkleLedger(merkle_dir).latest()
+    except Exception as e:
+        logger.error("merkle_root_read_failed path=%s error=%s", merkle_dir, e)
+        return None
+
+
+def format_as_neutral(raw_data, stored_hash=None, merkle_root=None):
     """
     Formatea el reporte con estilo técnico neutro.
     """
@@ -51,6 +65,11 @@ def format_as_neutral(raw_data, stored_hash=None):
             f"<code>Verification hash (SHA-256):</code>\n"
             f"<code>{stored_hash}</code>"
         )
+    if merkle_root:
+        hash_section += (
+            f"\n<code>Round Merkle root ({merkle_root['sources']} sources, {merkle_root['round_id']}):</code>\n"
+            f"<code>{merkle_root['root']}</code>"
+        )
 
     footer = (
         "\n--------------------------------------------------\n"
@@ -64,7 +83,7 @@ def resolve_template(template_name):
     return format_as_neutral
 
 
-def send_message(text, stored_hash=None, template_name=None):
+def send_message(text, stored_hash=None, template_name=None, merkle_root=None):
     if not TOKEN or not CHAT_ID:
         logger.error("telegram_credentials_missing")
         sys.exit(1)
@@ -74,7 +93,7 @@ def send_message(text, stored_hash=None, template_name=None):
     formatter = resolve_template(template_name or DEFAULT_TEMPLATE)
     payload = {
         "chat_id": CHAT_ID,
-        "text": formatter(text, stored_hash),
+        "text": formatter(text, stored_hash, merkle_root),
         "parse_mode": "HTML",
         "disable_web_page_preview": True
     }
@@ -99,7 +118,7 @@ if __name__ == "__main__":
         hash_file_path = sys.argv[2]
         file_hash = get_stored_hash(hash_file_path)
         template = sys.argv[3] if len(sys.argv) > 3 else None
-        send_message(msg, file_hash, template_name=template)
+        send_message(msg, file_hash, template_name=template, merkle_root=get_latest_merkle_root())
     elif len(sys.argv) == 2:
         send_message(sys.argv[1])
     else:
@@ -23,9 +23,11 @@ def get_stored_hash(hash_path):
         return f"HASH_READ_ERROR: {str(e)}"
 
 
-def format_as_neutral(raw_data, stored_hash=None):
+def format_as_neutral(raw_data, stored_hash=None, merkle_root=None):
     timestamp = datetime.datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
     hash_line = f"\nVerification hash (SHA-256): {stored_hash}" if stored_hash else ""
+    if merkle_root:
+        hash_line += f"\nRound Merkle root ({merkle_root['sources']} sources): {merkle_root['root']}"
     return (
         "Proyecto C.E.N.T.I.N.E.L. | TECHNICAL NOTICE\n"
         f"Timestamp (UTC): {timestamp}\n"
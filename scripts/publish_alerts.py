@@ -94,6 +94,7 @@ def publish(summary: str, hash_path: str, channels: List[str]) -> None:
     message = build_message(summary)
     message_hash = hash_message(message)
     file_hash = post_to_telegram.get_stored_hash(hash_path) if hash_path else None
+    merkle_root = post_to_telegram.get_latest_merkle_root()
 
     for channel in channels:
         entry = {
@@ -101,6 +102,8 @@ def publish(summary: str, hash_path: str, channels: List[str]) -> None:
             "channel": channel,
             "message_hash": message_hash,
             "verification_hash": file_hash,
+            "merkle_round_id": merkle_root["round_id"] if merkle_root else None,
+            "merkle_root": merkle_root["root"] if merkle_root else None,
             "template": "neutral",
             "anomaly_threshold": MIN_ANOMALIES,
             "negative_delta_threshold": MIN_NEGATIVE_DELTA,
@@ -108,9 +111,14 @@ def publish(summary: str, hash_path: str, channels: List[str]) -> None:
         }
         try:
             if channel == "telegram":
-                post_to_telegram.send_message(message, stored_hash=file_hash, template_name="neutral")
+                post_to_telegram.send_message(
+                    message,
+                    stored_hash=file_hash,
+                    template_name="neutral",
+                    merkle_root=merkle_root,
+                )
             elif channel == "x":
-                formatted = post_to_x.format_as_neutral(message, file_hash)
+                formatted = post_to_x.format_as_neutral(message, file_hash, merkle_root)
                 post_to_x.send_message(post_to_x.truncate_for_x(formatted))
             else:
                 print(f"[!] UNKNOWN_CHANNEL: {channel}")
@@ -4,11 +4,15 @@ import json
 import os
 import subprocess
 import sys
+import time
+from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+import yaml
 from apscheduler.schedulers.blocking import BlockingScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -18,6 +22,7 @@ HASH_DIR = Path("hashes")
 ANALYSIS_DIR = Path("analysis")
 REPORTS_DIR = Path("reports")
 STATE_PATH = DATA_DIR / "pipeline_state.json"
+CONFIG_PATH = Path(__file__).resolve().parents[1] / "config.yaml"
 
 DATA_DIR.mkdir(exist_ok=True)
 HASH_DIR.mkdir(exist_ok=True)
@@ -39,6 +44,78 @@ def save_state(state):
     STATE_PATH.write_text(json.dumps(state, indent=2), encoding="utf-8")
 
 
+def load_polling_config(config_path=CONFIG_PATH):
+    config = {}
+    if config_path.exists():
+        config = yaml.safe_load(config_path.read_text(encoding="utf-8")) or {}
+
+    polling = config.get("polling") or {}
+    floor = float(polling.get("floor_seconds", 120))
+    ceiling = max(floor, float(polling.get("ceiling_seconds", 3600)))
+    defaults = {
+        "floor_seconds": floor,
+        "ceiling_seconds": ceiling,
+        "backoff_factor": max(1.0, float(polling.get("backoff_factor", 2))),
+    }
+    overrides = polling.get("per_source") or {}
+
+    cadences = {}
+    for source in config.get("sources") or []:
+        source_id = source.get("source_id") or source.get("department_code") or source.get("name")
+        cadence = {**defaults, **(overrides.get(source_id) or {})}
+        cadence["ceiling_seconds"] = max(cadence["floor_seconds"], cadence["ceiling_seconds"])
+        # Mismo prefijo que usa download_and_hash.persist_snapshot en data/.
+        cadence["file_key"] = source.get("department_code") or source.get("source_id") or "NA"
+        cadences[source_id] = cadence
+
+    return {
+        "mode": str(polling.get("mode", "cron")).lower(),
+        "tick_seconds": float(polling.get("tick_seconds", min(30.0, floor))),
+        "defaults": defaults,
+        "sources": cadences,
+    }
+
+
+def next_interval(current, changed, cadence):
+    """
+    Intervalo siguiente de una fuente: vuelve al piso si hubo cambios y
+    retrocede exponencialmente hasta el techo mientras siga estática.
+    """
+    if changed or current is None:
+        return cadence["floor_seconds"]
+    return min(current * cadence["backoff_factor"], cadence["ceiling_seconds"])
+
+
+def due_sources(state, polling, now):
+    schedule = state.get("sources", {})
+    due = []
+    for source_id in polling["sources"]:
+        next_run = schedule.get(source_id, {}).get("next_run_at")
+        if not next_run or datetime.fromisoformat(next_run) <= now:
+            due.append(source_id)
+    return due
+
+
+def latest_source_snapshot(file_key):
+    # Los nombres llevan timestamp ISO, así que el orden lexicográfico es cronológico.
+    files = sorted(DATA_DIR.glob(f"snapshot_{file_key}_*.json"))
+    return files[-1] if files else None
+
+
+def update_source_cadence(state, source_id, content_hash, cadence, now):
+    entry = state.setdefault("sources", {}).setdefault(source_id, {})
+    changed = content_hash is not None and entry.get("last_content_hash") != content_hash
+    interval = next_interval(entry.get("interval_seconds"), changed, cadence)
+    if content_hash is not None:
+        entry["last_content_hash"] = content_hash
+    entry["interval_seconds"] = interval
+    entry["last_checked_at"] = now.isoformat()
+    if changed:
+        entry["last_changed_at"] = now.isoformat()
+    entry["next_run_at"] = (now + timedelta(seconds=interval)).isoformat()
+    return changed
+
+
 def run_command(command, description):
     print(f"[+] {description}: {' '.join(command)}")
     subprocess.run(command, check=True)
@@ -49,14 +126,25 @@ def latest_file(directory, pattern):
     return files[0] if files else None
 
 
-def compute_content_hash(snapshot_path):
-    payload = json.loads(snapshot_path.read_text(encoding="utf-8"))
-    normalized = json.dumps(payload, sort_keys=True).encode("utf-8")
+def compute_content_hash(snapshot_path, payload=None):
+    """
+    Hash del contenido publicado por la fuente, sin metadatos de descarga.
+
+    download_and_hash guarda {"metadata": ..., "data": <respuesta>} y
+    metadata.timestamp_utc cambia en cada descarga; solo se hashean los bytes
+    canónicos de `data` (o del archivo entero si no tiene ese envoltorio).
+    """
+    if payload is None:
+        payload = json.loads(snapshot_path.read_text(encoding="utf-8"))
+    if isinstance(payload, dict) and "data" in payload and "metadata" in payload:
+        payload = payload["data"]
+    normalized = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
     return hashlib.sha256(normalized).hexdigest()
 
 
-def should_normalize(snapshot_path):
-    payload = json.loads(snapshot_path.read_text(encoding="utf-8"))
+def should_normalize(snapshot_path, payload=None):
+    if payload is None:
+        payload = json.loads(snapshot_path.read_text(encoding="utf-8"))
     return "resultados" in payload and "estadisticas" in payload
 
 
@@ -122,7 +210,177 @@ def update_daily_summary(state, now, anomalies_count):
     state["daily_summary"] = daily
 
 
-def send_alert_if_configured(state, summary_path, critical_count):
+class StageError(RuntimeError):
+    """Fallo de una etapa ejecutada en proceso (equivalente a CalledProcessError)."""
+
+
+class StageTimer:
+    def __init__(self, mode):
+        self.mode = mode
+        self.timings = {}
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.timings[name] = round(elapsed, 4)
+            print(f"[t] etapa={name} modo={self.mode} segundos={elapsed:.3f}")
+
+    def summary(self):
+        return {
+            "mode": self.mode,
+            "stages": dict(self.timings),
+            "total_seconds": round(time.perf_counter() - self._started, 4),
+        }
+
+
+class SubprocessStages:
+    """Cada etapa corre como script aparte: máximo aislamiento entre etapas."""
+
+    mode = "subprocess"
+
+    def download(self, source_ids=None):
+        command = [sys.executable, "scripts/download_and_hash.py"]
+        if source_ids:
+            command += ["--sources", ",".join(source_ids)]
+        run_command(command, "descarga + hash")
+        # Solo snapshots: con solicitudes condicionales puede no haber archivo nuevo
+        # y pipeline_state.json quedaría como el JSON más reciente de data/.
+        return latest_file(DATA_DIR, "snapshot_*.json"), None
+
+    def normalize(self):
+        run_command([sys.executable, "scripts/normalize_presidential.py"], "normalización")
+
+    def analyze(self):
+        run_command([sys.executable, "scripts/analyze_rules.py"], "análisis")
+        anomalies_path = Path("anomalies_report.json")
+        if anomalies_path.exists():
+            return json.loads(anomalies_path.read_text(encoding="utf-8"))
+        return []
+
+    def summarize(self, alerts):
+        run_command([sys.executable, "scripts/summarize_findings.py"], "reportes")
+        return (REPORTS_DIR / "summary.txt").read_text(encoding="utf-8")
+
+    def send_alert(self, summary_text, hash_path):
+        run_command(
+            [sys.executable, "scripts/post_to_telegram.py", summary_text, str(hash_path)],
+            "alertas",
+        )
+
+
+class _JsonCache:
+    """Cache de JSON parseados por ruta, invalidado por mtime."""
+
+    def __init__(self):
+        self._entries = {}
+
+    def get(self, path):
+        path = Path(path)
+        try:
+            mtime = path.stat().st_mtime_ns
+        except OSError:
+            return None
+        cached = self._entries.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        self._entries[path] = (mtime, payload)
+        return payload
+
+    def put(self, path, payload):
+        path = Path(path)
+        self._entries[path] = (path.stat().st_mtime_ns, payload)
+
+
+class InProcessStages:
+    """
+    Llama las funciones de cada etapa en este mismo proceso.
+
+    Evita el arranque del intérprete y la reimportación de pandas/yaml/requests
+    por etapa, y pasa snapshots y anomalías en memoria; los JSON ya leídos se
+    conservan entre ejecuciones del scheduler mientras no cambie su mtime.
+    """
+
+    mode = "in_process"
+
+    def __init__(self):
+        from scripts import analyze_rules, download_and_hash, normalize_presidential, summarize_findings
+
+        self._download_and_hash = download_and_hash
+        self._normalize_presidential = normalize_presidential
+        self._analyze_rules = analyze_rules
+        self._summarize_findings = summarize_findings
+        self._cache = _JsonCache()
+
+    def download(self, source_ids=None):
+        print("[+] descarga + hash (en proceso)")
+        written, failures = self._download_and_hash.run_round(source_ids)
+        for item in written:
+            self._cache.put(item["json_path"], item["snapshot"])
+        if failures:
+            failure_summary = ", ".join(f"{dept}:{err}" for dept, err in failures)
+            raise StageError(f"Fallos al descargar snapshots: {failure_summary}")
+        if written:
+            return written[-1]["json_path"], written[-1]["snapshot"]
+        return latest_file(DATA_DIR, "snapshot_*.json"), None
+
+    def normalize(self):
+        print("[+] normalización (en proceso)")
+        results = self._normalize_presidential.normalize_directory(preloaded=self._cache)
+        for path, normalized in results:
+            self._cache.put(path, normalized)
+
+    def analyze(self):
+        print("[+] análisis (en proceso)")
+        target = Path("data/normalized")
+        documents = [(path.name, self._cache.get(path)) for path in sorted(target.glob("*.json"))]
+        output = self._analyze_rules.run_audit(str(target), documents=documents)
+        if output is not None:
+            return output["anomalies"]
+        anomalies_path = Path("anomalies_report.json")
+        if anomalies_path.exists():
+            return json.loads(anomalies_path.read_text(encoding="utf-8"))
+        return []
+
+    def summarize(self, alerts):
+        print("[+] reportes (en proceso)")
+        return self._summarize_findings.write_summary(alerts, REPORTS_DIR / "summary.txt")
+
+    def send_alert(self, summary_text, hash_path):
+        print("[+] alertas (en proceso)")
+        from scripts import post_to_telegram
+
+        try:
+            post_to_telegram.send_message(
+                summary_text,
+                post_to_telegram.get_stored_hash(hash_path),
+                merkle_root=post_to_telegram.get_latest_merkle_root(HASH_DIR / "merkle"),
+            )
+        except SystemExit as exc:
+            raise StageError("Fallo al enviar alerta a Telegram.") from exc
+
+
+def load_pipeline_mode(config_path=CONFIG_PATH):
+    mode = os.getenv("PIPELINE_MODE")
+    if not mode and config_path.exists():
+        config = yaml.safe_load(config_path.read_text(encoding="utf-8")) or {}
+        mode = (config.get("pipeline") or {}).get("mode")
+    mode = str(mode or "subprocess").strip().lower().replace("-", "_")
+    if mode not in {"subprocess", "in_process"}:
+        raise ValueError(f"pipeline.mode inválido: {mode} (usa 'subprocess' o 'in_process').")
+    return mode
+
+
+def build_stages(mode):
+    return InProcessStages() if mode == "in_process" else SubprocessStages()
+
+
+def send_alert_if_configured(state, summary_text, critical_count, stages):
     if critical_count <= 0:
         print("[i] Alertas omitidas: no hay errores críticos")
         return
@@ -133,7 +391,6 @@ def send_alert_if_configured(state, summary_path, critical_count):
         print("[i] Alertas deshabilitadas: faltan credenciales de Telegram")
         return
 
-    summary_text = summary_path.read_text(encoding="utf-8")
     latest_hash_file = latest_file(HASH_DIR, "*.sha256")
     if not latest_hash_file:
         print("[i] Alertas omitidas: no hay hash disponible")
@@ -144,27 +401,34 @@ def send_alert_if_configured(state, summary_path, critical_count):
         print("[i] Alertas omitidas: resumen ya enviado")
         return
 
-    run_command(
-        [sys.executable, "scripts/post_to_telegram.py", summary_text, str(latest_hash_file)],
-        "alertas",
-    )
+    stages.send_alert(summary_text, latest_hash_file)
     state["last_alert_hash"] = alert_fingerprint
 
 
-def run_pipeline():
+def run_pipeline(source_ids=None, stages=None):
     now = utcnow()
     state = load_state()
+    stages = stages or SubprocessStages()
+    timer = StageTimer(stages.mode)
 
-    run_command([sys.executable, "scripts/download_and_hash.py"], "descarga + hash")
-
-    latest_snapshot = latest_file(DATA_DIR, "*.json")
+    with timer.stage("download"):
+        latest_snapshot, latest_payload = stages.download(source_ids)
     if not latest_snapshot:
         print("[!] No se encontró snapshot para procesar")
         return
 
-    content_hash = compute_content_hash(latest_snapshot)
+    if state.get("last_snapshot") == latest_snapshot.name:
+        # download_and_hash no escribió nada nuevo (304 o cuerpo idéntico).
+        state["last_run_at"] = now.isoformat()
+        state["last_stage_timings"] = timer.summary()
+        save_state(state)
+        print("[i] Sin snapshots nuevos, se omite procesamiento")
+        return
+
+    content_hash = compute_content_hash(latest_snapshot, latest_payload)
     if state.get("last_content_hash") == content_hash:
         state["last_run_at"] = now.isoformat()
+        state["last_stage_timings"] = timer.summary()
         save_state(state)
         print("[i] Snapshot duplicado detectado, se omite procesamiento")
         return
@@ -172,49 +436,106 @@ def run_pipeline():
     state["last_content_hash"] = content_hash
     state["last_snapshot"] = latest_snapshot.name
 
-    if should_normalize(latest_snapshot):
-        run_command([sys.executable, "scripts/normalize_presidential.py"], "normalización")
+    if should_normalize(latest_snapshot, latest_payload):
+        with timer.stage("normalize"):
+            stages.normalize()
     else:
         print("[i] Normalización omitida: estructura no compatible")
 
-    run_command([sys.executable, "scripts/analyze_rules.py"], "análisis")
-
-    anomalies_path = Path("anomalies_report.json")
-    anomalies = []
-    if anomalies_path.exists():
-        anomalies = json.loads(anomalies_path.read_text(encoding="utf-8"))
+    with timer.stage("analyze"):
+        anomalies = stages.analyze()
 
     critical_anomalies = filter_critical_anomalies(anomalies)
     alerts = build_alerts(critical_anomalies)
     (ANALYSIS_DIR / "alerts.json").write_text(json.dumps(alerts, indent=2), encoding="utf-8")
 
     if should_generate_report(state, now):
-        run_command([sys.executable, "scripts/summarize_findings.py"], "reportes")
+        with timer.stage("summarize"):
+            summary_text = stages.summarize(alerts)
         state["last_report_at"] = now.isoformat()
-        send_alert_if_configured(state, REPORTS_DIR / "summary.txt", len(critical_anomalies))
+        with timer.stage("alerts"):
+            send_alert_if_configured(state, summary_text, len(critical_anomalies), stages)
     else:
         print("[i] Reporte omitido por cadencia")
 
     update_daily_summary(state, now, len(anomalies))
     state["last_run_at"] = now.isoformat()
+    state["last_stage_timings"] = timer.summary()
+    print(f"[t] total modo={stages.mode} segundos={state['last_stage_timings']['total_seconds']:.3f}")
     save_state(state)
 
 
+def run_adaptive_tick(polling=None, stages=None):
+    polling = polling or load_polling_config()
+    now = utcnow()
+    due = due_sources(load_state(), polling, now)
+    if not due:
+        return []
+
+    try:
+        run_pipeline(source_ids=due, stages=stages)
+    except (subprocess.CalledProcessError, StageError) as exc:
+        # Las fuentes que sí descargaron igual deben reprogramarse.
+        print(f"[!] Pipeline con fallos: {exc}")
+
+    state = load_state()
+    changed = []
+    for source_id in due:
+        cadence = polling["sources"][source_id]
+        latest = latest_source_snapshot(cadence["file_key"])
+        content_hash = compute_content_hash(latest) if latest else None
+        if update_source_cadence(state, source_id, content_hash, cadence, now):
+            changed.append(source_id)
+    save_state(state)
+    print(f"[i] Sondeo adaptativo: consultadas={len(due)} con_cambios={len(changed)}")
+    return changed
+
+
 def main():
     parser = argparse.ArgumentParser(description="Pipeline Proyecto C.E.N.T.I.N.E.L.: descarga → normaliza → hash → análisis → reportes → alertas")
     parser.add_argument("--once", action="store_true", help="Ejecuta una sola vez y sale")
     parser.add_argument("--run-now", action="store_true", help="Ejecuta inmediatamente antes del scheduler")
+    parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help="Sondeo adaptativo por fuente (también con polling.mode: adaptive en config.yaml)",
+    )
+    parser.add_argument(
+        "--in-process",
+        action="store_true",
+        help="Ejecuta las etapas en este proceso (también con pipeline.mode: in_process o PIPELINE_MODE)",
+    )
     args = parser.parse_args()
+    polling = load_polling_config()
+    stages = build_stages("in_process" if args.in_process else load_pipeline_mode())
 
     if args.once:
-        run_pipeline()
+        run_pipeline(stages=stages)
+        return
+
+    if args.adaptive or polling["mode"] == "adaptive":
+        job_options = {"max_instances": 1, "coalesce": True}
+        if args.run_now:
+            job_options["next_run_time"] = utcnow()
+        scheduler = BlockingScheduler(timezone="UTC")
+        scheduler.add_job(
+            run_adaptive_tick,
+            IntervalTrigger(seconds=polling["tick_seconds"]),
+            kwargs={"polling": polling, "stages": stages},
+            **job_options,
+        )
+        print(
+            "[+] Scheduler adaptativo activo: "
+            f"piso={polling['defaults']['floor_seconds']:.0f}s techo={polling['defaults']['ceiling_seconds']:.0f}s"
+        )
+        scheduler.start()
         return
 
     if args.run_now:
-        run_pipeline()
+        run_pipeline(stages=stages)
 
     scheduler = BlockingScheduler(timezone="UTC")
-    scheduler.add_job(run_pipeline, CronTrigger(minute=0))
+    scheduler.add_job(run_pipeline, CronTrigger(minute=0), kwargs={"stages": stages})
     print("[+] Scheduler activo: ejecución horaria en minuto 00 UTC")
     scheduler.start()
 
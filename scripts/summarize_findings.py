@@ -1,18 +1,28 @@
 import json
 from pathlib import Path
 
-alerts = json.loads(Path("analysis/alerts.json").read_text())
+ALERTS_PATH = Path("analysis/alerts.json")
+SUMMARY_PATH = Path("reports/summary.txt")
 
-lines = []
+def build_summary(alerts):
+    lines = []
 
-if not alerts:
-    lines.append("No se detectaron eventos atípicos en los datos públicos analizados.")
-else:
-    for e in alerts:
-        lines.append(
-            f"Evento atípico detectado entre {e['from']} y {e['to']} UTC."
-        )
-        for a in e["alerts"]:
-            lines.append(f"- Regla activada: {a['rule']}")
+    if not alerts:
+        lines.append("No se detectaron eventos atípicos en los datos públicos analizados.")
+    else:
+        for e in alerts:
+            lines.append(
+                f"Evento atípico detectado entre {e['from']} y {e['to']} UTC."
+            )
+            for a in e["alerts"]:
+                lines.append(f"- Regla activada: {a['rule']}")
 
-Path("reports/summary.txt").write_text("\n".join(lines), encoding="utf-8")
+    return "\n".join(lines)
+
+def write_summary(alerts, summary_path=SUMMARY_PATH):
+    text = build_summary(alerts)
+    summary_path.write_text(text, encoding="utf-8")
+    return text
+
+if __name__ == "__main__":
+    write_summary(json.loads(ALERTS_PATH.read_text()))
@@ -0,0 +1,206 @@
+import os
+import threading
+import uuid
+from dataclasses import asdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from sentinel.core.models import Snapshot
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - dependencia opcional
+    pa = None
+    ds = None
+    pq = None
+
+TABLES = ("totals", "candidates")
+PARTITION_FILE = "part-0.parquet"
+
+
+def _schemas() -> Dict[str, "pa.Schema"]:
+    timestamp = pa.timestamp("us", tz="UTC")
+    return {
+        "totals": pa.schema([
+            ("timestamp_utc", timestamp),
+            ("source_id", pa.string()),
+            ("election", pa.string()),
+            ("year", pa.int32()),
+            ("source", pa.string()),
+            ("scope", pa.string()),
+            ("registered_voters", pa.int64()),
+            ("total_votes", pa.int64()),
+            ("valid_votes", pa.int64()),
+            ("null_votes", pa.int64()),
+            ("blank_votes", pa.int64()),
+            ("hash", pa.string()),
+        ]),
+        "candidates": pa.schema([
+            ("timestamp_utc", timestamp),
+            ("source_id", pa.string()),
+            ("slot", pa.int32()),
+            ("candidate_id", pa.string()),
+            ("name", pa.string()),
+            ("party", pa.string()),
+            ("votes", pa.int64()),
+        ]),
+    }
+
+
+def _partitioning() -> "ds.Partitioning":
+    return ds.partitioning(
+        pa.schema([("department_code", pa.string()), ("day", pa.string())]),
+        flavor="hive",
+    )
+
+
+def _parse_timestamp(value: Any) -> Optional[datetime]:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+class ColumnarSnapshotStore:
+    """
+    Almacén columnar (Parquet) de snapshots normalizados, junto al layout JSON.
+
+    Guarda dos tablas, `totals` (una fila por snapshot) y `candidates` (una fila
+    por candidato), particionadas como `department_code=XX/day=YYYY-MM-DD`. Cada
+    partición es un único archivo que se reescribe de forma atómica al agregar,
+    así un día de una fuente cada 5 minutos queda en un archivo de ~300 filas.
+    """
+
+    def __init__(self, root: str | Path) -> None:
+        if pa is None:
+            raise RuntimeError("El almacén columnar requiere pyarrow (pip install pyarrow).")
+        self.root = Path(root)
+        self._schemas = _schemas()
+        self._lock = threading.Lock()
+
+    def append(self, snapshot: Snapshot, *, source_id: Optional[str] = None, snapshot_hash: Optional[str] = None) -> None:
+        self.append_many([(snapshot, source_id, snapshot_hash)])
+
+    def append_many(self, items: Iterable[tuple[Snapshot, Optional[str], Optional[str]]]) -> int:
+        """Agrega snapshots agrupándolos por partición; devuelve cuántos se escribieron."""
+        rows: Dict[tuple[str, str, str], List[Dict[str, Any]]] = {}
+        count = 0
+        for snapshot, source_id, snapshot_hash in items:
+            meta = snapshot.meta
+            timestamp = _parse_timestamp(meta.timestamp_utc)
+            partition = (meta.department_code, timestamp.date().isoformat())
+            source_id = source_id or meta.department_code
+            rows.setdefault(("totals", *partition), []).append({
+                "timestamp_utc": timestamp,
+                "source_id": source_id,
+                "election": meta.election,
+                "year": meta.year,
+                "source": meta.source,
+                "scope": meta.scope,
+                **asdict(snapshot.totals),
+                "hash": snapshot_hash,
+            })
+            rows.setdefault(("candidates", *partition), []).extend(
+                {
+                    "timestamp_utc": timestamp,
+                    "source_id": source_id,
+                    "slot": candidate.slot,
+                    "candidate_id": candidate.candidate_id,
+                    "name": candidate.name,
+                    "party": candidate.party,
+                    "votes": candidate.votes,
+                }
+                for candidate in snapshot.candidates
+            )
+            count += 1
+
+        with self._lock:
+            for (table, department_code, day), table_rows in rows.items():
+                self._append_partition(table, department_code, day, table_rows)
+        return count
+
+    def read(
+        self,
+        table: str = "totals",
+        *,
+        columns: Optional[Sequence[str]] = None,
+        start: Any = None,
+        end: Any = None,
+        department_codes: Optional[Sequence[str]] = None,
+    ) -> "pa.Table":
+        """
+        Lee una tabla proyectando columnas y filtrando por rango [start, end] y departamento.
+
+        Los filtros por día y departamento descartan particiones sin abrirlas.
+        """
+        if table not in TABLES:
+            raise ValueError(f"Tabla columnar desconocida: {table}")
+        schema = self._schemas[table]
+        full_schema = pa.schema(
+            list(schema) + [pa.field("department_code", pa.string()), pa.field("day", pa.string())]
+        )
+        table_dir = self.root / table
+        if not table_dir.exists():
+            empty = full_schema.empty_table()
+            return empty.select(list(columns)) if columns else empty
+
+        dataset = ds.dataset(
+            str(table_dir),
+            format="parquet",
+            partitioning=_partitioning(),
+            schema=full_schema,
+        )
+        expression = None
+
+        def combine(condition):
+            return condition if expression is None else expression & condition
+
+        start_ts = _parse_timestamp(start)
+        end_ts = _parse_timestamp(end)
+        if start_ts is not None:
+            expression = combine(ds.field("day") >= start_ts.date().isoformat())
+            expression = combine(ds.field("timestamp_utc") >= pa.scalar(start_ts, type=schema.field("timestamp_utc").type))
+        if end_ts is not None:
+            expression = combine(ds.field("day") <= end_ts.date().isoformat())
+            expression = combine(ds.field("timestamp_utc") <= pa.scalar(end_ts, type=schema.field("timestamp_utc").type))
+        if department_codes:
+            expression = combine(ds.field("department_code").isin(list(department_codes)))
+
+        # El orden cronológico necesita timestamp_utc aunque no se haya pedido.
+        scan_columns = list(columns) if columns else None
+        if scan_columns is not None and "timestamp_utc" not in scan_columns:
+            scan_columns.append("timestamp_utc")
+        result = dataset.to_table(columns=scan_columns, filter=expression)
+        result = result.sort_by([("timestamp_utc", "ascending")])
+        return result.select(list(columns)) if columns else result
+
+    def read_frame(self, table: str = "totals", **kwargs: Any):
+        """Igual que read() pero devuelve un DataFrame de pandas."""
+        return self.read(table, **kwargs).to_pandas()
+
+    def partitions(self, table: str = "totals") -> List[Path]:
+        return sorted((self.root / table).glob(f"department_code=*/day=*/{PARTITION_FILE}"))
+
+    def _append_partition(self, table: str, department_code: str, day: str, rows: List[Dict[str, Any]]) -> None:
+        schema = self._schemas[table]
+        partition_dir = self.root / table / f"department_code={department_code}" / f"day={day}"
+        partition_dir.mkdir(parents=True, exist_ok=True)
+        path = partition_dir / PARTITION_FILE
+
+        new_rows = pa.Table.from_pylist(rows, schema=schema)
+        if path.exists():
+            existing = pq.read_table(path, schema=schema)
+            new_rows = pa.concat_tables([existing, new_rows])
+
+        tmp_path = partition_dir / f".{PARTITION_FILE}.{uuid.uuid4().hex}.tmp"
+        pq.write_table(new_rows, tmp_path, compression="zstd")
+        os.replace(tmp_path, path)
+
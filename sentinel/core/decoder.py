@@ -0,0 +1,111 @@
+from dataclasses import fields
+from typing import Any, Dict, Optional, Tuple, Union, get_args
+
+from sentinel.core.models import CandidateResult, Meta, Snapshot, Totals
+from sentinel.core.normalyze import DEPARTMENT_CODES, FieldMapPlan, compile_field_map, normalize_snapshot
+from sentinel.utils import codec
+
+JsonBytes = Union[bytes, bytearray, str]
+
+
+class SchemaError(ValueError):
+    """El JSON no cumple el esquema del modelo (claves o tipos)."""
+
+
+def _schema(cls: type) -> Tuple[Tuple[str, Tuple[type, ...]], ...]:
+    # Tipos admitidos por campo desde las anotaciones: int → (int,), Optional[str] → (str, NoneType).
+    schema = []
+    for field in fields(cls):
+        allowed = get_args(field.type) or (field.type,)
+        schema.append((field.name, tuple(allowed)))
+    return tuple(schema)
+
+
+_META_SCHEMA = _schema(Meta)
+_TOTALS_SCHEMA = _schema(Totals)
+_CANDIDATE_SCHEMA = _schema(CandidateResult)
+
+
+def _typed(cls: type, schema: Tuple[Tuple[str, Tuple[type, ...]], ...], payload: Any, where: str) -> Any:
+    if not isinstance(payload, dict) or len(payload) != len(schema):
+        raise SchemaError(f"{where}: se esperaban las claves {[name for name, _ in schema]}")
+    values = []
+    for name, allowed in schema:
+        try:
+            value = payload[name]
+        except KeyError:
+            raise SchemaError(f"{where}: falta la clave {name}") from None
+        # type() exacto: un bool no pasa por int.
+        if type(value) not in allowed:
+            raise SchemaError(f"{where}.{name}: tipo {type(value).__name__} no admitido")
+        values.append(value)
+    return cls(*values)
+
+
+def snapshot_from_canonical(data: JsonBytes) -> Snapshot:
+    """
+    Decodifica JSON canónico (normalized/*.json, canonical_json de LocalSnapshotStore) a Snapshot.
+
+    Valida claves y tipos contra los modelos; snapshot_to_canonical_json del
+    resultado reproduce los mismos bytes.
+    """
+    payload = codec.loads(data)
+    if not isinstance(payload, dict) or set(payload) != {"candidates", "meta", "totals"}:
+        raise SchemaError("snapshot: se esperaban las claves candidates, meta y totals")
+    candidates = payload["candidates"]
+    if not isinstance(candidates, list):
+        raise SchemaError("snapshot.candidates: se esperaba una lista")
+    return Snapshot(
+        meta=_typed(Meta, _META_SCHEMA, payload["meta"], "meta"),
+        totals=_typed(Totals, _TOTALS_SCHEMA, payload["totals"], "totals"),
+        candidates=[
+            _typed(CandidateResult, _CANDIDATE_SCHEMA, item, f"candidates[{index}]")
+            for index, item in enumerate(candidates)
+        ],
+    )
+
+
+class SnapshotDecoder:
+    """
+    Decodificador de JSON crudo del CNE a Snapshot, con el esquema de la fuente fijado una vez.
+
+    Reúne lo que normalize_snapshot recibe en cada llamada (field_map compilado,
+    departamento, año, número de candidatos) y parsea con sentinel.utils.codec.
+    """
+
+    def __init__(
+        self,
+        department_name: str,
+        *,
+        year: int = 2025,
+        candidate_count: int = 10,
+        scope: str = "DEPARTMENT",
+        department_code: Optional[str] = None,
+        field_map: Union[Dict[str, Any], FieldMapPlan, None] = None,
+    ) -> None:
+        self.department_name = department_name
+        self.department_code = department_code or DEPARTMENT_CODES.get(department_name, "00")
+        self.year = year
+        self.candidate_count = candidate_count
+        self.scope = scope
+        self.plan = field_map if isinstance(field_map, FieldMapPlan) else compile_field_map(field_map)
+
+    def decode(self, data: JsonBytes, timestamp_utc: Optional[str] = None) -> Snapshot:
+        """Bytes crudos → Snapshot; sin timestamp_utc se usa el del propio JSON."""
+        raw = codec.loads(data)
+        if not isinstance(raw, dict):
+            raise SchemaError("El snapshot crudo debe ser un objeto JSON.")
+        if timestamp_utc is None:
+            timestamp_utc = raw.get("timestamp_utc") or raw.get("timestamp")
+            if not timestamp_utc:
+                raise SchemaError("El snapshot crudo no trae timestamp_utc.")
+        return normalize_snapshot(
+            raw,
+            self.department_name,
+            timestamp_utc,
+            year=self.year,
+            candidate_count=self.candidate_count,
+            scope=self.scope,
+            department_code=self.department_code,
+            field_map=self.plan,
+        )
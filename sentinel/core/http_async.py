@@ -0,0 +1,97 @@
+import json
+import ssl
+from dataclasses import dataclass, field
+from typing import Any, Dict, Mapping
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - dependencia opcional
+    aiohttp = None
+
+
+@dataclass(frozen=True)
+class AsyncHttpResponse:
+    status_code: int
+    content: bytes
+    headers: Dict[str, str] = field(default_factory=dict)
+    encoding: str = "utf-8"
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding, errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+
+class AsyncHttpClient:
+    """
+    Cliente HTTP asíncrono con pool de conexiones persistente.
+
+    Mantiene conexiones keep-alive por host y un único contexto TLS para que
+    las sesiones TLS se reutilicen entre solicitudes al mismo host del CNE.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_connections: int = 19,
+        max_per_host: int = 19,
+        keepalive_timeout: float = 30.0,
+        dns_cache_ttl: int = 300,
+    ) -> None:
+        if aiohttp is None:
+            raise RuntimeError("http_backend=async requiere aiohttp (pip install aiohttp).")
+        self.max_connections = max_connections
+        self.max_per_host = max_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self._ssl_context = ssl.create_default_context()
+        self._session: "aiohttp.ClientSession | None" = None
+
+    async def __aenter__(self) -> "AsyncHttpClient":
+        connector = aiohttp.TCPConnector(
+            limit=self.max_connections,
+            limit_per_host=self.max_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.dns_cache_ttl,
+            ssl=self._ssl_context,
+        )
+        self._session = aiohttp.ClientSession(connector=connector)
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def get(
+        self,
+        url: str,
+        *,
+        params: Mapping[str, str] | None = None,
+        headers: Mapping[str, str] | None = None,
+        timeout: float = 15.0,
+    ) -> AsyncHttpResponse:
+        if self._session is None:
+            raise RuntimeError("AsyncHttpClient no está abierto; usa 'async with'.")
+        async with self._session.get(
+            url,
+            params=dict(params or {}),
+            headers=dict(headers or {}),
+            timeout=aiohttp.ClientTimeout(total=timeout),
+        ) as response:
+            content = await response.read()
+            return AsyncHttpResponse(
+                status_code=response.status,
+                content=content,
+                headers={key.lower(): value for key, value in response.headers.items()},
+                encoding=response.charset or "utf-8",
+            )
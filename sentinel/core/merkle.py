@@ -0,0 +1,199 @@
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Prefijos de dominio (RFC 6962): una hoja nunca puede hacerse pasar por un nodo interno.
+LEAF_PREFIX = b"\x00"
+NODE_PREFIX = b"\x01"
+
+
+def leaf_hash(label: str, value: str) -> str:
+    """Hoja = SHA-256(0x00 || "label:value"); label es el source_id o el round_id."""
+    return hashlib.sha256(LEAF_PREFIX + f"{label}:{value}".encode("utf-8")).hexdigest()
+
+
+def node_hash(left: str, right: str) -> str:
+    return hashlib.sha256(NODE_PREFIX + bytes.fromhex(left) + bytes.fromhex(right)).hexdigest()
+
+
+def build_levels(leaves: Sequence[str]) -> List[List[str]]:
+    """
+    Niveles del árbol desde las hojas hasta la raíz.
+
+    Un nodo sin pareja sube sin re-hashear (no se duplica), así dos listas de
+    hojas distintas nunca producen la misma raíz.
+    """
+    if not leaves:
+        raise ValueError("Un árbol Merkle necesita al menos una hoja.")
+    levels = [list(leaves)]
+    while len(levels[-1]) > 1:
+        current = levels[-1]
+        parents = [node_hash(current[i], current[i + 1]) for i in range(0, len(current) - 1, 2)]
+        if len(current) % 2:
+            parents.append(current[-1])
+        levels.append(parents)
+    return levels
+
+
+def merkle_root(leaves: Sequence[str]) -> str:
+    return build_levels(leaves)[-1][0]
+
+
+def inclusion_path(levels: List[List[str]], index: int) -> List[Dict[str, str]]:
+    """Hermanos de la hoja `index` hasta la raíz: O(log n) hashes."""
+    path = []
+    for level in levels[:-1]:
+        sibling = index ^ 1
+        if sibling < len(level):
+            path.append({"side": "left" if sibling < index else "right", "hash": level[sibling]})
+        index //= 2
+    return path
+
+
+def root_from_path(leaf: str, path: Sequence[Dict[str, str]]) -> str:
+    current = leaf
+    for step in path:
+        if step["side"] == "left":
+            current = node_hash(step["hash"], current)
+        else:
+            current = node_hash(current, step["hash"])
+    return current
+
+
+def verify_proof(
+    proof: Dict[str, Any],
+    round_root: Optional[str] = None,
+    day_root: Optional[str] = None,
+) -> bool:
+    """
+    Verifica una prueba de inclusión de MerkleLedger.prove sin acceso al ledger.
+
+    Las raíces que trae la prueba no bastan (una prueba falsa puede ser coherente
+    consigo misma): se recalculan desde la hoja y se comparan con las raíces
+    publicadas `round_root` y/o `day_root`; hay que indicar al menos una.
+    """
+    if round_root is None and day_root is None:
+        raise ValueError("Indica round_root o day_root publicados para verificar la prueba.")
+    leaf = leaf_hash(proof["source_id"], proof["hash"])
+    computed_round = root_from_path(leaf, proof["round_path"])
+    if computed_round != proof["round_root"] or (round_root is not None and computed_round != round_root):
+        return False
+    round_leaf = leaf_hash(proof["round_id"], computed_round)
+    computed_day = root_from_path(round_leaf, proof["day_path"])
+    if computed_day != proof["day_root"]:
+        return False
+    return day_root is None or computed_day == day_root
+
+
+def _round_id(timestamp_utc: str) -> Tuple[str, str]:
+    parsed = datetime.fromisoformat(timestamp_utc.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    parsed = parsed.astimezone(timezone.utc)
+    return parsed.strftime("%Y%m%dT%H%M%S.%fZ"), parsed.date().isoformat()
+
+
+def _write_json(path: Path, payload: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+class MerkleLedger:
+    """
+    Raíces Merkle por ronda (todas las fuentes) y por día (raíces de las rondas).
+
+    Layout:
+      rounds/<round_id>.json  hojas (source_id, hash) y raíz de la ronda
+      days/<YYYY-MM-DD>.json  rondas del día y raíz diaria
+      latest.json             última ronda registrada (lo que se publica)
+    """
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+
+    def record_round(self, leaves: Sequence[Tuple[str, str]], timestamp_utc: str) -> Dict[str, Any]:
+        """Registra una ronda con hojas (source_id, snapshot_hash); devuelve su registro."""
+        round_id, day = _round_id(timestamp_utc)
+        ordered = sorted(leaves)
+        root = merkle_root([leaf_hash(source_id, value) for source_id, value in ordered])
+        record = {
+            "round_id": round_id,
+            "day": day,
+            "timestamp_utc": timestamp_utc,
+            "root": root,
+            "leaves": [{"source_id": source_id, "hash": value} for source_id, value in ordered],
+        }
+        _write_json(self.root / "rounds" / f"{round_id}.json", record)
+
+        day_record = self.load_day(day) or {"day": day, "rounds": []}
+        rounds = {item["round_id"]: item["root"] for item in day_record["rounds"]}
+        rounds[round_id] = root
+        day_record["rounds"] = [{"round_id": key, "root": rounds[key]} for key in sorted(rounds)]
+        day_record["root"] = merkle_root([leaf_hash(item["round_id"], item["root"]) for item in day_record["rounds"]])
+        _write_json(self.root / "days" / f"{day}.json", day_record)
+
+        latest = {
+            "round_id": round_id,
+            "day": day,
+            "root": root,
+            "sources": len(ordered),
+            "day_root": day_record["root"],
+        }
+        _write_json(self.root / "latest.json", latest)
+        return record
+
+    def load_round(self, round_id: str) -> Optional[Dict[str, Any]]:
+        return self._read(self.root / "rounds" / f"{round_id}.json")
+
+    def load_day(self, day: str) -> Optional[Dict[str, Any]]:
+        return self._read(self.root / "days" / f"{day}.json")
+
+    def latest(self) -> Optional[Dict[str, Any]]:
+        return self._read(self.root / "latest.json")
+
+    def find_round(self, snapshot_hash: str) -> Optional[Dict[str, Any]]:
+        """Busca la ronda que contiene un hash de snapshot (de la más reciente a la más antigua)."""
+        for path in sorted((self.root / "rounds").glob("*.json"), reverse=True):
+            record = self._read(path)
+            if record and any(leaf["hash"] == snapshot_hash for leaf in record["leaves"]):
+                return record
+        return None
+
+    def prove(self, snapshot_hash: str, round_id: Optional[str] = None) -> Dict[str, Any]:
+        """Prueba de inclusión snapshot → raíz de la ronda → raíz del día."""
+        record = self.load_round(round_id) if round_id else self.find_round(snapshot_hash)
+        if record is None:
+            raise KeyError(f"Hash no registrado en ninguna ronda Merkle: {snapshot_hash}")
+        index = next(
+            (position for position, leaf in enumerate(record["leaves"]) if leaf["hash"] == snapshot_hash),
+            None,
+        )
+        if index is None:
+            raise KeyError(f"Hash no registrado en la ronda {record['round_id']}: {snapshot_hash}")
+        round_levels = build_levels([leaf_hash(leaf["source_id"], leaf["hash"]) for leaf in record["leaves"]])
+
+        day_record = self.load_day(record["day"])
+        day_index = [item["round_id"] for item in day_record["rounds"]].index(record["round_id"])
+        day_levels = build_levels([leaf_hash(item["round_id"], item["root"]) for item in day_record["rounds"]])
+
+        return {
+            "source_id": record["leaves"][index]["source_id"],
+            "hash": snapshot_hash,
+            "round_id": record["round_id"],
+            "round_root": record["root"],
+            "round_path": inclusion_path(round_levels, index),
+            "day": record["day"],
+            "day_root": day_record["root"],
+            "day_path": inclusion_path(day_levels, day_index),
+        }
+
+    @staticmethod
+    def _read(path: Path) -> Optional[Dict[str, Any]]:
+        if not path.exists():
+            return None
+        return json.loads(path.read_text(encoding="utf-8"))
@@ -1,8 +1,11 @@
 from dataclasses import dataclass
 from typing import List, Optional
 
+# slots=True: sin __dict__ por instancia; un snapshot con 10+ CandidateResult ocupa
+# una fracción de la memoria. Para convertir a dict usa dataclasses.asdict.
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class CandidateResult:
     slot: int
     votes: int
@@ -11,7 +14,7 @@ class CandidateResult:
     party: Optional[str] = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Totals:
     registered_voters: int
     total_votes: int
@@ -20,7 +23,7 @@ class Totals:
     blank_votes: int
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Meta:
     election: str
     year: int
@@ -30,7 +33,7 @@ class Meta:
     timestamp_utc: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Snapshot:
     meta: Meta
     totals: Totals
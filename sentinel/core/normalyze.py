@@ -1,5 +1,7 @@
 import json
-from typing import Dict, Any, List, Iterable
+from dataclasses import asdict, dataclass, fields
+from operator import attrgetter
+from typing import Dict, Any, Callable, List, Iterable, Tuple
 from sentinel.core.models import Meta, Totals, CandidateResult, Snapshot
 
 
@@ -26,6 +28,8 @@ DEPARTMENT_CODES = {
 
 
 def _safe_int(value: Any) -> int:
+    if type(value) is int:
+        return value
     try:
         if value is None:
             return 0
@@ -34,43 +38,83 @@ def _safe_int(value: Any) -> int:
         return 0
 
 
-def _get_nested_value(payload: Dict[str, Any], path: str) -> Any:
-    current: Any = payload
-    for part in path.split("."):
-        if not isinstance(current, dict):
-            return None
-        current = current.get(part)
-    return current
+PathGetter = Callable[[Dict[str, Any]], Any]
 
+DEFAULT_TOTALS_PATHS: Dict[str, List[str]] = {
+    "registered_voters": ["registered_voters", "inscritos", "padron"],
+    "total_votes": ["total_votes", "total_votos", "votos_emitidos"],
+    "valid_votes": ["valid_votes", "votos_validos", "validos"],
+    "null_votes": ["null_votes", "votos_nulos", "nulos"],
+    "blank_votes": ["blank_votes", "votos_blancos", "blancos"],
+}
+DEFAULT_CANDIDATE_ROOTS: List[str] = ["candidatos", "candidates", "resultados", "partidos"]
 
-def _first_value(payload: Dict[str, Any], keys: Iterable[str]) -> Any:
-    for key in keys:
-        if "." in key:
-            value = _get_nested_value(payload, key)
-        else:
-            value = payload.get(key)
-        if value is not None:
-            return value
-    return None
 
+def _compile_path(path: str) -> PathGetter:
+    """Getter para una ruta JSON; las rutas con puntos se separan una sola vez."""
+    if "." not in path:
+        return lambda payload: payload.get(path)
+    parts = tuple(path.split("."))
 
-def _extract_candidates_root(raw: Dict[str, Any], candidate_roots: Iterable[str]) -> Any:
-    for key in candidate_roots:
-        value = _get_nested_value(raw, key) if "." in key else raw.get(key)
-        if isinstance(value, dict) and "candidatos" in value:
-            return value["candidatos"]
-        if isinstance(value, (list, dict)):
-            return value
-    return None
+    def getter(payload: Dict[str, Any]) -> Any:
+        current: Any = payload
+        for part in parts:
+            if not isinstance(current, dict):
+                return None
+            current = current.get(part)
+        return current
 
+    return getter
 
-def _iter_candidates(
-    raw: Dict[str, Any],
-    candidate_count: int,
-    candidate_roots: Iterable[str],
-) -> Iterable[CandidateResult]:
-    raw_candidates = _extract_candidates_root(raw, candidate_roots)
 
+@dataclass(frozen=True)
+class FieldMapPlan:
+    """field_map compilado a getters; se reutiliza en todos los snapshots de una corrida."""
+
+    totals: Dict[str, Tuple[PathGetter, ...]]
+    candidate_roots: Tuple[PathGetter, ...]
+
+    def total(self, raw: Dict[str, Any], field: str) -> int:
+        """Primer valor no nulo entre las rutas del campo, como entero."""
+        for getter in self.totals[field]:
+            value = getter(raw)
+            if value is not None:
+                return _safe_int(value)
+        return 0
+
+    def candidates_root(self, raw: Dict[str, Any]) -> Any:
+        for getter in self.candidate_roots:
+            value = getter(raw)
+            if isinstance(value, dict) and "candidatos" in value:
+                return value["candidatos"]
+            if isinstance(value, (list, dict)):
+                return value
+        return None
+
+
+def compile_field_map(field_map: Dict[str, Any] | None = None) -> FieldMapPlan:
+    """
+    Compila el field_map de config.yaml (`totals`, `candidate_roots`) una vez por corrida.
+
+    Los campos sin rutas configuradas usan las claves por defecto.
+    """
+    field_map = field_map or {}
+    totals_map = field_map.get("totals", {})
+    return FieldMapPlan(
+        totals={
+            field: tuple(_compile_path(path) for path in totals_map.get(field, default_paths))
+            for field, default_paths in DEFAULT_TOTALS_PATHS.items()
+        },
+        candidate_roots=tuple(
+            _compile_path(path) for path in field_map.get("candidate_roots", DEFAULT_CANDIDATE_ROOTS)
+        ),
+    )
+
+
+_DEFAULT_PLAN = compile_field_map()
+
+
+def _iter_candidates(raw_candidates: Any, candidate_count: int) -> Iterable[CandidateResult]:
     if isinstance(raw_candidates, list):
         for idx, item in enumerate(raw_candidates, start=1):
             yield CandidateResult(
@@ -110,10 +154,13 @@ def normalize_snapshot(
     candidate_count: int = 10,
     scope: str = "DEPARTMENT",
     department_code: str | None = None,
-    field_map: Dict[str, List[str]] | None = None,
+    field_map: Dict[str, Any] | FieldMapPlan | None = None,
 ) -> Snapshot:
     """
     Convierte un JSON crudo del CNE en un Snapshot canónico e inmutable.
+
+    `field_map` puede ser el dict de config.yaml o un FieldMapPlan ya compilado
+    (compile_field_map); en corridas largas conviene compilarlo una sola vez.
     """
 
     resolved_department_code = department_code or DEPARTMENT_CODES.get(department_name, "00")
@@ -127,25 +174,16 @@ def normalize_snapshot(
         timestamp_utc=timestamp_utc,
     )
 
-    field_map = field_map or {}
-    totals_map = field_map.get("totals", {})
-    candidate_roots = field_map.get("candidate_roots", ["candidatos", "candidates", "resultados", "partidos"])
+    if isinstance(field_map, FieldMapPlan):
+        plan = field_map
+    else:
+        plan = compile_field_map(field_map) if field_map else _DEFAULT_PLAN
 
-    registered_voters = _safe_int(
-        _first_value(raw, totals_map.get("registered_voters", ["registered_voters", "inscritos", "padron"]))
-    )
-    total_votes = _safe_int(
-        _first_value(raw, totals_map.get("total_votes", ["total_votes", "total_votos", "votos_emitidos"]))
-    )
-    valid_votes = _safe_int(
-        _first_value(raw, totals_map.get("valid_votes", ["valid_votes", "votos_validos", "validos"]))
-    )
-    null_votes = _safe_int(
-        _first_value(raw, totals_map.get("null_votes", ["null_votes", "votos_nulos", "nulos"]))
-    )
-    blank_votes = _safe_int(
-        _first_value(raw, totals_map.get("blank_votes", ["blank_votes", "votos_blancos", "blancos"]))
-    )
+    registered_voters = plan.total(raw, "registered_voters")
+    total_votes = plan.total(raw, "total_votes")
+    valid_votes = plan.total(raw, "valid_votes")
+    null_votes = plan.total(raw, "null_votes")
+    blank_votes = plan.total(raw, "blank_votes")
 
     if total_votes == 0 and any([valid_votes, null_votes, blank_votes]):
         total_votes = valid_votes + null_votes + blank_votes
@@ -158,10 +196,10 @@ def normalize_snapshot(
         blank_votes=blank_votes,
     )
 
-    raw_candidates = _extract_candidates_root(raw, candidate_roots)
+    raw_candidates = plan.candidates_root(raw)
     if isinstance(raw_candidates, list):
         candidate_count = max(candidate_count, len(raw_candidates))
-    candidates: List[CandidateResult] = list(_iter_candidates(raw, candidate_count, candidate_roots))
+    candidates: List[CandidateResult] = list(_iter_candidates(raw_candidates, candidate_count))
 
     return Snapshot(
         meta=meta,
@@ -170,23 +208,65 @@ def normalize_snapshot(
     )
 
 
+def _field_layout(cls: type) -> Tuple[str, Any]:
+    # Orden de sort_keys=True: plantilla '{"campo":%s,...}' y un getter que lee todos los valores de una vez.
+    names = sorted(field.name for field in fields(cls))
+    template = "{" + ",".join(json.dumps(name) + ":%s" for name in names) + "}"
+    return template, attrgetter(*names)
+
+
+_META_LAYOUT = _field_layout(Meta)
+_TOTALS_LAYOUT = _field_layout(Totals)
+_CANDIDATE_LAYOUT = _field_layout(CandidateResult)
+_encode_string = json.encoder.encode_basestring_ascii
+
+
+def _encode_value(value: Any) -> str:
+    if value is None:
+        return "null"
+    value_type = type(value)
+    if value_type is str:
+        return _encode_string(value)
+    if value_type is int:
+        return int.__repr__(value)
+    # bool, float u otros tipos: mismo resultado que json.dumps.
+    return json.dumps(value, sort_keys=True, separators=(",", ":"))
+
+
+def _encode_object(obj: Any, layout: Tuple[str, Any]) -> str:
+    template, getter = layout
+    return template % tuple(map(_encode_value, getter(obj)))
+
+
+def snapshot_to_canonical_parts(snapshot: Snapshot) -> Tuple[str, str]:
+    """
+    Serializa un Snapshot en una sola pasada y devuelve (canonical_json, candidates_json).
+
+    Produce los mismos bytes que json.dumps(sort_keys=True, separators=(",", ":"))
+    sobre los campos de los dataclasses; candidates_json es el segmento
+    `candidates` del JSON canónico, el que guarda LocalSnapshotStore.
+    """
+
+    template, getter = _CANDIDATE_LAYOUT
+    candidates_json = "[" + ",".join(
+        [template % tuple(map(_encode_value, getter(candidate))) for candidate in snapshot.candidates]
+    ) + "]"
+    canonical_json = (
+        '{"candidates":' + candidates_json
+        + ',"meta":' + _encode_object(snapshot.meta, _META_LAYOUT)
+        + ',"totals":' + _encode_object(snapshot.totals, _TOTALS_LAYOUT)
+        + "}"
+    )
+    return canonical_json, candidates_json
+
+
 def snapshot_to_canonical_json(snapshot: Snapshot) -> str:
     """
     Serializa un Snapshot a JSON canónico (orden fijo, sin espacios).
     """
 
-    payload = {
-        "meta": snapshot.meta.__dict__,
-        "totals": snapshot.totals.__dict__,
-        "candidates": [c.__dict__ for c in snapshot.candidates],
-    }
-
-    return json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return snapshot_to_canonical_parts(snapshot)[0]
 
 
 def snapshot_to_dict(snapshot: Snapshot) -> Dict[str, Any]:
-    return {
-        "meta": snapshot.meta.__dict__,
-        "totals": snapshot.totals.__dict__,
-        "candidates": [c.__dict__ for c in snapshot.candidates],
-    }
+    return asdict(snapshot)
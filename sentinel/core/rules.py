@@ -0,0 +1,209 @@
+import collections
+import copy
+import logging
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Tuple
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RULE_SETTINGS: Dict[str, Dict[str, Any]] = {
+    "arithmetic_mismatch": {"enabled": True},
+    "vote_breakdown_mismatch": {"enabled": True},
+    "negative_delta": {"enabled": True},
+    "benford": {"enabled": True, "min_samples": 10, "min_first_digit_pct": 20.0},
+    "change_point": {"enabled": True, "sigma": 3.0},
+    "outlier": {"enabled": True, "zscore": 3.0, "iqr_factor": 1.5},
+    "actas_desvio": {"enabled": True},
+    "relative_change": {"enabled": True, "threshold_pct": 15.0},
+    "scrutinio_salto": {"enabled": True, "threshold_pct": 5.0},
+    "votos_totales_mismatch": {"enabled": True},
+    "actas_overflow": {"enabled": True},
+}
+
+# Variables de entorno históricas que siguen teniendo prioridad sobre config.yaml.
+ENV_OVERRIDES = {
+    "RELATIVE_VOTE_CHANGE_PCT": ("relative_change", "threshold_pct"),
+    "SCRUTINIO_JUMP_PCT": ("scrutinio_salto", "threshold_pct"),
+}
+
+
+@dataclass(frozen=True)
+class Rule:
+    name: str
+    anomaly_type: str
+    scope: str
+    columns: Tuple[str, ...]
+    func: Callable[..., Any]
+
+
+@dataclass
+class RuleStats:
+    calls: int = 0
+    seconds: float = 0.0
+    rows: int = 0
+    hits: int = 0
+
+
+class RuleRegistry:
+    """
+    Registro ordenado de reglas de auditoría.
+
+    scope="snapshot" son reglas por archivo; scope="frame" son máscaras que se
+    evalúan en lote sobre el DataFrame compartido y declaran las columnas que leen.
+    """
+
+    SCOPES = ("snapshot", "frame")
+
+    def __init__(self) -> None:
+        self._rules: Dict[str, Rule] = {}
+
+    def register(
+        self,
+        name: str,
+        *,
+        anomaly_type: str,
+        scope: str,
+        columns: Tuple[str, ...] = (),
+    ) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        if scope not in self.SCOPES:
+            raise ValueError(f"scope inválido para la regla {name}: {scope}")
+        if name not in DEFAULT_RULE_SETTINGS:
+            raise ValueError(f"Regla sin configuración por defecto: {name}")
+
+        def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+            self._rules[name] = Rule(name, anomaly_type, scope, tuple(columns), func)
+            return func
+
+        return decorator
+
+    def rules(self, scope: str) -> List[Rule]:
+        return [rule for rule in self._rules.values() if rule.scope == scope]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._rules
+
+
+def load_rule_settings(
+    config: Optional[Mapping[str, Any]] = None,
+    config_path: str = "config.yaml",
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Combina los valores por defecto con la sección `rules` de config.yaml.
+
+    Acepta `regla: false` como atajo para desactivarla.
+    """
+    if config is None:
+        path = Path(config_path)
+        config = {}
+        if path.exists():
+            with path.open("r", encoding="utf-8") as handle:
+                config = yaml.safe_load(handle) or {}
+
+    settings = copy.deepcopy(DEFAULT_RULE_SETTINGS)
+    for name, overrides in (config.get("rules") or {}).items():
+        if name not in settings:
+            raise ValueError(f"Regla desconocida en config.yaml: {name}")
+        if isinstance(overrides, bool):
+            overrides = {"enabled": overrides}
+        for key, value in (overrides or {}).items():
+            settings[name][key] = _coerce(DEFAULT_RULE_SETTINGS[name].get(key), value)
+
+    for env_name, (rule_name, key) in ENV_OVERRIDES.items():
+        value = os.getenv(env_name)
+        if value:
+            settings[rule_name][key] = float(value)
+    return settings
+
+
+def _coerce(default: Any, value: Any) -> Any:
+    # YAML entrega 15 como int; los umbrales se publican en las anomalías como 15.0.
+    if isinstance(default, bool) or value is None:
+        return value
+    if isinstance(default, float):
+        return float(value)
+    if isinstance(default, int):
+        return int(value)
+    return value
+
+
+class RuleRun:
+    """Reglas activas de una corrida, con sus parámetros y tiempo/filas por regla."""
+
+    def __init__(self, registry: RuleRegistry, settings: Optional[Dict[str, Dict[str, Any]]] = None) -> None:
+        self.registry = registry
+        self.settings = settings if settings is not None else load_rule_settings()
+        self.stats: Dict[str, RuleStats] = collections.defaultdict(RuleStats)
+
+    def is_enabled(self, name: str) -> bool:
+        return bool(self.settings[name].get("enabled", True))
+
+    def enabled(self, scope: str) -> List[Rule]:
+        return [rule for rule in self.registry.rules(scope) if self.is_enabled(rule.name)]
+
+    def params(self, name: str) -> Dict[str, Any]:
+        return self.settings[name]
+
+    @contextmanager
+    def measure(self, name: str, rows: int = 0) -> Iterator[RuleStats]:
+        stats = self.stats[name]
+        started = time.perf_counter()
+        try:
+            yield stats
+        finally:
+            stats.seconds += time.perf_counter() - started
+            stats.calls += 1
+            stats.rows += rows
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Métricas por regla, de mayor a menor tiempo."""
+        ordered = sorted(self.stats.items(), key=lambda item: item[1].seconds, reverse=True)
+        return {
+            name: {
+                "calls": stats.calls,
+                "seconds": round(stats.seconds, 6),
+                "rows": stats.rows,
+                "hits": stats.hits,
+            }
+            for name, stats in ordered
+        }
+
+    def log_summary(self) -> None:
+        for name, stats in self.summary().items():
+            logger.info(
+                "rule_timing rule=%s seconds=%.4f calls=%s rows=%s hits=%s",
+                name,
+                stats["seconds"],
+                stats["calls"],
+                stats["rows"],
+                stats["hits"],
+            )
+
+
+def benford_first_digit(
+    votos_lista: List[Dict[str, Any]],
+    min_samples: int = 10,
+    min_first_digit_pct: float = 20.0,
+) -> Optional[Dict[str, Any]]:
+    """Distribución del primer dígito (Ley de Benford): el '1' debe rondar el 30%."""
+    # Solo procesamos si hay suficientes datos para evitar falsos positivos
+    if len(votos_lista) < min_samples:
+        return None
+
+    first_digits = []
+    for c in votos_lista:
+        votos_str = str(c.get("votos") or c.get("votes") or "").strip()
+        if votos_str and votos_str not in ["0", "None"]:
+            first_digits.append(int(votos_str[0]))
+
+    if not first_digits:
+        return None
+
+    counts = collections.Counter(first_digits)
+    dist_1 = (counts[1] / len(first_digits)) * 100
+    return {"is_anomaly": dist_1 < min_first_digit_pct, "prop_1": dist_1}
@@ -1,10 +1,17 @@
+import atexit
 import json
-from typing import Any, Dict, Mapping
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Mapping
 from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 from playwright.sync_api import sync_playwright
 from playwright_stealth import stealth_sync
 
+logger = logging.getLogger(__name__)
+
 
 def _build_url(base_url: str, params: Mapping[str, str]) -> str:
     split = urlsplit(base_url)
@@ -23,6 +30,202 @@ def _apply_stealth(page) -> None:
     )
 
 
+def _load_payload(context, url: str, timeout: float, stealth: bool) -> Dict[str, Any]:
+    page = context.new_page()
+    try:
+        if stealth:
+            _apply_stealth(page)
+        response = page.goto(url, wait_until="networkidle", timeout=int(timeout * 1000))
+        if response is None:
+            raise RuntimeError("Playwright no recibió respuesta al cargar la URL.")
+        try:
+            payload = response.json()
+        except Exception:
+            text = response.text()
+            try:
+                payload = json.loads(text)
+            except json.JSONDecodeError as exc:
+                raise ValueError("Respuesta Playwright no es JSON válido.") from exc
+    finally:
+        page.close()
+
+    if not isinstance(payload, dict):
+        raise ValueError("Respuesta Playwright no es un objeto JSON.")
+
+    return payload
+
+
+class _BrowserWorker:
+    """
+    Navegador Chromium propio de un hilo.
+
+    La API síncrona de Playwright no puede compartirse entre hilos, así que
+    cada worker del pool lanza y conserva su propio navegador y contexto.
+    """
+
+    def __init__(self, max_pages_per_context: int) -> None:
+        self.max_pages_per_context = max_pages_per_context
+        self._playwright = None
+        self._browser = None
+        self._context = None
+        self._context_key: tuple | None = None
+        self._pages_served = 0
+
+    def fetch(self, url: str, timeout: float, stealth: bool, context_options: Dict[str, Any]) -> Dict[str, Any]:
+        context = self._ensure_context(context_options)
+        try:
+            payload = _load_payload(context, url, timeout, stealth)
+        except Exception:
+            if not self._is_healthy():
+                self.close()
+            raise
+        self._pages_served += 1
+        if self._pages_served >= self.max_pages_per_context:
+            self._close_context()
+        return payload
+
+    def close(self) -> None:
+        self._close_context()
+        try:
+            if self._browser is not None:
+                self._browser.close()
+            if self._playwright is not None:
+                self._playwright.stop()
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("browser_pool_close_failed error=%s", exc)
+        self._browser = None
+        self._playwright = None
+
+    def _is_healthy(self) -> bool:
+        return self._browser is not None and self._browser.is_connected()
+
+    def _ensure_context(self, context_options: Dict[str, Any]):
+        if not self._is_healthy():
+            self.close()
+            self._playwright = sync_playwright().start()
+            self._browser = self._playwright.chromium.launch(headless=True)
+            logger.info("browser_pool_launch thread=%s", threading.current_thread().name)
+        key = tuple(sorted((name, repr(value)) for name, value in context_options.items()))
+        if self._context is not None and self._context_key != key:
+            self._close_context()
+        if self._context is None:
+            self._context = self._browser.new_context(**context_options)
+            self._context_key = key
+            self._pages_served = 0
+        return self._context
+
+    def _close_context(self) -> None:
+        if self._context is not None:
+            try:
+                self._context.close()
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("browser_pool_context_close_failed error=%s", exc)
+        self._context = None
+        self._context_key = None
+        self._pages_served = 0
+
+
+class BrowserPool:
+    """
+    Pool persistente de navegadores Playwright para el fallback de scraping.
+
+    `size` limita cuántas navegaciones corren a la vez; cada contexto se
+    recicla tras `max_pages_per_context` páginas y el navegador se relanza si
+    deja de responder.
+    """
+
+    def __init__(self, size: int = 2, max_pages_per_context: int = 50) -> None:
+        self.size = max(1, size)
+        self.max_pages_per_context = max(1, max_pages_per_context)
+        self._jobs: "queue.Queue[tuple[Callable[[_BrowserWorker], Any], Future] | None]" = queue.Queue()
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def fetch(
+        self,
+        base_url: str,
+        params: Mapping[str, str],
+        timeout: float,
+        headers: Mapping[str, str],
+        *,
+        user_agent: str | None = None,
+        locale: str | None = None,
+        timezone_id: str | None = None,
+        viewport: Dict[str, int] | None = None,
+        stealth: bool = False,
+    ) -> Dict[str, Any]:
+        url = _build_url(base_url, params)
+        context_options = {
+            "extra_http_headers": dict(headers),
+            "user_agent": user_agent,
+            "locale": locale,
+            "timezone_id": timezone_id,
+            "viewport": viewport,
+        }
+        return self._submit(lambda worker: worker.fetch(url, timeout, stealth, context_options)).result()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            threads = list(self._threads)
+        for _ in threads:
+            self._jobs.put(None)
+        for thread in threads:
+            thread.join()
+
+    def _submit(self, job: Callable[[_BrowserWorker], Any]) -> Future:
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("BrowserPool cerrado.")
+            if len(self._threads) < self.size:
+                thread = threading.Thread(
+                    target=self._run_worker,
+                    name=f"browser-pool-{len(self._threads) + 1}",
+                    daemon=True,
+                )
+                self._threads.append(thread)
+                thread.start()
+            self._jobs.put((job, future))
+        return future
+
+    def _run_worker(self) -> None:
+        worker = _BrowserWorker(self.max_pages_per_context)
+        try:
+            while True:
+                item = self._jobs.get()
+                if item is None:
+                    break
+                job, future = item
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    future.set_result(job(worker))
+                except Exception as exc:  # noqa: BLE001
+                    future.set_exception(exc)
+        finally:
+            worker.close()
+
+
+_shared_pool: BrowserPool | None = None
+_shared_pool_lock = threading.Lock()
+
+
+def get_browser_pool(size: int = 2, max_pages_per_context: int = 50) -> BrowserPool:
+    """
+    Devuelve el pool compartido del proceso, creándolo en el primer uso.
+    """
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = BrowserPool(size=size, max_pages_per_context=max_pages_per_context)
+            atexit.register(_shared_pool.close)
+        return _shared_pool
+
+
 def fetch_payload_with_playwright(
     base_url: str,
     params: Mapping[str, str],
@@ -34,7 +237,21 @@ def fetch_payload_with_playwright(
     timezone_id: str | None = None,
     viewport: Dict[str, int] | None = None,
     stealth: bool = False,
+    pool: BrowserPool | None = None,
 ) -> Dict[str, Any]:
+    if pool is not None:
+        return pool.fetch(
+            base_url,
+            params,
+            timeout,
+            headers,
+            user_agent=user_agent,
+            locale=locale,
+            timezone_id=timezone_id,
+            viewport=viewport,
+            stealth=stealth,
+        )
+
     url = _build_url(base_url, params)
 
     with sync_playwright() as playwright:
@@ -47,25 +264,7 @@ def fetch_payload_with_playwright(
             viewport=viewport,
         )
         try:
-            page = context.new_page()
-            if stealth:
-                _apply_stealth(page)
-            response = page.goto(url, wait_until="networkidle", timeout=int(timeout * 1000))
-            if response is None:
-                raise RuntimeError("Playwright no recibió respuesta al cargar la URL.")
-            try:
-                payload = response.json()
-            except Exception:
-                text = response.text()
-                try:
-                    payload = json.loads(text)
-                except json.JSONDecodeError as exc:
-                    raise ValueError("Respuesta Playwright no es JSON válido.") from exc
+            return _load_payload(context, url, timeout, stealth)
         finally:
             context.close()
             browser.close()
-
-    if not isinstance(payload, dict):
-        raise ValueError("Respuesta Playwright no es un objeto JSON.")
-
-    return payload
@@ -1,96 +1,215 @@
 import csv
-import json
+import gzip
+import io
 import sqlite3
+import textwrap
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional
+from typing import IO, Any, Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
 
 from sentinel.core.hashchain import compute_hash
 from sentinel.core.models import Snapshot
-from sentinel.core.normalyze import snapshot_to_canonical_json
+from sentinel.core.normalyze import snapshot_to_canonical_parts
+from sentinel.utils import codec
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - dependencia opcional
+    pa = None
+    pq = None
+
+# Perfiles de conexión. "tuned" usa WAL para que dashboard, bot y pipeline lean
+# mientras el descargador escribe; "default" (por defecto) conserva el journal de
+# SQLite. WAL cambia la base de forma persistente y deja archivos -wal/-shm, por
+# eso se activa solo a pedido.
+STORAGE_PROFILES: Dict[str, Dict[str, Any]] = {
+    "default": {},
+    "tuned": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 256 * 1024 * 1024,
+        "cache_size": -64 * 1024,  # Negativo = KiB (64 MiB).
+        "temp_store": "MEMORY",
+    },
+}
+
+# Filas leídas del cursor por bloque al exportar: la memoria no crece con la historia.
+EXPORT_CHUNK_SIZE = 500
+EXPORT_COMPRESSIONS = ("gzip", "zstd")
+EXPORT_FIELDNAMES = [
+    "timestamp_utc",
+    "hash",
+    "previous_hash",
+    "registered_voters",
+    "total_votes",
+    "valid_votes",
+    "null_votes",
+    "blank_votes",
+    "candidates_json",
+    "canonical_json",
+]
+
+# "department_tables": una tabla dept_XX_snapshots por departamento + snapshot_index.
+# "single_table": una sola tabla `snapshots` con clave (department_code, timestamp_utc).
+LAYOUTS = ("department_tables", "single_table")
+SNAPSHOTS_TABLE = "snapshots"
+TOTALS_COLUMNS = (
+    "registered_voters",
+    "total_votes",
+    "valid_votes",
+    "null_votes",
+    "blank_votes",
+)
+
+SNAPSHOTS_INSERT_SQL = """
+    INSERT OR REPLACE INTO snapshots (
+        department_code,
+        timestamp_utc,
+        hash,
+        previous_hash,
+        canonical_json,
+        registered_voters,
+        total_votes,
+        valid_votes,
+        null_votes,
+        blank_votes,
+        candidates_json
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+CANDIDATE_VOTES_INSERT_SQL = """
+    INSERT OR REPLACE INTO candidate_votes (
+        department_code,
+        timestamp_utc,
+        slot,
+        candidate_id,
+        name,
+        party,
+        votes
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Votos por candidato con el delta respecto al snapshot anterior del mismo
+# departamento y candidato (ventana sobre la PK department_code, slot, timestamp_utc).
+CANDIDATE_DELTAS_SQL = """
+    SELECT
+        department_code,
+        timestamp_utc,
+        slot,
+        candidate_id,
+        votes,
+        LAG(votes) OVER series AS previous_votes,
+        votes - LAG(votes) OVER series AS delta
+    FROM candidate_votes
+    WHERE {where}
+    WINDOW series AS (PARTITION BY department_code, slot ORDER BY timestamp_utc)
+"""
+
+INDEX_INSERT_SQL = """
+    INSERT OR REPLACE INTO snapshot_index (
+        department_code,
+        timestamp_utc,
+        table_name,
+        hash,
+        previous_hash
+    )
+    VALUES (?, ?, ?, ?, ?)
+"""
 
 
 class LocalSnapshotStore:
-    def __init__(self, db_path: str) -> None:
+    def __init__(
+        self,
+        db_path: str,
+        profile: str = "default",
+        pragmas: Optional[Mapping[str, Any]] = None,
+        layout: str = "department_tables",
+    ) -> None:
+        if profile not in STORAGE_PROFILES:
+            raise ValueError(f"Perfil de almacenamiento desconocido: {profile}")
+        if layout not in LAYOUTS:
+            raise ValueError(f"Layout de almacenamiento desconocido: {layout}")
         self.db_path = db_path
+        self.profile = profile
+        self.layout = layout
         self._connection = sqlite3.connect(db_path)
         self._connection.row_factory = sqlite3.Row
-        self._ensure_index_table()
+        self._apply_pragmas({**STORAGE_PROFILES[profile], **(pragmas or {})})
+        # Tablas por departamento ya creadas en esta conexión (evita DDL por snapshot).
+        self._known_tables: Set[str] = set()
+        if layout == "single_table":
+            self._ensure_snapshots_table()
+        else:
+            self._ensure_index_table()
+        self._ensure_candidate_votes_table()
 
     def close(self) -> None:
         self._connection.close()
 
+    def pragma(self, name: str) -> Any:
+        """Valor actual de un PRAGMA de la conexión (journal_mode, synchronous, ...)."""
+        return self._connection.execute(f"PRAGMA {name}").fetchone()[0]
+
     def store_snapshot(self, snapshot: Snapshot, previous_hash: Optional[str] = None) -> str:
-        canonical_json = snapshot_to_canonical_json(snapshot)
-        snapshot_hash = compute_hash(canonical_json, previous_hash=previous_hash)
-        department_code = snapshot.meta.department_code
-        table_name = self._department_table_name(department_code)
-        self._ensure_department_table(table_name)
+        snapshot_hash, row, index_row = self._snapshot_rows(snapshot, previous_hash)
+        self._write_rows([(row, index_row)], self._candidate_rows(snapshot))
+        return snapshot_hash
 
-        candidates_json = json.dumps(
-            [candidate.__dict__ for candidate in snapshot.candidates],
-            sort_keys=True,
-            separators=(",", ":"),
-        )
+    def store_snapshots(
+        self,
+        snapshots: Iterable[Snapshot],
+        previous_hashes: Optional[Mapping[str, Optional[str]]] = None,
+    ) -> List[str]:
+        """
+        Guarda un lote de snapshots en una sola transacción.
 
-        totals = snapshot.totals
-        with self._connection:
-            self._connection.execute(
-                f"""
-                INSERT OR REPLACE INTO {table_name} (
-                    timestamp_utc,
-                    hash,
-                    previous_hash,
-                    canonical_json,
-                    registered_voters,
-                    total_votes,
-                    valid_votes,
-                    null_votes,
-                    blank_votes,
-                    candidates_json
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    snapshot.meta.timestamp_utc,
-                    snapshot_hash,
-                    previous_hash,
-                    canonical_json,
-                    totals.registered_voters,
-                    totals.total_votes,
-                    totals.valid_votes,
-                    totals.null_votes,
-                    totals.blank_votes,
-                    candidates_json,
-                ),
-            )
-            self._connection.execute(
-                """
-                INSERT OR REPLACE INTO snapshot_index (
-                    department_code,
-                    timestamp_utc,
-                    table_name,
-                    hash,
-                    previous_hash
-                )
-                VALUES (?, ?, ?, ?, ?)
-                """,
-                (
-                    department_code,
-                    snapshot.meta.timestamp_utc,
-                    table_name,
-                    snapshot_hash,
-                    previous_hash,
-                ),
-            )
+        La cadena se arma por departamento en orden de timestamp_utc y continúa
+        desde `previous_hashes[departamento]` o, si no se indica, desde el último
+        hash guardado. Devuelve los hashes en el orden de entrada.
 
-        return snapshot_hash
+        Sin `previous_hashes` para el departamento, todos sus snapshots deben ser
+        posteriores al último guardado: un backfill enlazaría snapshots viejos
+        después de los nuevos, así que lanza ValueError y no escribe nada. Para
+        un backfill hay que pasar el eslabón anterior explícitamente.
+        """
+        snapshots = list(snapshots)
+        by_department: Dict[str, List[int]] = {}
+        for position, snapshot in enumerate(snapshots):
+            by_department.setdefault(snapshot.meta.department_code, []).append(position)
+
+        hashes: List[Optional[str]] = [None] * len(snapshots)
+        rows: List[Tuple[tuple, tuple]] = []
+        candidate_rows: List[tuple] = []
+        for department_code, positions in by_department.items():
+            positions.sort(key=lambda position: snapshots[position].meta.timestamp_utc)
+            if previous_hashes is not None and department_code in previous_hashes:
+                previous_hash = previous_hashes[department_code]
+            else:
+                previous_hash, head_timestamp = self._chain_head(department_code)
+                oldest = snapshots[positions[0]].meta.timestamp_utc
+                if head_timestamp is not None and oldest <= head_timestamp:
+                    raise ValueError(
+                        f"Snapshot {oldest} del departamento {department_code} no es posterior a la cabeza "
+                        f"de la cadena ({head_timestamp}); para un backfill pasa previous_hashes."
+                    )
+            for position in positions:
+                snapshot_hash, row, index_row = self._snapshot_rows(snapshots[position], previous_hash)
+                rows.append((row, index_row))
+                candidate_rows.extend(self._candidate_rows(snapshots[position]))
+                hashes[position] = snapshot_hash
+                previous_hash = snapshot_hash
+
+        self._write_rows(rows, candidate_rows)
+        return hashes
 
     def get_index_entries(self, department_code: Optional[str] = None) -> List[Dict[str, Any]]:
         if department_code:
             rows = self._connection.execute(
-                """
-                SELECT department_code, timestamp_utc, table_name, hash, previous_hash
-                FROM snapshot_index
+                f"""
+                SELECT {self._index_columns()}
                 WHERE department_code = ?
                 ORDER BY timestamp_utc
                 """,
@@ -98,52 +217,305 @@ class LocalSnapshotStore:
             ).fetchall()
         else:
             rows = self._connection.execute(
-                """
-                SELECT department_code, timestamp_utc, table_name, hash, previous_hash
-                FROM snapshot_index
+                f"""
+                SELECT {self._index_columns()}
                 ORDER BY department_code, timestamp_utc
                 """
             ).fetchall()
 
         return [dict(row) for row in rows]
 
-    def export_department_json(self, department_code: str, output_path: str) -> None:
-        rows = self._fetch_department_rows(department_code)
-        payload = [
-            {
-                "timestamp_utc": row["timestamp_utc"],
-                "hash": row["hash"],
-                "previous_hash": row["previous_hash"],
-                "snapshot": json.loads(row["canonical_json"]),
-            }
-            for row in rows
-        ]
-        Path(output_path).write_text(json.dumps(payload, ensure_ascii=False, indent=2))
-
-    def export_department_csv(self, department_code: str, output_path: str) -> None:
-        rows = self._fetch_department_rows(department_code)
-        fieldnames = [
-            "timestamp_utc",
-            "hash",
-            "previous_hash",
-            "registered_voters",
-            "total_votes",
-            "valid_votes",
-            "null_votes",
-            "blank_votes",
-            "candidates_json",
-            "canonical_json",
-        ]
-        with Path(output_path).open("w", newline="", encoding="utf-8") as csv_file:
-            writer = csv.DictWriter(csv_file, fieldnames=fieldnames)
+    def latest_snapshots(self, department_codes: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """Último snapshot (hash y totales) de cada departamento."""
+        if self.layout != "single_table":
+            return [
+                rows[-1]
+                for rows in self._department_totals(department_codes).values()
+                if rows
+            ]
+        codes_filter, params = _in_filter("department_code", department_codes)
+        # SQLite toma las columnas "bare" de la fila que da el MAX(): una sola
+        # pasada por idx_snapshots_department_time, sin leer la tabla.
+        columns = _totals_select().replace("timestamp_utc", "MAX(timestamp_utc) AS timestamp_utc")
+        rows = self._connection.execute(
+            f"""
+            SELECT {columns}
+            FROM snapshots INDEXED BY idx_snapshots_department_time
+            WHERE {codes_filter}
+            GROUP BY department_code
+            ORDER BY department_code
+            """,
+            params,
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def snapshots_between(
+        self,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        department_codes: Optional[Iterable[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Hashes y totales de todos los departamentos en [start, end], por timestamp."""
+        if self.layout != "single_table":
+            rows = [
+                row
+                for department_rows in self._department_totals(department_codes).values()
+                for row in department_rows
+                if (start is None or row["timestamp_utc"] >= start)
+                and (end is None or row["timestamp_utc"] <= end)
+            ]
+            return sorted(rows, key=lambda row: (row["timestamp_utc"], row["department_code"]))
+
+        codes_filter, params = _in_filter("department_code", department_codes)
+        conditions = [codes_filter]
+        if start is not None:
+            conditions.append("timestamp_utc >= ?")
+            params += (start,)
+        if end is not None:
+            conditions.append("timestamp_utc <= ?")
+            params += (end,)
+        rows = self._connection.execute(
+            f"""
+            SELECT {_totals_select()}
+            FROM snapshots
+            WHERE {" AND ".join(conditions)}
+            ORDER BY timestamp_utc, department_code
+            """,
+            params,
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def export_department_json(
+        self,
+        department_code: str,
+        output_path: str,
+        *,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        compression: Optional[str] = None,
+    ) -> int:
+        """Arreglo JSON (indent=2) escrito elemento por elemento; devuelve las filas exportadas."""
+        count = 0
+        with _open_export(output_path, compression) as handle:
+            for row in self._iter_department_rows(department_code, start, end):
+                item = codec.dumps(_export_item(row), indent=2)
+                handle.write("[\n" if count == 0 else ",\n")
+                handle.write(textwrap.indent(item, "  "))
+                count += 1
+            handle.write("\n]" if count else "[]")
+        return count
+
+    def export_department_jsonl(
+        self,
+        department_code: str,
+        output_path: str,
+        *,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        compression: Optional[str] = None,
+    ) -> int:
+        """JSON Lines: un snapshot por línea, con el mismo contenido que export_department_json."""
+        count = 0
+        with _open_export(output_path, compression) as handle:
+            for row in self._iter_department_rows(department_code, start, end):
+                handle.write(codec.dumps(_export_item(row)))
+                handle.write("\n")
+                count += 1
+        return count
+
+    def export_department_csv(
+        self,
+        department_code: str,
+        output_path: str,
+        *,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        compression: Optional[str] = None,
+    ) -> int:
+        count = 0
+        with _open_export(output_path, compression) as csv_file:
+            writer = csv.DictWriter(csv_file, fieldnames=EXPORT_FIELDNAMES)
             writer.writeheader()
-            for row in rows:
-                writer.writerow({key: row[key] for key in fieldnames})
+            for row in self._iter_department_rows(department_code, start, end):
+                writer.writerow({key: row[key] for key in EXPORT_FIELDNAMES})
+                count += 1
+        return count
 
-    def _fetch_department_rows(self, department_code: str) -> Iterable[sqlite3.Row]:
-        table_name = self._department_table_name(department_code)
-        self._ensure_department_table(table_name)
-        return self._connection.execute(
+    def export_department_parquet(
+        self,
+        department_code: str,
+        output_path: str,
+        *,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        compression: str = "zstd",
+    ) -> int:
+        """Parquet escrito por bloques (un row group por bloque leído del cursor)."""
+        if pa is None:
+            raise RuntimeError("La exportación Parquet requiere pyarrow (pip install pyarrow).")
+        schema = pa.schema([
+            (key, pa.int64() if key in TOTALS_COLUMNS else pa.string())
+            for key in EXPORT_FIELDNAMES
+        ])
+        count = 0
+        with pq.ParquetWriter(output_path, schema, compression=compression) as writer:
+            chunk: List[Dict[str, Any]] = []
+            for row in self._iter_department_rows(department_code, start, end):
+                chunk.append({key: row[key] for key in EXPORT_FIELDNAMES})
+                if len(chunk) >= EXPORT_CHUNK_SIZE:
+                    writer.write_table(pa.Table.from_pylist(chunk, schema=schema))
+                    count += len(chunk)
+                    chunk = []
+            if chunk:
+                writer.write_table(pa.Table.from_pylist(chunk, schema=schema))
+                count += len(chunk)
+        return count
+
+    def candidate_series(
+        self,
+        department_code: str,
+        slot: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Serie de votos por candidato con `previous_votes` y `delta` calculados en SQL."""
+        where = "department_code = ?"
+        params: Tuple[Any, ...] = (department_code,)
+        if slot is not None:
+            where += " AND slot = ?"
+            params += (slot,)
+        rows = self._connection.execute(
+            CANDIDATE_DELTAS_SQL.format(where=where) + " ORDER BY slot, timestamp_utc",
+            params,
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def candidate_vote_rows(
+        self,
+        department_code: str,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> List[Tuple[str, int, int]]:
+        """Tuplas (timestamp_utc, slot, votes) de un departamento en [start, end]; base de VoteMatrix.from_store."""
+        conditions = ["department_code = ?"]
+        params: Tuple[Any, ...] = (department_code,)
+        if start is not None:
+            conditions.append("timestamp_utc >= ?")
+            params += (start,)
+        if end is not None:
+            conditions.append("timestamp_utc <= ?")
+            params += (end,)
+        cursor = self._connection.execute(
+            f"""
+            SELECT timestamp_utc, slot, votes
+            FROM candidate_votes
+            WHERE {" AND ".join(conditions)}
+            ORDER BY slot, timestamp_utc
+            """,
+            params,
+        )
+        # El orden de la PK evita un sort; VoteMatrix reordena por timestamp de todos modos.
+        # Tuplas planas: más livianas que sqlite3.Row con miles de filas.
+        cursor.row_factory = None
+        return cursor.fetchall()
+
+    def candidate_negative_deltas(self, department_codes: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """Snapshots donde un candidato pierde votos respecto al snapshot anterior."""
+        codes_filter, params = _in_filter("department_code", department_codes)
+        rows = self._connection.execute(
+            f"""
+            SELECT * FROM ({CANDIDATE_DELTAS_SQL.format(where=codes_filter)})
+            WHERE delta < 0
+            ORDER BY department_code, timestamp_utc, slot
+            """,
+            params,
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def candidate_first_digit_counts(
+        self,
+        department_code: Optional[str] = None,
+        timestamp_utc: Optional[str] = None,
+    ) -> Dict[int, int]:
+        """Conteo del primer dígito de los votos (> 0) para la prueba de Benford."""
+        conditions = ["votes > 0"]
+        params: Tuple[Any, ...] = ()
+        if department_code is not None:
+            conditions.append("department_code = ?")
+            params += (department_code,)
+        if timestamp_utc is not None:
+            conditions.append("timestamp_utc = ?")
+            params += (timestamp_utc,)
+        rows = self._connection.execute(
+            f"""
+            SELECT CAST(substr(CAST(votes AS TEXT), 1, 1) AS INTEGER) AS digit, COUNT(*) AS count
+            FROM candidate_votes
+            WHERE {" AND ".join(conditions)}
+            GROUP BY digit
+            ORDER BY digit
+            """,
+            params,
+        ).fetchall()
+        return {row["digit"]: row["count"] for row in rows}
+
+    def rebuild_candidate_votes(self) -> int:
+        """
+        Reconstruye candidate_votes desde candidates_json (bases anteriores a la tabla).
+
+        Usa json_each de SQLite, sin pasar cada fila por Python. Devuelve las filas escritas.
+        """
+        if self.layout == "single_table":
+            sources = [(SNAPSHOTS_TABLE, "department_code", ())]
+        else:
+            sources = [
+                (row["table_name"], "?", (row["department_code"],))
+                for row in self._connection.execute(
+                    "SELECT DISTINCT department_code, table_name FROM snapshot_index"
+                ).fetchall()
+            ]
+        written = 0
+        with self._connection:
+            self._connection.execute("DELETE FROM candidate_votes")
+            for table_name, department_expr, params in sources:
+                cursor = self._connection.execute(
+                    f"""
+                    INSERT OR REPLACE INTO candidate_votes (
+                        department_code, timestamp_utc, slot, candidate_id, name, party, votes
+                    )
+                    SELECT
+                        {department_expr},
+                        source.timestamp_utc,
+                        json_extract(candidate.value, '$.slot'),
+                        json_extract(candidate.value, '$.candidate_id'),
+                        json_extract(candidate.value, '$.name'),
+                        json_extract(candidate.value, '$.party'),
+                        json_extract(candidate.value, '$.votes')
+                    FROM {table_name} AS source, json_each(source.candidates_json) AS candidate
+                    """,
+                    params,
+                )
+                written += cursor.rowcount
+        return written
+
+    def _iter_department_rows(
+        self,
+        department_code: str,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> Iterator[sqlite3.Row]:
+        if self.layout == "single_table":
+            table_name, conditions, params = SNAPSHOTS_TABLE, ["department_code = ?"], (department_code,)
+        else:
+            table_name, conditions, params = self._department_table_name(department_code), [], ()
+            self._ensure_department_table(table_name)
+        if start is not None:
+            conditions.append("timestamp_utc >= ?")
+            params += (start,)
+        if end is not None:
+            conditions.append("timestamp_utc <= ?")
+            params += (end,)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        # Cursor propio: otras consultas de la conexión no lo interrumpen.
+        cursor = self._connection.cursor()
+        cursor.execute(
             f"""
             SELECT
                 timestamp_utc,
@@ -157,9 +529,157 @@ class LocalSnapshotStore:
                 blank_votes,
                 candidates_json
             FROM {table_name}
+            {where}
             ORDER BY timestamp_utc
-            """
+            """,
+            params,
+        )
+        try:
+            while True:
+                rows = cursor.fetchmany(EXPORT_CHUNK_SIZE)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            cursor.close()
+
+    def _department_totals(self, department_codes: Optional[Iterable[str]]) -> Dict[str, List[Dict[str, Any]]]:
+        # Layout por departamento: una consulta por tabla dept_XX_snapshots.
+        codes_filter, params = _in_filter("department_code", department_codes)
+        departments = self._connection.execute(
+            f"""
+            SELECT DISTINCT department_code, table_name
+            FROM snapshot_index
+            WHERE {codes_filter}
+            ORDER BY department_code
+            """,
+            params,
         ).fetchall()
+        totals: Dict[str, List[Dict[str, Any]]] = {}
+        for department in departments:
+            rows = self._connection.execute(
+                f"""
+                SELECT ? AS department_code, timestamp_utc, hash, previous_hash, {", ".join(TOTALS_COLUMNS)}
+                FROM {department["table_name"]}
+                ORDER BY timestamp_utc
+                """,
+                (department["department_code"],),
+            ).fetchall()
+            totals[department["department_code"]] = [dict(row) for row in rows]
+        return totals
+
+    def _write_rows(self, rows: List[Tuple[tuple, tuple]], candidate_rows: List[tuple]) -> None:
+        rows_by_table: Dict[str, List[tuple]] = {}
+        if self.layout != "single_table":
+            for row, index_row in rows:
+                rows_by_table.setdefault(index_row[2], []).append(row)
+            for table_name in rows_by_table:
+                self._ensure_department_table(table_name)
+
+        with self._connection:
+            if self.layout == "single_table":
+                self._connection.executemany(
+                    SNAPSHOTS_INSERT_SQL,
+                    [(index_row[0], *row) for row, index_row in rows],
+                )
+            else:
+                for table_name, table_rows in rows_by_table.items():
+                    self._connection.executemany(self._department_insert_sql(table_name), table_rows)
+                self._connection.executemany(INDEX_INSERT_SQL, [index_row for _, index_row in rows])
+            # Un snapshot reemplazado no debe dejar candidatos huérfanos.
+            self._connection.executemany(
+                "DELETE FROM candidate_votes WHERE department_code = ? AND timestamp_utc = ?",
+                [index_row[:2] for _, index_row in rows],
+            )
+            self._connection.executemany(CANDIDATE_VOTES_INSERT_SQL, candidate_rows)
+
+    def _index_columns(self) -> str:
+        if self.layout == "single_table":
+            return f"department_code, timestamp_utc, '{SNAPSHOTS_TABLE}' AS table_name, hash, previous_hash FROM {SNAPSHOTS_TABLE}"
+        return "department_code, timestamp_utc, table_name, hash, previous_hash FROM snapshot_index"
+
+    def _apply_pragmas(self, pragmas: Mapping[str, Any]) -> None:
+        for name, value in pragmas.items():
+            if not name.isidentifier():
+                raise ValueError(f"PRAGMA inválido: {name}")
+            self._connection.execute(f"PRAGMA {name}={value}")
+
+    def _snapshot_rows(self, snapshot: Snapshot, previous_hash: Optional[str]) -> Tuple[str, tuple, tuple]:
+        canonical_json, candidates_json = snapshot_to_canonical_parts(snapshot)
+        snapshot_hash = compute_hash(canonical_json, previous_hash=previous_hash)
+        department_code = snapshot.meta.department_code
+        table_name = self._department_table_name(department_code)
+
+        totals = snapshot.totals
+        row = (
+            snapshot.meta.timestamp_utc,
+            snapshot_hash,
+            previous_hash,
+            canonical_json,
+            totals.registered_voters,
+            totals.total_votes,
+            totals.valid_votes,
+            totals.null_votes,
+            totals.blank_votes,
+            candidates_json,
+        )
+        index_row = (
+            department_code,
+            snapshot.meta.timestamp_utc,
+            table_name,
+            snapshot_hash,
+            previous_hash,
+        )
+        return snapshot_hash, row, index_row
+
+    @staticmethod
+    def _candidate_rows(snapshot: Snapshot) -> List[tuple]:
+        meta = snapshot.meta
+        return [
+            (
+                meta.department_code,
+                meta.timestamp_utc,
+                candidate.slot,
+                candidate.candidate_id,
+                candidate.name,
+                candidate.party,
+                candidate.votes,
+            )
+            for candidate in snapshot.candidates
+        ]
+
+    def _chain_head(self, department_code: str) -> Tuple[Optional[str], Optional[str]]:
+        """(hash, timestamp_utc) del último snapshot guardado del departamento."""
+        table_name = SNAPSHOTS_TABLE if self.layout == "single_table" else "snapshot_index"
+        row = self._connection.execute(
+            f"""
+            SELECT hash, timestamp_utc
+            FROM {table_name}
+            WHERE department_code = ?
+            ORDER BY timestamp_utc DESC
+            LIMIT 1
+            """,
+            (department_code,),
+        ).fetchone()
+        return (row["hash"], row["timestamp_utc"]) if row else (None, None)
+
+    @staticmethod
+    def _department_insert_sql(table_name: str) -> str:
+        return f"""
+            INSERT OR REPLACE INTO {table_name} (
+                timestamp_utc,
+                hash,
+                previous_hash,
+                canonical_json,
+                registered_voters,
+                total_votes,
+                valid_votes,
+                null_votes,
+                blank_votes,
+                candidates_json
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """
 
     def _ensure_index_table(self) -> None:
         self._connection.execute(
@@ -175,7 +695,60 @@ class LocalSnapshotStore:
             """
         )
 
+    def _ensure_snapshots_table(self) -> None:
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS snapshots (
+                department_code TEXT NOT NULL,
+                timestamp_utc TEXT NOT NULL,
+                hash TEXT NOT NULL,
+                previous_hash TEXT,
+                canonical_json TEXT NOT NULL,
+                registered_voters INTEGER NOT NULL,
+                total_votes INTEGER NOT NULL,
+                valid_votes INTEGER NOT NULL,
+                null_votes INTEGER NOT NULL,
+                blank_votes INTEGER NOT NULL,
+                candidates_json TEXT NOT NULL,
+                PRIMARY KEY (department_code, timestamp_utc)
+            )
+            """
+        )
+        # Índices cubrientes: cadena/último por departamento y barridos por rango de
+        # tiempo se resuelven sin leer canonical_json ni candidates_json.
+        covered = f"hash, previous_hash, {', '.join(TOTALS_COLUMNS)}"
+        self._connection.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_snapshots_department_time "
+            f"ON snapshots(department_code, timestamp_utc, {covered})"
+        )
+        self._connection.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_snapshots_time_department "
+            f"ON snapshots(timestamp_utc, department_code, {covered})"
+        )
+
+    def _ensure_candidate_votes_table(self) -> None:
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS candidate_votes (
+                department_code TEXT NOT NULL,
+                timestamp_utc TEXT NOT NULL,
+                slot INTEGER NOT NULL,
+                candidate_id TEXT,
+                name TEXT,
+                party TEXT,
+                votes INTEGER NOT NULL,
+                PRIMARY KEY (department_code, slot, timestamp_utc)
+            )
+            """
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS idx_candidate_votes_time "
+            "ON candidate_votes(timestamp_utc, department_code, slot, votes)"
+        )
+
     def _ensure_department_table(self, table_name: str) -> None:
+        if table_name in self._known_tables:
+            return
         self._connection.execute(
             f"""
             CREATE TABLE IF NOT EXISTS {table_name} (
@@ -195,8 +768,100 @@ class LocalSnapshotStore:
         self._connection.execute(
             f"CREATE INDEX IF NOT EXISTS idx_{table_name}_timestamp ON {table_name}(timestamp_utc)"
         )
+        self._known_tables.add(table_name)
 
     @staticmethod
     def _department_table_name(department_code: str) -> str:
         sanitized = "".join(char for char in department_code if char.isalnum())
         return f"dept_{sanitized}_snapshots"
+
+
+def _export_item(row: sqlite3.Row) -> Dict[str, Any]:
+    return {
+        "timestamp_utc": row["timestamp_utc"],
+        "hash": row["hash"],
+        "previous_hash": row["previous_hash"],
+        "snapshot": codec.loads(row["canonical_json"]),
+    }
+
+
+@contextmanager
+def _open_export(output_path: str, compression: Optional[str]) -> Iterator[IO[str]]:
+    """
+    Abre el archivo de exportación en texto UTF-8, con compresión opcional.
+
+    Sin `compression` se deduce del sufijo (.gz → gzip, .zst → zstd); zstd usa
+    los streams comprimidos de pyarrow.
+    """
+    path = Path(output_path)
+    if compression is None:
+        compression = {".gz": "gzip", ".zst": "zstd"}.get(path.suffix)
+    if compression is not None and compression not in EXPORT_COMPRESSIONS:
+        raise ValueError(f"Compresión de exportación desconocida: {compression}")
+
+    if compression == "gzip":
+        handle: IO[str] = gzip.open(path, "wt", encoding="utf-8", newline="")
+    elif compression == "zstd":
+        if pa is None:
+            raise RuntimeError("La compresión zstd requiere pyarrow (pip install pyarrow).")
+        handle = io.TextIOWrapper(pa.CompressedOutputStream(str(path), "zstd"), encoding="utf-8", newline="")
+    else:
+        handle = path.open("w", encoding="utf-8", newline="")
+    with handle:
+        yield handle
+
+
+def _totals_select() -> str:
+    columns = ("department_code", "timestamp_utc", "hash", "previous_hash") + TOTALS_COLUMNS
+    return ", ".join(columns)
+
+
+def _in_filter(column: str, values: Optional[Iterable[str]]) -> Tuple[str, Tuple[str, ...]]:
+    if values is None:
+        return "1 = 1", ()
+    values = tuple(values)
+    if not values:
+        return "0 = 1", ()
+    return f"{column} IN ({', '.join('?' for _ in values)})", values
+
+
+def migrate_department_tables(db_path: str, drop_legacy: bool = False, profile: str = "default") -> int:
+    """
+    Copia las tablas dept_XX_snapshots (vía snapshot_index) a la tabla única `snapshots`.
+
+    Es idempotente (INSERT OR REPLACE) y corre en una sola transacción; con
+    `drop_legacy` elimina las tablas por departamento y snapshot_index al final.
+    Después reconstruye candidate_votes desde candidates_json. Devuelve el número de snapshots migrados.
+    """
+    store = LocalSnapshotStore(db_path, profile=profile, layout="single_table")
+    connection = store._connection
+    try:
+        has_index = connection.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'snapshot_index'"
+        ).fetchone()
+        if not has_index:
+            return 0
+        departments = connection.execute(
+            "SELECT DISTINCT department_code, table_name FROM snapshot_index ORDER BY department_code"
+        ).fetchall()
+        columns = f"timestamp_utc, hash, previous_hash, canonical_json, {', '.join(TOTALS_COLUMNS)}, candidates_json"
+        migrated = 0
+        with connection:
+            for department in departments:
+                cursor = connection.execute(
+                    f"""
+                    INSERT OR REPLACE INTO snapshots (department_code, {columns})
+                    SELECT ?, {columns}
+                    FROM {department["table_name"]}
+                    """,
+                    (department["department_code"],),
+                )
+                migrated += cursor.rowcount
+            if drop_legacy:
+                for table_name in sorted({department["table_name"] for department in departments}):
+                    connection.execute(f"DROP TABLE IF EXISTS {table_name}")
+                connection.execute("DROP TABLE snapshot_index")
+        store.rebuild_candidate_votes()
+        return migrated
+    finally:
+        store.close()
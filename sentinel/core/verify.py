@@ -0,0 +1,264 @@
+import json
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sentinel.core.hashchain import compute_hash
+
+CHECKPOINTS_VERSION = 1
+
+
+@dataclass(frozen=True)
+class ChainBreak:
+    chain: str
+    position: int
+    timestamp_utc: Optional[str]
+    reason: str
+    expected: Optional[str] = None
+    found: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class ChainResult:
+    chain: str
+    length: int
+    verified: int
+    head: Optional[str]
+    head_timestamp: Optional[str]
+    resumed_from: Optional[int]
+    broken: Optional[ChainBreak] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.broken is None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def verify_links(
+    chain: str,
+    links: Iterable[Tuple[Optional[str], Optional[str], str, Optional[str]]],
+    start_position: int = 0,
+    previous_hash: Optional[str] = None,
+    previous_timestamp: Optional[str] = None,
+) -> ChainResult:
+    """
+    Verifica eslabones (timestamp_utc, canonical_json, hash, previous_hash) en orden.
+
+    Cada eslabón debe estar en JSON canónico, apuntar al hash anterior y producir
+    su propio hash; se detiene en el primer eslabón roto e informa su posición.
+    `canonical_json=None` indica un snapshot ausente.
+    """
+    position = start_position
+    head, head_timestamp = previous_hash, previous_timestamp
+    broken = None
+    for timestamp_utc, canonical_json, stored_hash, stored_previous in links:
+        broken = _check_link(chain, position, timestamp_utc, canonical_json, stored_hash, stored_previous, head)
+        if broken is not None:
+            break
+        head, head_timestamp = stored_hash, timestamp_utc
+        position += 1
+    return ChainResult(
+        chain=chain,
+        length=position,
+        verified=position - start_position,
+        head=head,
+        head_timestamp=head_timestamp,
+        resumed_from=start_position or None,
+        broken=broken,
+    )
+
+
+def _check_link(
+    chain: str,
+    position: int,
+    timestamp_utc: Optional[str],
+    canonical_json: Optional[str],
+    stored_hash: str,
+    stored_previous: Optional[str],
+    expected_previous: Optional[str],
+) -> Optional[ChainBreak]:
+    if (stored_previous or None) != expected_previous:
+        return ChainBreak(chain, position, timestamp_utc, "previous_mismatch", expected_previous, stored_previous)
+    if canonical_json is None:
+        return ChainBreak(chain, position, timestamp_utc, "missing_snapshot")
+    try:
+        recanonical = json.dumps(json.loads(canonical_json), sort_keys=True, separators=(",", ":"))
+    except json.JSONDecodeError:
+        return ChainBreak(chain, position, timestamp_utc, "invalid_json")
+    if recanonical != canonical_json:
+        return ChainBreak(chain, position, timestamp_utc, "not_canonical")
+    computed = compute_hash(canonical_json, expected_previous)
+    if computed != stored_hash:
+        return ChainBreak(chain, position, timestamp_utc, "hash_mismatch", computed, stored_hash)
+    return None
+
+
+def load_checkpoints(path: Path) -> Dict[str, Dict[str, Any]]:
+    if not path.exists():
+        return {}
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if payload.get("version") != CHECKPOINTS_VERSION:
+        return {}
+    return payload.get("chains", {})
+
+
+def save_checkpoints(path: Path, checkpoints: Dict[str, Dict[str, Any]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    tmp_path.write_text(
+        json.dumps({"version": CHECKPOINTS_VERSION, "chains": checkpoints}, indent=2, sort_keys=True),
+        encoding="utf-8",
+    )
+    os.replace(tmp_path, path)
+
+
+def default_checkpoints_path(db_path: str) -> Path:
+    return Path(f"{db_path}.verified.json")
+
+
+def verify_store(
+    db_path: str,
+    department_codes: Optional[Iterable[str]] = None,
+    checkpoints_path: Optional[Path] = None,
+    workers: Optional[int] = None,
+    full: bool = False,
+) -> Dict[str, ChainResult]:
+    """
+    Verifica las cadenas por departamento de una base LocalSnapshotStore.
+
+    Cada departamento se verifica en un proceso aparte. Los checkpoints guardan
+    el último eslabón verificado de cada cadena íntegra; la siguiente corrida solo
+    re-hashea los eslabones nuevos (salvo `full=True` o si el checkpoint ya no
+    coincide con la base, en cuyo caso se verifica desde el inicio).
+    """
+    checkpoints_path = checkpoints_path or default_checkpoints_path(db_path)
+    checkpoints = {} if full else load_checkpoints(checkpoints_path)
+
+    with closing(_connect_read_only(db_path)) as connection:
+        layout = _detect_layout(connection)
+        departments = _list_departments(connection, layout)
+    if department_codes is not None:
+        selected = set(department_codes)
+        departments = [item for item in departments if item[0] in selected]
+
+    jobs = [(db_path, layout, code, table_name, checkpoints.get(code)) for code, table_name in departments]
+    if workers == 1 or len(jobs) <= 1:
+        results = [_verify_department(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_verify_department, *zip(*jobs)))
+
+    for result in results:
+        if result.ok and result.head is not None:
+            checkpoints[result.chain] = {
+                "length": result.length,
+                "hash": result.head,
+                "timestamp_utc": result.head_timestamp,
+            }
+    save_checkpoints(checkpoints_path, checkpoints)
+    return {result.chain: result for result in results}
+
+
+def _connect_read_only(db_path: str) -> sqlite3.Connection:
+    connection = sqlite3.connect(f"{Path(db_path).resolve().as_uri()}?mode=ro", uri=True)
+    connection.row_factory = sqlite3.Row
+    return connection
+
+
+def _detect_layout(connection: sqlite3.Connection) -> str:
+    tables = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    return "single_table" if "snapshots" in tables else "department_tables"
+
+
+def _list_departments(connection: sqlite3.Connection, layout: str) -> List[Tuple[str, str]]:
+    if layout == "single_table":
+        rows = connection.execute("SELECT DISTINCT department_code FROM snapshots ORDER BY department_code")
+        return [(row[0], "snapshots") for row in rows]
+    rows = connection.execute(
+        "SELECT DISTINCT department_code, table_name FROM snapshot_index ORDER BY department_code"
+    )
+    return [(row[0], row[1]) for row in rows]
+
+
+def _verify_department(
+    db_path: str,
+    layout: str,
+    department_code: str,
+    table_name: str,
+    checkpoint: Optional[Dict[str, Any]],
+) -> ChainResult:
+    if layout == "single_table":
+        scope, scope_params = "department_code = ?", (department_code,)
+    else:
+        scope, scope_params = "1 = 1", ()
+
+    with closing(_connect_read_only(db_path)) as connection:
+        start_position, previous_hash, previous_timestamp = 0, None, None
+        if checkpoint and _checkpoint_holds(connection, table_name, scope, scope_params, checkpoint):
+            start_position = checkpoint["length"]
+            previous_hash = checkpoint["hash"]
+            previous_timestamp = checkpoint["timestamp_utc"]
+
+        conditions, params = [scope], scope_params
+        if previous_timestamp is not None:
+            conditions.append("timestamp_utc > ?")
+            params += (previous_timestamp,)
+        cursor = connection.execute(
+            f"""
+            SELECT timestamp_utc, canonical_json, hash, previous_hash
+            FROM {table_name}
+            WHERE {" AND ".join(conditions)}
+            ORDER BY timestamp_utc
+            """,
+            params,
+        )
+        links = (tuple(row) for row in cursor)
+        return verify_links(department_code, links, start_position, previous_hash, previous_timestamp)
+
+
+def _checkpoint_holds(
+    connection: sqlite3.Connection,
+    table_name: str,
+    scope: str,
+    scope_params: Tuple[Any, ...],
+    checkpoint: Dict[str, Any],
+) -> bool:
+    # El eslabón del checkpoint debe seguir igual y sin filas insertadas antes de él.
+    row = connection.execute(
+        f"""
+        SELECT hash, (SELECT COUNT(*) FROM {table_name} WHERE {scope} AND timestamp_utc <= ?) AS length
+        FROM {table_name}
+        WHERE {scope} AND timestamp_utc = ?
+        """,
+        (*scope_params, checkpoint["timestamp_utc"], *scope_params, checkpoint["timestamp_utc"]),
+    ).fetchone()
+    return bool(row) and row["hash"] == checkpoint["hash"] and row["length"] == checkpoint["length"]
+
+
+def verify_hashchain_file(output_dir: Path) -> ChainResult:
+    """
+    Verifica hashchain.json + normalized/*.json generados por `cli.py run`.
+
+    En esta cadena el campo timestamp_utc de un ChainBreak lleva el nombre del snapshot.
+    """
+    entries = json.loads((output_dir / "hashchain.json").read_text(encoding="utf-8"))
+    normalized_dir = output_dir / "normalized"
+
+    def read_normalized(name: str) -> Optional[str]:
+        path = normalized_dir / f"{name}.json"
+        return path.read_text(encoding="utf-8").rstrip("\n") if path.exists() else None
+
+    links = (
+        (entry["snapshot"], read_normalized(entry["snapshot"]), entry["hash"], entry["previous_hash"])
+        for entry in entries
+    )
+    return verify_links("pipeline", links)
@@ -0,0 +1,254 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+
+from sentinel.core.models import Snapshot
+from sentinel.utils import codec
+
+TIMESTAMP_DTYPE = "datetime64[us]"
+
+
+def _to_datetime64(values: Iterable[Any]) -> np.ndarray:
+    # ISO 8601 con zona ("...Z", "+00:00") → UTC sin zona, que es lo que guarda datetime64.
+    parsed = []
+    for value in values:
+        moment = value if isinstance(value, datetime) else datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        if moment.tzinfo is not None:
+            moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+        parsed.append(moment)
+    return np.array(parsed, dtype=TIMESTAMP_DTYPE)
+
+
+def _format_timestamps(timestamps: np.ndarray) -> List[str]:
+    whole_seconds = not (timestamps.astype(np.int64) % 1_000_000).any()
+    return np.datetime_as_string(timestamps, unit="s" if whole_seconds else "us", timezone="UTC").tolist()
+
+
+@dataclass(frozen=True, eq=False)
+class VoteMatrix:
+    """
+    Votos por candidato de un departamento como matriz int64 (snapshots × slots).
+
+    `timestamps` (datetime64[us], UTC, ascendente) indexa las filas y `slots` las
+    columnas. Una celda sin dato (el candidato no aparece en ese snapshot) vale 0
+    en `votes` y False en `present`.
+    """
+
+    department_code: str
+    timestamps: np.ndarray
+    slots: np.ndarray
+    votes: np.ndarray
+    present: np.ndarray
+
+    @classmethod
+    def from_columns(
+        cls,
+        department_code: str,
+        timestamps: Any,
+        slots: Any,
+        votes: Any,
+    ) -> "VoteMatrix":
+        """Construye la matriz desde tres columnas paralelas (una fila por snapshot y slot)."""
+        if not (isinstance(timestamps, np.ndarray) and timestamps.dtype.kind == "M"):
+            # Se parsea cada texto distinto una sola vez (uno por snapshot, no por celda).
+            labels: Dict[Any, int] = {}
+            positions = [labels.setdefault(value, len(labels)) for value in timestamps]
+            timestamps = _to_datetime64(labels)[np.asarray(positions, dtype=np.int64)]
+        index, rows = np.unique(timestamps.astype(TIMESTAMP_DTYPE), return_inverse=True)
+        slot_index, columns = np.unique(np.asarray(slots, dtype=np.int64), return_inverse=True)
+        matrix = np.zeros((len(index), len(slot_index)), dtype=np.int64)
+        present = np.zeros(matrix.shape, dtype=bool)
+        matrix[rows, columns] = np.asarray(votes, dtype=np.int64)
+        present[rows, columns] = True
+        return cls(department_code, index, slot_index, matrix, present)
+
+    @classmethod
+    def from_snapshots(cls, snapshots: Iterable[Snapshot]) -> "VoteMatrix":
+        """Snapshots normalizados de un mismo departamento, en cualquier orden."""
+        department_code = None
+        timestamps: List[str] = []
+        slots: List[int] = []
+        votes: List[int] = []
+        for snapshot in snapshots:
+            code = snapshot.meta.department_code
+            if department_code is None:
+                department_code = code
+            elif code != department_code:
+                raise ValueError(f"VoteMatrix es por departamento: {department_code} y {code} mezclados.")
+            for candidate in snapshot.candidates:
+                timestamps.append(snapshot.meta.timestamp_utc)
+                slots.append(candidate.slot)
+                votes.append(candidate.votes)
+        if department_code is None:
+            raise ValueError("VoteMatrix necesita al menos un snapshot.")
+        return cls.from_columns(department_code, timestamps, slots, votes)
+
+    @classmethod
+    def from_json(cls, sources: Iterable[Union[str, Path, Dict[str, Any]]]) -> "VoteMatrix":
+        """
+        JSON normalizados (normalized/*.json de `cli.py run` o canonical_json del store).
+
+        Acepta rutas o dicts ya decodificados; los JSON crudos del CNE pasan antes
+        por normalize_snapshot o SnapshotDecoder y luego por from_snapshots.
+        """
+        department_code = None
+        timestamps: List[str] = []
+        slots: List[int] = []
+        votes: List[int] = []
+        for source in sources:
+            payload = source if isinstance(source, dict) else codec.load_path(source)
+            meta = payload["meta"]
+            if department_code is None:
+                department_code = meta["department_code"]
+            elif meta["department_code"] != department_code:
+                raise ValueError(
+                    f"VoteMatrix es por departamento: {department_code} y {meta['department_code']} mezclados."
+                )
+            for candidate in payload["candidates"]:
+                timestamps.append(meta["timestamp_utc"])
+                slots.append(candidate["slot"])
+                votes.append(candidate["votes"])
+        if department_code is None:
+            raise ValueError("VoteMatrix necesita al menos un snapshot.")
+        return cls.from_columns(department_code, timestamps, slots, votes)
+
+    @classmethod
+    def from_store(
+        cls,
+        store: Any,
+        department_code: str,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+    ) -> "VoteMatrix":
+        """Desde la tabla candidate_votes de un LocalSnapshotStore, sin decodificar JSON."""
+        rows = store.candidate_vote_rows(department_code, start=start, end=end)
+        if not rows:
+            return cls.from_columns(department_code, np.array([], dtype=TIMESTAMP_DTYPE), [], [])
+        return cls.from_columns(
+            department_code,
+            [row[0] for row in rows],
+            [row[1] for row in rows],
+            [row[2] for row in rows],
+        )
+
+    @classmethod
+    def from_parquet(
+        cls,
+        store: Any,
+        department_code: str,
+        start: Any = None,
+        end: Any = None,
+    ) -> "VoteMatrix":
+        """Desde la tabla `candidates` de un ColumnarSnapshotStore (columnas Arrow → NumPy sin copia por fila)."""
+        table = store.read(
+            "candidates",
+            columns=["timestamp_utc", "slot", "votes"],
+            start=start,
+            end=end,
+            department_codes=[department_code],
+        )
+        return cls.from_columns(
+            department_code,
+            table.column("timestamp_utc").to_numpy(),
+            table.column("slot").to_numpy(),
+            table.column("votes").to_numpy(),
+        )
+
+    @property
+    def shape(self) -> tuple:
+        return self.votes.shape
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def column(self, slot: int) -> np.ndarray:
+        """Serie de votos de un slot."""
+        position = np.searchsorted(self.slots, slot)
+        if position == len(self.slots) or self.slots[position] != slot:
+            raise KeyError(f"Slot sin datos en la matriz: {slot}")
+        return self.votes[:, position]
+
+    def between(self, start: Any = None, end: Any = None) -> "VoteMatrix":
+        """Filas con timestamp en [start, end]; el índice ordenado permite cortar sin copiar."""
+        first = 0 if start is None else np.searchsorted(self.timestamps, _to_datetime64([start])[0], side="left")
+        last = len(self) if end is None else np.searchsorted(self.timestamps, _to_datetime64([end])[0], side="right")
+        return VoteMatrix(
+            self.department_code,
+            self.timestamps[first:last],
+            self.slots,
+            self.votes[first:last],
+            self.present[first:last],
+        )
+
+    def totals(self) -> np.ndarray:
+        """Suma de votos de candidatos por snapshot."""
+        return self.votes.sum(axis=1)
+
+    def deltas(self) -> np.ndarray:
+        """Diferencia con el snapshot anterior; la primera fila es 0. Celdas sin dato cuentan como 0."""
+        return np.diff(self.votes, axis=0, prepend=self.votes[:1])
+
+    def peaks(self) -> np.ndarray:
+        """Máximo acumulado de cada candidato hasta cada snapshot (incluido)."""
+        return np.maximum.accumulate(self.votes, axis=0)
+
+    def negative_deltas(self, from_peak: bool = False) -> np.ndarray:
+        """
+        Máscara (snapshots × slots) de pérdidas de votos.
+
+        Por defecto compara con el snapshot anterior, como candidate_negative_deltas
+        del store; con `from_peak=True` compara con el máximo previo del candidato,
+        como la regla negative_delta de analyze_rules. Que un candidato deje de
+        aparecer no cuenta como pérdida.
+        """
+        mask = np.zeros(self.votes.shape, dtype=bool)
+        if len(self) < 2:
+            return mask
+        reference = self.peaks()[:-1] if from_peak else self.votes[:-1]
+        seen = np.logical_or.accumulate(self.present, axis=0)[:-1] if from_peak else self.present[:-1]
+        mask[1:] = self.present[1:] & seen & (self.votes[1:] < reference)
+        return mask
+
+    def shares(self) -> np.ndarray:
+        """Proporción de cada candidato sobre los votos de candidatos del snapshot (0 si la fila suma 0)."""
+        totals = self.totals()[:, np.newaxis]
+        return np.divide(self.votes, totals, out=np.zeros(self.votes.shape), where=totals != 0)
+
+    def negative_delta_rows(self, from_peak: bool = False) -> List[Dict[str, Any]]:
+        """negative_deltas como filas (mismas claves que candidate_negative_deltas del store)."""
+        mask = self.negative_deltas(from_peak=from_peak)
+        rows, columns = np.nonzero(mask)
+        reference = self.peaks() if from_peak else self.votes
+        previous = reference[rows - 1, columns]
+        current = self.votes[rows, columns]
+        timestamps = _format_timestamps(self.timestamps[rows])
+        return [
+            {
+                "department_code": self.department_code,
+                "timestamp_utc": timestamp,
+                "slot": int(slot),
+                "votes": int(votes),
+                "previous_votes": int(previous_votes),
+                "delta": int(votes - previous_votes),
+            }
+            for timestamp, slot, votes, previous_votes in zip(
+                timestamps, self.slots[columns], current, previous
+            )
+        ]
+
+    def timestamp_strings(self) -> List[str]:
+        return _format_timestamps(self.timestamps)
+
+
+def vote_matrices(snapshots: Iterable[Snapshot], department_codes: Optional[Sequence[str]] = None) -> Dict[str, VoteMatrix]:
+    """Una VoteMatrix por departamento para una secuencia mixta de snapshots."""
+    selected = set(department_codes) if department_codes is not None else None
+    grouped: Dict[str, List[Snapshot]] = {}
+    for snapshot in snapshots:
+        code = snapshot.meta.department_code
+        if selected is None or code in selected:
+            grouped.setdefault(code, []).append(snapshot)
+    return {code: VoteMatrix.from_snapshots(items) for code, items in sorted(grouped.items())}
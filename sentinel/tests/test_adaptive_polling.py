@@ -0,0 +1,96 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip("apscheduler")
+
+from scripts import run_pipeline
+
+CADENCE = {"floor_seconds": 60.0, "ceiling_seconds": 600.0, "backoff_factor": 2.0}
+
+
+def test_next_interval_backs_off_and_resets():
+    interval = None
+    observed = []
+    for changed in [True, False, False, False, False, False, True]:
+        interval = run_pipeline.next_interval(interval, changed, CADENCE)
+        observed.append(interval)
+
+    assert observed == [60.0, 120.0, 240.0, 480.0, 600.0, 600.0, 60.0]
+
+
+def test_update_source_cadence_uses_content_hash():
+    now = datetime(2025, 12, 3, 17, 0, tzinfo=timezone.utc)
+    state = {}
+
+    assert run_pipeline.update_source_cadence(state, "08", "hash-a", CADENCE, now) is True
+    assert run_pipeline.update_source_cadence(state, "08", "hash-a", CADENCE, now) is False
+
+    entry = state["sources"]["08"]
+    assert entry["last_content_hash"] == "hash-a"
+    assert entry["interval_seconds"] == 120.0
+    assert entry["next_run_at"] == (now + timedelta(seconds=120)).isoformat()
+
+
+def test_due_sources_and_per_source_overrides(tmp_path):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(
+        "polling:\n"
+        "  mode: adaptive\n"
+        "  floor_seconds: 120\n"
+        "  ceiling_seconds: 900\n"
+        "  per_source:\n"
+        "    NACIONAL: {floor_seconds: 30}\n"
+        "sources:\n"
+        "  - {name: Nacional, source_id: NACIONAL}\n"
+        "  - {name: Atlántida, department_code: '01'}\n",
+        encoding="utf-8",
+    )
+    polling = run_pipeline.load_polling_config(config_path)
+    now = datetime(2025, 12, 3, 17, 0, tzinfo=timezone.utc)
+    state = {"sources": {"01": {"next_run_at": (now + timedelta(minutes=5)).isoformat()}}}
+
+    assert polling["mode"] == "adaptive"
+    assert polling["sources"]["NACIONAL"]["floor_seconds"] == 30
+    assert polling["sources"]["01"]["file_key"] == "01"
+    assert run_pipeline.due_sources(state, polling, now) == ["NACIONAL"]
+
+
+def test_adaptive_tick_backs_off_when_only_fetch_metadata_changes(tmp_path, monkeypatch):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(
+        "polling: {floor_seconds: 60, ceiling_seconds: 600}\n"
+        "sources:\n"
+        "  - {name: Francisco Morazán, department_code: '08'}\n",
+        encoding="utf-8",
+    )
+    polling = run_pipeline.load_polling_config(config_path)
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    monkeypatch.setattr(run_pipeline, "DATA_DIR", data_dir)
+    monkeypatch.setattr(run_pipeline, "STATE_PATH", data_dir / "pipeline_state.json")
+
+    clock = [datetime(2025, 12, 3, 17, 0, tzinfo=timezone.utc)]
+    monkeypatch.setattr(run_pipeline, "utcnow", lambda: clock[0])
+
+    def fake_pipeline(source_ids=None, stages=None):
+        # Cada descarga escribe un archivo nuevo: mismo `data`, otro timestamp de descarga.
+        stamp = clock[0].isoformat()
+        snapshot = {
+            "metadata": {"department_code": "08", "timestamp_utc": stamp},
+            "data": {"resultados": {"1": 100, "2": 50}},
+        }
+        path = data_dir / f"snapshot_08_{stamp.replace(':', '-')}.json"
+        path.write_text(json.dumps(snapshot), encoding="utf-8")
+
+    monkeypatch.setattr(run_pipeline, "run_pipeline", fake_pipeline)
+
+    intervals = []
+    for _ in range(3):
+        run_pipeline.run_adaptive_tick(polling=polling)
+        entry = run_pipeline.load_state()["sources"]["08"]
+        intervals.append(entry["interval_seconds"])
+        clock[0] = datetime.fromisoformat(entry["next_run_at"])
+
+    assert intervals == [60.0, 120.0, 240.0]
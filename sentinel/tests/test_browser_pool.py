@@ -0,0 +1,126 @@
+import threading
+
+import pytest
+
+pytest.importorskip("playwright")
+
+from sentinel.core import scraping
+
+
+class _FakeResponse:
+    def __init__(self, url):
+        self.url = url
+
+    def json(self):
+        return {"url": self.url}
+
+
+class _FakePage:
+    def goto(self, url, **kwargs):
+        return _FakeResponse(url)
+
+    def add_init_script(self, script):
+        pass
+
+    def close(self):
+        pass
+
+
+class _FakeContext:
+    def __init__(self, stats):
+        self.stats = stats
+        stats["contexts"] += 1
+
+    def new_page(self):
+        self.stats["pages"] += 1
+        return _FakePage()
+
+    def close(self):
+        self.stats["contexts_closed"] += 1
+
+
+class _FakeBrowser:
+    def __init__(self, stats):
+        self.stats = stats
+        self.connected = True
+
+    def new_context(self, **kwargs):
+        return _FakeContext(self.stats)
+
+    def is_connected(self):
+        return self.connected
+
+    def close(self):
+        self.connected = False
+
+
+@pytest.fixture
+def fake_playwright(monkeypatch):
+    stats = {"launches": 0, "contexts": 0, "contexts_closed": 0, "pages": 0, "browsers": []}
+    lock = threading.Lock()
+
+    class _Chromium:
+        def launch(self, **kwargs):
+            with lock:
+                stats["launches"] += 1
+                browser = _FakeBrowser(stats)
+                stats["browsers"].append(browser)
+            return browser
+
+    class _Playwright:
+        chromium = _Chromium()
+
+        def start(self):
+            return self
+
+        def stop(self):
+            pass
+
+    monkeypatch.setattr(scraping, "sync_playwright", lambda: _Playwright())
+    return stats
+
+
+def test_pool_reuses_warm_browser_and_recycles_contexts(fake_playwright):
+    pool = scraping.BrowserPool(size=1, max_pages_per_context=3)
+    try:
+        payloads = [
+            scraping.fetch_payload_with_playwright(
+                "https://cne.test/api", {"dept": f"{idx:02d}"}, 5, {}, pool=pool
+            )
+            for idx in range(1, 8)
+        ]
+    finally:
+        pool.close()
+
+    assert payloads[0]["url"].endswith("dept=01")
+    assert fake_playwright["launches"] == 1
+    assert fake_playwright["pages"] == 7
+    assert fake_playwright["contexts"] == 3
+
+
+def test_pool_relaunches_disconnected_browser(fake_playwright):
+    pool = scraping.BrowserPool(size=1, max_pages_per_context=50)
+    try:
+        pool.fetch("https://cne.test/api", {"dept": "01"}, 5, {})
+        fake_playwright["browsers"][0].connected = False
+        pool.fetch("https://cne.test/api", {"dept": "02"}, 5, {})
+    finally:
+        pool.close()
+
+    assert fake_playwright["launches"] == 2
+
+
+def test_pool_size_caps_browsers(fake_playwright):
+    pool = scraping.BrowserPool(size=2)
+    threads = [
+        threading.Thread(target=pool.fetch, args=("https://cne.test/api", {"dept": "01"}, 5, {}))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    pool.close()
+
+    assert fake_playwright["launches"] <= 2
+    assert fake_playwright["pages"] == 8
@@ -0,0 +1,101 @@
+import json
+import random
+from dataclasses import asdict
+
+import pytest
+
+from sentinel.core.models import CandidateResult, Meta, Snapshot, Totals
+from sentinel.core.normalyze import (
+    normalize_snapshot,
+    snapshot_to_canonical_json,
+    snapshot_to_canonical_parts,
+)
+
+
+def _legacy_canonical_json(snapshot):
+    payload = {
+        "meta": asdict(snapshot.meta),
+        "totals": asdict(snapshot.totals),
+        "candidates": [asdict(c) for c in snapshot.candidates],
+    }
+    return json.dumps(payload, sort_keys=True, separators=(",", ":"))
+
+
+def _legacy_candidates_json(snapshot):
+    return json.dumps(
+        [asdict(candidate) for candidate in snapshot.candidates],
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+
+
+def _snapshot(candidates, department_code="08", timestamp_utc="2025-12-03T17:00:00Z", **totals):
+    return Snapshot(
+        meta=Meta("HN-PRESIDENTIAL", 2025, "CNE", "DEPARTMENT", department_code, timestamp_utc),
+        totals=Totals(
+            registered_voters=totals.get("registered_voters", 1200),
+            total_votes=totals.get("total_votes", 1000),
+            valid_votes=totals.get("valid_votes", 950),
+            null_votes=totals.get("null_votes", 30),
+            blank_votes=totals.get("blank_votes", 20),
+        ),
+        candidates=candidates,
+    )
+
+
+SNAPSHOTS = {
+    "empty_candidates": _snapshot([]),
+    "slots_only": normalize_snapshot(
+        {"total_votes": 100, "candidates": {"1": 40, "2": "30"}}, "Francisco Morazán", "2025-12-03T17:00:00Z"
+    ),
+    "non_ascii_names": _snapshot([
+        CandidateResult(1, 600, "7", "Señora Ñúñez", "Partido Liberal de Honduras"),
+        CandidateResult(2, 350, None, "Émile \"el 'Zorro'\"", None),
+    ], department_code="05"),
+    "escapes_and_emoji": _snapshot([
+        CandidateResult(1, 1, "a\\b", "tab\there\nnew line\x00", "🇭🇳 Partido"),
+    ]),
+    "big_and_negative_ints": _snapshot(
+        [CandidateResult(1, -5), CandidateResult(2, 10**30)],
+        registered_voters=0,
+        total_votes=2**63,
+    ),
+    "non_int_values": _snapshot(
+        [CandidateResult(1, 12.5), CandidateResult(True, 3, 9, ["x"], {"b": 1, "a": None})],
+        total_votes=float("nan"),
+    ),
+}
+
+
+@pytest.mark.parametrize("name", sorted(SNAPSHOTS))
+def test_canonical_parts_match_legacy_bytes(name):
+    snapshot = SNAPSHOTS[name]
+
+    canonical_json, candidates_json = snapshot_to_canonical_parts(snapshot)
+
+    assert canonical_json == _legacy_canonical_json(snapshot)
+    assert candidates_json == _legacy_candidates_json(snapshot)
+    assert snapshot_to_canonical_json(snapshot) == canonical_json
+
+
+def test_canonical_parts_match_legacy_on_random_payloads():
+    rng = random.Random(2029)
+    alphabet = "abcñÁé \"\\/\n\té中😀"
+    for _ in range(200):
+        candidates = [
+            {
+                "posicion": slot,
+                "votos": str(rng.randint(0, 10**7)),
+                "candidato": "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 12))),
+                "partido": rng.choice([None, "Partido Nacional", "Libre"]),
+                "id": rng.choice([None, slot, f"c-{slot}"]),
+            }
+            for slot in range(1, rng.randint(1, 12))
+        ]
+        raw = {"total_votes": rng.randint(0, 10**6), "candidatos": candidates}
+        snapshot = normalize_snapshot(raw, rng.choice(["Yoro", "Copán", "Nacional"]), "2025-12-03T17:05:00Z")
+
+        assert snapshot_to_canonical_parts(snapshot) == (
+            _legacy_canonical_json(snapshot),
+            _legacy_candidates_json(snapshot),
+        )
@@ -0,0 +1,58 @@
+import json
+import os
+
+import pytest
+
+pytest.importorskip("requests")
+
+from scripts import download_and_hash
+
+
+@pytest.fixture
+def hash_dirs(tmp_path, monkeypatch):
+    for name in ("data_dir", "hash_dir"):
+        directory = tmp_path / name
+        directory.mkdir()
+        monkeypatch.setattr(download_and_hash, name, directory)
+    return tmp_path
+
+
+def _persist(department_code, timestamp_utc, canonical_json):
+    snapshot = {"metadata": {"timestamp_utc": timestamp_utc}, "data": {}}
+    return download_and_hash.persist_snapshot(
+        snapshot,
+        canonical_json,
+        department_code,
+        timestamp_utc.replace(":", "-"),
+        department_code,
+    )
+
+
+def test_persist_snapshot_chains_through_head_index(hash_dirs):
+    first = _persist("01", "2025-12-03T17:00:00+00:00", '{"v":1}')
+    second = _persist("01", "2025-12-03T17:05:00.250000+00:00", '{"v":2}')
+    other = _persist("02", "2025-12-03T17:05:00+00:00", '{"v":3}')
+
+    assert second == download_and_hash.compute_hash('{"v":2}', first)
+    heads = download_and_hash.load_chain_heads()
+    assert heads["01"] == {
+        "hash": second,
+        "timestamp_utc": "2025-12-03T17:05:00.250000+00:00",
+        "hash_file": "snapshot_01_2025-12-03T17-05-00.250000+00-00.sha256",
+    }
+    assert download_and_hash.get_previous_hash("02") == other
+    assert download_and_hash.get_previous_hash("03") is None
+
+
+def test_rebuild_uses_file_timestamps_not_mtime(hash_dirs):
+    first = _persist("01", "2025-12-03T17:00:00+00:00", '{"v":1}')
+    second = _persist("01", "2025-12-03T18:00:00+00:00", '{"v":2}')
+    # Una copia/restauración puede dejar el mtime del archivo viejo como el más reciente.
+    old_file = hash_dirs / "hash_dir" / "snapshot_01_2025-12-03T17-00-00+00-00.sha256"
+    os.utime(old_file, (4_000_000_000, 4_000_000_000))
+    download_and_hash.chain_heads_path().unlink()
+
+    assert download_and_hash.get_previous_hash("01") == second
+    rebuilt = json.loads(download_and_hash.chain_heads_path().read_text(encoding="utf-8"))
+    assert rebuilt["heads"]["01"]["hash"] == second
+    assert first != second
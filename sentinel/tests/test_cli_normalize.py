@@ -0,0 +1,86 @@
+import argparse
+import json
+import shutil
+
+from scripts import cli
+
+
+def _write_inputs(data_dir, count):
+    data_dir.mkdir()
+    for index in range(count):
+        payload = {
+            "timestamp": f"2025-12-03T{index // 60:02d}:{index % 60:02d}:00Z",
+            "total_votes": 1000 + index,
+            # En el índice 5 el candidato 1 pierde votos: una anomalía NEGATIVE_DELTA.
+            "candidates": [{"id": slot, "votos": 100 * slot + index - 50 * (index == 5 and slot == 1)} for slot in range(1, 4)],
+        }
+        (data_dir / f"snapshot_{index:04d}.json").write_text(json.dumps(payload), encoding="utf-8")
+
+
+def test_iter_normalized_preserves_order_across_workers(tmp_path):
+    data_dir = tmp_path / "data"
+    _write_inputs(data_dir, 70)
+    expected = cli.normalize_snapshots(cli.load_snapshots(data_dir), "Yoro", 2025)
+
+    pairs = list(cli.iter_normalized(cli.snapshot_paths(data_dir), "Yoro", 2025, workers=2, chunk_size=8))
+
+    assert [item for _, item in pairs] == expected
+    assert [snapshot.path.stem for snapshot, _ in pairs] == [item.name for item in expected]
+
+
+def _run_args(data_dir, output_dir, workers=1):
+    return argparse.Namespace(
+        data_dir=str(data_dir),
+        output_dir=str(output_dir),
+        department="Yoro",
+        year=2025,
+        workers=workers,
+    )
+
+
+def _read_tree(root):
+    return {str(path.relative_to(root)): path.read_bytes() for path in sorted(root.rglob("*")) if path.is_file()}
+
+
+def test_streaming_run_matches_in_memory_outputs(tmp_path, capsys):
+    data_dir = tmp_path / "data"
+    output_dir = tmp_path / "out"
+    _write_inputs(data_dir, 12)
+
+    snapshots = cli.load_snapshots(data_dir)
+    normalized = cli.normalize_snapshots(snapshots, "Yoro", 2025)
+    normalized_paths = cli.write_normalized_outputs(normalized, output_dir)
+    chain_path, hash_entries = cli.write_hashchain(normalized, output_dir)
+    anomalies = cli.audit_snapshots(snapshots)
+    anomalies_path = cli.write_anomalies(anomalies, output_dir)
+    status = cli.build_status(snapshots, normalized, hash_entries, anomalies, output_dir, data_dir)
+    status_path = cli.write_status(status, output_dir)
+    cli.write_registry(normalized_paths + [chain_path, anomalies_path, status_path], output_dir)
+    expected = _read_tree(output_dir)
+    shutil.rmtree(output_dir)
+
+    cli.run_pipeline(_run_args(data_dir, output_dir))
+    capsys.readouterr()
+
+    assert [anomaly["type"] for anomaly in anomalies] == ["NEGATIVE_DELTA"]
+    assert _read_tree(output_dir) == expected
+
+
+def test_hashchain_writer_empty_chain(tmp_path):
+    with cli.HashchainWriter(tmp_path) as chain:
+        chain.close()
+    assert (tmp_path / "hashchain.json").read_text(encoding="utf-8") == json.dumps([], indent=2) + "\n"
+
+
+def test_run_pipeline_chain_is_identical_with_workers(tmp_path, capsys):
+    data_dir = tmp_path / "data"
+    _write_inputs(data_dir, 20)
+    chains = []
+    for workers in (1, 2):
+        output_dir = tmp_path / f"out_{workers}"
+        cli.run_pipeline(_run_args(data_dir, output_dir, workers))
+        chains.append((output_dir / "hashchain.json").read_text(encoding="utf-8"))
+    capsys.readouterr()
+
+    assert chains[0] == chains[1]
+    assert len(json.loads(chains[0])) == 20
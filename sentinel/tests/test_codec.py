@@ -0,0 +1,65 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from sentinel.core.hashchain import compute_hash
+from sentinel.core.normalyze import normalize_snapshot, snapshot_to_canonical_json
+from sentinel.utils import codec
+
+ROOT = Path(__file__).resolve().parents[2]
+FIXTURES = ROOT / "tests" / "fixtures" / "snapshots_2025"
+GOLDEN = ROOT / "docs" / "examples" / "replay_2025"
+EXAMPLES = sorted((ROOT / "docs" / "examples").rglob("*.json"))
+
+
+@pytest.fixture(params=["native", "stdlib"])
+def backend(request, monkeypatch):
+    if request.param == "native":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(codec, "orjson", None)
+    return request.param
+
+
+def test_canonical_hash_chain_matches_golden_files(backend):
+    chain = json.loads((GOLDEN / "hashchain.json").read_text(encoding="utf-8"))
+    previous_hash = None
+    for path, entry in zip(sorted(FIXTURES.glob("*.json")), chain, strict=True):
+        raw = codec.load_path(path)
+        snapshot = normalize_snapshot(raw, "Francisco Morazán", raw["timestamp_utc"], year=2025)
+        canonical_json = snapshot_to_canonical_json(snapshot)
+        golden = (GOLDEN / "normalized" / f"{path.stem}.json").read_text(encoding="utf-8").rstrip("\n")
+
+        assert canonical_json == golden
+        assert compute_hash(canonical_json, previous_hash) == entry["hash"]
+        previous_hash = entry["hash"]
+
+
+@pytest.mark.parametrize("path", EXAMPLES, ids=lambda path: path.name)
+def test_codec_round_trips_example_shapes_like_stdlib(backend, path):
+    expected = json.loads(path.read_text(encoding="utf-8"))
+    decoded = codec.load_path(path)
+
+    assert json.dumps(decoded, sort_keys=True) == json.dumps(expected, sort_keys=True)
+    assert codec.dumps(decoded, indent=2) == json.dumps(expected, indent=2, ensure_ascii=False)
+    assert codec.dumps_bytes(decoded, sort_keys=True) == json.dumps(
+        expected, sort_keys=True, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def test_codec_falls_back_for_values_orjson_rejects(backend):
+    assert codec.dumps({1: "uno", "big": 2**70}, sort_keys=False) == '{"1":"uno","big":1180591620717411303424}'
+    assert codec.loads(b'{"v": NaN, "big": 1180591620717411303424}')["big"] == 2**70
+    with pytest.raises(json.JSONDecodeError):
+        codec.loads("{invalid")
+
+
+def test_non_finite_floats_are_written_like_stdlib(backend):
+    payload = {"ratio": float("nan"), "bounds": [1.5, float("inf"), -float("inf")], "missing": None}
+
+    assert codec.dumps(payload) == '{"ratio":NaN,"bounds":[1.5,Infinity,-Infinity],"missing":null}'
+    assert codec.dumps_bytes(payload, indent=2, sort_keys=True) == json.dumps(
+        payload, indent=2, sort_keys=True
+    ).encode("utf-8")
+    assert codec.dumps({"missing": None, "values": [1.0, 2.5]}) == '{"missing":null,"values":[1.0,2.5]}'
@@ -0,0 +1,58 @@
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from sentinel.core.columnar import ColumnarSnapshotStore
+from sentinel.core.normalyze import normalize_snapshot
+
+
+def _snapshot(department, timestamp, total_votes):
+    raw = {
+        "registered_voters": 1000,
+        "total_votes": total_votes,
+        "valid_votes": total_votes - 20,
+        "null_votes": 10,
+        "blank_votes": 10,
+        "candidates": {"1": total_votes // 2, "2": total_votes // 3},
+    }
+    return normalize_snapshot(raw, department, timestamp, candidate_count=2)
+
+
+def test_append_partitions_by_department_and_day(tmp_path):
+    store = ColumnarSnapshotStore(tmp_path)
+    store.append(_snapshot("Atlántida", "2025-12-03T17:00:00Z", 600), source_id="ATL", snapshot_hash="h1")
+    store.append(_snapshot("Atlántida", "2025-12-03T18:00:00Z", 700), source_id="ATL", snapshot_hash="h2")
+    store.append_many([
+        (_snapshot("Atlántida", "2025-12-04T01:00:00Z", 800), "ATL", "h3"),
+        (_snapshot("Francisco Morazán", "2025-12-03T18:00:00Z", 900), "FM", "h4"),
+    ])
+
+    partitions = [path.relative_to(tmp_path / "totals").parent.as_posix() for path in store.partitions()]
+    assert partitions == [
+        "department_code=01/day=2025-12-03",
+        "department_code=01/day=2025-12-04",
+        "department_code=08/day=2025-12-03",
+    ]
+
+    totals = store.read(columns=["department_code", "total_votes", "hash"]).to_pylist()
+    assert [row["hash"] for row in totals] == ["h1", "h2", "h4", "h3"]
+    assert totals[0] == {"department_code": "01", "total_votes": 600, "hash": "h1"}
+
+
+def test_read_projects_columns_and_filters_time_range(tmp_path):
+    store = ColumnarSnapshotStore(tmp_path)
+    for hour, total in [(17, 600), (18, 700), (19, 800)]:
+        store.append(_snapshot("Atlántida", f"2025-12-03T{hour}:00:00Z", total), source_id="ATL")
+    store.append(_snapshot("Francisco Morazán", "2025-12-03T18:00:00Z", 900), source_id="FM")
+
+    candidates = store.read(
+        "candidates",
+        columns=["slot", "votes"],
+        start="2025-12-03T17:30:00Z",
+        end="2025-12-03T18:30:00Z",
+        department_codes=["01"],
+    )
+
+    assert candidates.column_names == ["slot", "votes"]
+    assert candidates.to_pylist() == [{"slot": 1, "votes": 350}, {"slot": 2, "votes": 233}]
+    assert store.read("totals", columns=["total_votes"], start="2025-12-05T00:00:00Z").num_rows == 0
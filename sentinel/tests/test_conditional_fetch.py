@@ -0,0 +1,95 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+requests = pytest.importorskip("requests")
+
+from scripts import download_and_hash
+
+
+class _ValidatingHandler(BaseHTTPRequestHandler):
+    body = json.dumps({"resultados": {"1": 10}}).encode("utf-8")
+    etag = '"v1"'
+    honor_etag = True
+    hits = 0
+
+    def do_GET(self):  # noqa: N802
+        type(self).hits += 1
+        if self.honor_etag and self.headers.get("If-None-Match") == self.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", self.etag)
+        self.send_header("Last-Modified", "Sat, 03 Jan 2026 09:43:13 GMT")
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def endpoint():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ValidatingHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/resultados"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _fetch(endpoint, validators):
+    return download_and_hash.fetch_source_data(
+        session=requests.Session(),
+        endpoints=[endpoint],
+        source={"name": "Atlántida", "department_code": "01"},
+        base_url=None,
+        timeout=5,
+        headers={},
+        retries=1,
+        backoff_base=0,
+        backoff_max=0,
+        use_playwright=False,
+        playwright_stealth=False,
+        playwright_user_agent=None,
+        playwright_locale=None,
+        playwright_timezone=None,
+        playwright_viewport=None,
+        validators=validators,
+    )
+
+
+def test_conditional_get_short_circuits_on_304(endpoint):
+    _ValidatingHandler.honor_etag = True
+    validators = {}
+
+    first = _fetch(endpoint, validators)
+    second = _fetch(endpoint, validators)
+
+    assert first == {"resultados": {"1": 10}}
+    assert validators["etag"] == '"v1"'
+    assert validators["last_modified"].startswith("Sat, 03 Jan 2026")
+    assert second is None
+
+
+def test_identical_body_short_circuits_without_etag_support(endpoint):
+    _ValidatingHandler.honor_etag = False
+    validators = {}
+
+    assert _fetch(endpoint, validators) is not None
+    assert _fetch(endpoint, validators) is None
+
+
+def test_validators_round_trip(tmp_path):
+    path = tmp_path / "state" / "source_validators.json"
+    download_and_hash.save_validators(path, {"01": {"etag": '"v1"', "content_hash": "abc"}})
+
+    assert download_and_hash.load_validators(path) == {"01": {"etag": '"v1"', "content_hash": "abc"}}
+    assert download_and_hash.load_validators(tmp_path / "missing.json") == {}
@@ -0,0 +1,61 @@
+import dataclasses
+import json
+import pickle
+from pathlib import Path
+
+import pytest
+
+from sentinel.core.decoder import SchemaError, SnapshotDecoder, snapshot_from_canonical
+from sentinel.core.models import CandidateResult
+from sentinel.core.normalyze import normalize_snapshot, snapshot_to_canonical_json
+
+ROOT = Path(__file__).resolve().parents[2]
+FIXTURES = sorted((ROOT / "tests" / "fixtures" / "snapshots_2025").glob("*.json"))
+CANONICAL = sorted((ROOT / "docs" / "examples" / "replay_2025" / "normalized").glob("*.json"))
+
+
+def test_models_are_slotted_and_frozen():
+    candidate = CandidateResult(slot=1, votes=10, name="Alice")
+
+    assert not hasattr(candidate, "__dict__")
+    assert pickle.loads(pickle.dumps(candidate)) == candidate
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        candidate.votes = 11
+
+
+@pytest.mark.parametrize("path", CANONICAL, ids=lambda path: path.name)
+def test_snapshot_from_canonical_round_trips_bytes(path):
+    data = path.read_bytes()
+
+    snapshot = snapshot_from_canonical(data)
+
+    assert snapshot_to_canonical_json(snapshot) == data.decode("utf-8").rstrip("\n")
+
+
+@pytest.mark.parametrize(
+    "mutate, message",
+    [
+        (lambda payload: payload["candidates"][0].update(votes=True), "candidates[0].votes"),
+        (lambda payload: payload["totals"].pop("null_votes"), "totals"),
+        (lambda payload: payload["meta"].update(extra=1), "meta"),
+        (lambda payload: payload.update(candidates={}), "snapshot.candidates"),
+    ],
+)
+def test_snapshot_from_canonical_rejects_schema_mismatches(mutate, message):
+    payload = json.loads(CANONICAL[0].read_text(encoding="utf-8"))
+    mutate(payload)
+
+    with pytest.raises(SchemaError, match=message.replace("[", r"\[").replace("]", r"\]")):
+        snapshot_from_canonical(json.dumps(payload))
+
+
+def test_snapshot_decoder_matches_normalize_snapshot():
+    decoder = SnapshotDecoder("Francisco Morazán", year=2025)
+    for path in FIXTURES:
+        raw = json.loads(path.read_text(encoding="utf-8"))
+        expected = normalize_snapshot(raw, "Francisco Morazán", raw["timestamp_utc"], year=2025)
+
+        assert decoder.decode(path.read_bytes()) == expected
+
+    with pytest.raises(SchemaError):
+        decoder.decode(b"[1, 2]")
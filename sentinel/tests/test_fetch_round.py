@@ -0,0 +1,162 @@
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("requests")
+
+from scripts import download_and_hash
+
+
+def _config(**overrides):
+    config = {
+        "base_url": None,
+        "timeout": 1.0,
+        "headers": {},
+        "retries": 1,
+        "backoff_base": 0,
+        "backoff_max": 0,
+        "use_playwright": False,
+        "playwright_stealth": False,
+        "playwright_user_agent": None,
+        "playwright_locale": None,
+        "playwright_timezone": None,
+        "playwright_viewport": None,
+        "max_concurrency": 19,
+        "max_requests_per_host": 19,
+        "round_deadline": None,
+    }
+    config.update(overrides)
+    return config
+
+
+def _sources(count):
+    return [
+        {"name": f"Dept {idx}", "department_code": f"{idx:02d}", "endpoints": ["https://cne.test/api"]}
+        for idx in range(1, count + 1)
+    ]
+
+
+def test_fetch_round_runs_sources_concurrently(monkeypatch):
+    def fake_fetch(**kwargs):
+        time.sleep(0.2)
+        return {"dept": kwargs["source"]["department_code"]}
+
+    monkeypatch.setattr(download_and_hash, "fetch_source_data", fake_fetch)
+
+    started = time.monotonic()
+    payloads, failures = download_and_hash.fetch_round(_config(), _sources(19))
+    elapsed = time.monotonic() - started
+
+    assert failures == []
+    assert list(payloads) == [f"{idx:02d}" for idx in range(1, 20)]
+    assert elapsed < 1.0
+
+
+def test_fetch_round_reports_failures_and_deadline(monkeypatch):
+    release = threading.Event()
+
+    def fake_fetch(**kwargs):
+        code = kwargs["source"]["department_code"]
+        if code == "02":
+            raise RuntimeError("HTTP 503")
+        if code == "03":
+            release.wait(2)
+        return {"dept": code}
+
+    monkeypatch.setattr(download_and_hash, "fetch_source_data", fake_fetch)
+
+    payloads, failures = download_and_hash.fetch_round(_config(round_deadline=0.3), _sources(3))
+    release.set()
+
+    assert list(payloads) == ["01"]
+    failed = dict(failures)
+    assert failed["02"] == "HTTP 503"
+    assert "Plazo" in failed["03"]
+
+
+def test_host_limiter_caps_parallel_requests_per_host():
+    limiter = download_and_hash.HostLimiter(2)
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def worker():
+        nonlocal active, peak
+        with limiter.limit("https://cne.test/api?dept=01"):
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.05)
+            with lock:
+                active -= 1
+
+    threads = [threading.Thread(target=worker) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert peak == 2
+
+
+class _RecordingSession:
+    def __init__(self):
+        self.timeouts = []
+
+    def get(self, endpoint, params=None, timeout=None, headers=None):
+        self.timeouts.append(timeout)
+        raise download_and_hash.requests.ConnectionError("sin red")
+
+
+def _fetch_with_deadline(session, deadline, retries=3):
+    return download_and_hash.fetch_source_data(
+        session=session,
+        endpoints=["https://cne.test/api"],
+        source=_sources(1)[0],
+        base_url=None,
+        timeout=30.0,
+        headers={},
+        retries=retries,
+        backoff_base=5,
+        backoff_max=5,
+        use_playwright=False,
+        playwright_stealth=False,
+        playwright_user_agent=None,
+        playwright_locale=None,
+        playwright_timezone=None,
+        playwright_viewport=None,
+        deadline=deadline,
+    )
+
+
+def test_request_timeout_is_capped_by_round_deadline():
+    session = _RecordingSession()
+    started = time.monotonic()
+    with pytest.raises((TimeoutError, download_and_hash.requests.ConnectionError)):
+        _fetch_with_deadline(session, time.monotonic() + 0.2)
+
+    # El backoff (5 s) se recorta al plazo y no hay intentos después de vencerlo.
+    assert time.monotonic() - started < 1.0
+    assert session.timeouts and all(0 < value <= 0.2 for value in session.timeouts)
+
+    expired = _RecordingSession()
+    with pytest.raises(TimeoutError):
+        _fetch_with_deadline(expired, time.monotonic() - 1)
+    assert expired.timeouts == []
+
+
+def test_fetch_round_passes_round_deadline_to_requests(monkeypatch):
+    seen = []
+
+    def fake_fetch(**kwargs):
+        seen.append(kwargs["deadline"])
+        return {}
+
+    monkeypatch.setattr(download_and_hash, "fetch_source_data", fake_fetch)
+    started = time.monotonic()
+    download_and_hash.fetch_round(_config(round_deadline=5), _sources(2))
+    download_and_hash.fetch_round(_config(), _sources(1))
+
+    assert all(started + 4 < value <= time.monotonic() + 5 for value in seen[:2])
+    assert seen[2] is None
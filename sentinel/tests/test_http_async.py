@@ -0,0 +1,108 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from scripts import download_and_hash
+from sentinel.core.http_async import AsyncHttpClient
+
+
+class _CneStandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    connections: set = set()
+
+    def do_GET(self):  # noqa: N802
+        query = parse_qs(urlsplit(self.path).query)
+        if query.get("dept") == ["13"]:
+            body = b"<html><body>captcha</body></html>"
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+        else:
+            body = json.dumps(
+                {"dept": query.get("dept", [None])[0], "resultados": {"1": 100, "2": 50}}
+            ).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        type(self).connections.add(self.client_address)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def cne_server():
+    _CneStandInHandler.connections = set()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _CneStandInHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/resultados"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _config(endpoint, **overrides):
+    config = {
+        "base_url": endpoint,
+        "timeout": 5.0,
+        "headers": {"Accept": "application/json"},
+        "retries": 1,
+        "backoff_base": 0,
+        "backoff_max": 0,
+        "use_playwright": False,
+        "playwright_stealth": False,
+        "playwright_user_agent": None,
+        "playwright_locale": None,
+        "playwright_timezone": None,
+        "playwright_viewport": None,
+        "max_concurrency": 19,
+        "max_requests_per_host": 4,
+        "round_deadline": 10.0,
+        "http_keepalive_seconds": 30.0,
+    }
+    config.update(overrides)
+    return config
+
+
+def test_fetch_round_async_matches_sources(cne_server):
+    sources = [
+        {"name": f"Dept {idx}", "department_code": f"{idx:02d}", "endpoints": [cne_server]}
+        for idx in range(1, 19)
+    ]
+
+    payloads, failures = asyncio.run(download_and_hash.fetch_round_async(_config(cne_server), sources))
+
+    assert [code for code, _ in failures] == ["13"]
+    assert "JSON" in failures[0][1]
+    assert len(payloads) == 17
+    assert payloads["08"]["dept"] == "08"
+
+
+def test_async_client_reuses_keepalive_connections(cne_server):
+    requests_per_source = 25
+    sources = [f"{idx:02d}" for idx in range(1, 6)]
+
+    async def _run():
+        async with AsyncHttpClient(max_connections=4, max_per_host=4) as client:
+            return await asyncio.gather(
+                *[
+                    client.get(cne_server, params={"dept": dept})
+                    for dept in sources
+                    for _ in range(requests_per_source)
+                ]
+            )
+
+    responses = asyncio.run(_run())
+
+    assert all(response.ok for response in responses)
+    assert len(_CneStandInHandler.connections) <= 4
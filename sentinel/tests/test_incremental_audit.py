@@ -0,0 +1,125 @@
+import json
+
+import pytest
+
+pytest.importorskip("pandas")
+pytest.importorskip("pyarrow")
+
+from scripts import analyze_rules
+
+
+def _snapshot(hour, department, base_votes):
+    votes = [base_votes * 3 + hour * 40, base_votes * 2 + hour * 25, base_votes + hour * 5]
+    if hour == 5:
+        votes[0] += 9000  # salto para disparar OUTLIER
+    if hour == 7:
+        votes[1] -= 50  # regresión para NEGATIVE_DELTA
+    total = sum(votes)
+    return {
+        "meta": {"department": department, "timestamp_utc": f"2025-12-03T{hour:02d}:00:00Z"},
+        "totals": {
+            "total_votes": total,
+            "valid_votes": total,
+            "null_votes": 0,
+            "blank_votes": 0,
+            "actas_procesadas": 100 + hour * 10,
+            "actas_totales": 500,
+        },
+        "candidates": [
+            {"id": f"{department}-{idx}", "votes": value} for idx, value in enumerate(votes)
+        ],
+    }
+
+
+def _write(directory, hour, department, base_votes):
+    path = directory / f"snapshot_2025-12-03T{hour:02d}-00-00Z_{department}.json"
+    path.write_text(json.dumps(_snapshot(hour, department, base_votes)), encoding="utf-8")
+
+
+def _outputs(directory):
+    results = json.loads((directory / "analysis_results.json").read_text(encoding="utf-8"))
+    results.pop("generated_at")
+    anomalies = json.loads((directory / "anomalies_report.json").read_text(encoding="utf-8"))
+    return results, anomalies
+
+
+def test_incremental_audit_matches_full_run(tmp_path, monkeypatch):
+    normalized = tmp_path / "normalized"
+    normalized.mkdir()
+    full_dir = tmp_path / "full"
+    full_dir.mkdir()
+    incremental_dir = tmp_path / "incremental"
+    incremental_dir.mkdir()
+    state_path = tmp_path / "audit_state.json"
+
+    loaded = []
+    original_load_json = analyze_rules.load_json
+
+    def tracking_load_json(file_path):
+        loaded.append(file_path)
+        return original_load_json(file_path)
+
+    monkeypatch.setattr(analyze_rules, "load_json", tracking_load_json)
+    # Fuerza la compactación de partes Parquet durante las 10 corridas.
+    monkeypatch.setattr(analyze_rules, "AUDIT_RECORD_PARTS_MAX", 3)
+
+    monkeypatch.chdir(incremental_dir)
+    for hour in range(1, 11):
+        _write(normalized, hour, "01", 1000)
+        if hour % 2 == 0:
+            _write(normalized, hour, "08", 4000)
+        loaded.clear()
+        analyze_rules.run_audit(str(normalized), incremental=True, state_path=str(state_path))
+        assert len(loaded) == (2 if hour % 2 == 0 else 1)
+
+    monkeypatch.chdir(full_dir)
+    analyze_rules.run_audit(str(normalized), incremental=False)
+
+    incremental_results, incremental_anomalies = _outputs(incremental_dir)
+    full_results, full_anomalies = _outputs(full_dir)
+    assert incremental_anomalies == full_anomalies
+    assert incremental_results == full_results
+    assert {a["type"] for a in full_anomalies} >= {"NEGATIVE_DELTA", "OUTLIER"}
+
+
+def test_incremental_audit_rebuilds_when_processed_file_changes(tmp_path, monkeypatch):
+    normalized = tmp_path / "normalized"
+    normalized.mkdir()
+    state_path = tmp_path / "audit_state.json"
+    monkeypatch.chdir(tmp_path)
+    for hour in range(1, 4):
+        _write(normalized, hour, "01", 1000)
+    analyze_rules.run_audit(str(normalized), incremental=True, state_path=str(state_path))
+
+    _write(normalized, 1, "01", 2000)
+    state = analyze_rules.load_audit_state(str(state_path), analyze_rules.load_rule_settings())
+    fingerprints = {
+        path.name: analyze_rules.file_fingerprint(str(path)) for path in normalized.glob("*.json")
+    }
+
+    assert analyze_rules.plan_incremental(state, fingerprints) is None
+
+
+def test_incremental_audit_appends_typed_parts_without_dateutil(tmp_path, monkeypatch):
+    normalized = tmp_path / "normalized"
+    normalized.mkdir()
+    state_path = tmp_path / "audit_state.json"
+    monkeypatch.chdir(tmp_path)
+    for hour in range(1, 4):
+        _write(normalized, hour, "01", 1000)
+    analyze_rules.run_audit(str(normalized), incremental=True, state_path=str(state_path))
+
+    def fail_parse(*args, **kwargs):
+        raise AssertionError("dateutil no debe usarse con timestamps ISO 8601")
+
+    monkeypatch.setattr(analyze_rules.parser, "parse", fail_parse)
+    _write(normalized, 4, "01", 1000)
+    analyze_rules.run_audit(str(normalized), incremental=True, state_path=str(state_path))
+
+    state = json.loads(state_path.read_text(encoding="utf-8"))
+    # El historial de filas y flags vive en Parquet, no en el JSON de estado.
+    assert all("records" not in entry for entry in state["files"].values())
+    assert all("flags" not in result for result in state["departments"].values())
+    assert state["record_parts"] == ["part-000000.parquet", "part-000001.parquet"]
+    stored = analyze_rules.load_record_parts(state, str(state_path))
+    assert len(stored) == 4 and stored["total_votes"].dtype == "Int64"
@@ -0,0 +1,163 @@
+import json
+
+import pytest
+
+from sentinel.core.merkle import (
+    MerkleLedger,
+    build_levels,
+    inclusion_path,
+    leaf_hash,
+    merkle_root,
+    root_from_path,
+    verify_proof,
+)
+
+
+def _hash(round_index, source_index):
+    return f"{round_index:02x}{source_index:062x}"
+
+
+@pytest.mark.parametrize("size", range(1, 21))
+def test_inclusion_paths_are_logarithmic_and_verify(size):
+    leaves = [leaf_hash(f"S{index:02d}", _hash(0, index)) for index in range(size)]
+    levels = build_levels(leaves)
+    root = merkle_root(leaves)
+    for index, leaf in enumerate(leaves):
+        path = inclusion_path(levels, index)
+        assert len(path) <= max(1, (size - 1).bit_length())
+        assert root_from_path(leaf, path) == root
+
+
+def test_odd_leaf_is_not_duplicated():
+    leaves = [leaf_hash("A", _hash(0, 1)), leaf_hash("B", _hash(0, 2)), leaf_hash("C", _hash(0, 3))]
+    assert merkle_root(leaves) != merkle_root(leaves + leaves[-1:])
+
+
+def test_ledger_proves_snapshot_against_round_and_day_roots(tmp_path):
+    ledger = MerkleLedger(tmp_path)
+    for round_index in range(4):
+        ledger.record_round(
+            [(f"S{index:02d}", _hash(round_index, index)) for index in range(19)],
+            f"2025-12-03T17:{round_index * 5:02d}:00Z",
+        )
+    ledger.record_round([("S01", _hash(9, 1))], "2025-12-04T00:00:00Z")
+
+    proof = ledger.prove(_hash(2, 7))
+    assert proof["source_id"] == "S07"
+    assert proof["round_id"] == "20251203T171000.000000Z"
+    assert proof["day_root"] == ledger.load_day("2025-12-03")["root"]
+    assert len(proof["round_path"]) == 5 and len(proof["day_path"]) == 2
+    day_root = ledger.load_day("2025-12-03")["root"]
+    assert verify_proof(proof, day_root=day_root)
+    assert verify_proof(proof, round_root=ledger.load_round(proof["round_id"])["root"])
+
+    assert not verify_proof({**proof, "source_id": "S08"}, day_root=day_root)
+    assert not verify_proof(proof, day_root=ledger.load_day("2025-12-04")["root"])
+    with pytest.raises(ValueError):
+        verify_proof(proof)
+
+    latest = ledger.latest()
+    assert (latest["day"], latest["sources"]) == ("2025-12-04", 1)
+    with pytest.raises(KeyError):
+        ledger.prove("ff" * 32)
+
+
+def test_telegram_message_includes_round_root(tmp_path):
+    pytest.importorskip("requests")
+    pytest.importorskip("dotenv")
+    from scripts import post_to_telegram
+
+    ledger = MerkleLedger(tmp_path)
+    record = ledger.record_round([("S01", _hash(0, 1)), ("S02", _hash(0, 2))], "2025-12-03T17:00:00Z")
+
+    merkle_root_info = post_to_telegram.get_latest_merkle_root(tmp_path)
+    text = post_to_telegram.format_as_neutral("resumen", "abc", merkle_root_info)
+    assert record["root"] in text
+    assert "Round Merkle root (2 sources" in text
+    assert post_to_telegram.get_latest_merkle_root(tmp_path / "missing") is None
+
+
+def test_round_tree_includes_sources_without_new_snapshot(tmp_path, monkeypatch):
+    pytest.importorskip("requests")
+    pytest.importorskip("yaml")
+    from scripts import download_and_hash
+
+    for name in ("data_dir", "hash_dir"):
+        (tmp_path / name).mkdir()
+        monkeypatch.setattr(download_and_hash, name, tmp_path / name)
+    config_path = tmp_path / "config.yaml"
+    # JSON es YAML válido.
+    config_path.write_text(
+        json.dumps({
+            "base_url": "http://127.0.0.1/resultados",
+            "columnar_store_path": "",
+            "validators_path": str(tmp_path / "validators.json"),
+            "sources": [
+                {"name": "Atlántida", "department_code": "01"},
+                {"name": "Colón", "department_code": "03"},
+                {"name": "Yoro", "department_code": "18"},
+            ],
+        }),
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(download_and_hash, "config_path", config_path)
+    responses = iter([
+        {"01": {"resultados": {"1": 10}}, "03": {"resultados": {"1": 20}}, "18": {"resultados": {"1": 30}}},
+        # 01 responde 304; 18 no toca en esta ronda (sondeo adaptativo).
+        {"01": None, "03": {"resultados": {"1": 25}}},
+    ])
+    monkeypatch.setattr(download_and_hash, "fetch_round", lambda config, sources, validators: (next(responses), []))
+
+    first, _ = download_and_hash.run_round()
+    second, _ = download_and_hash.run_round(["01", "03"])
+
+    ledger = download_and_hash.merkle_ledger()
+    record = ledger.load_round(ledger.latest()["round_id"])
+    first_hashes = {item["source_id"]: item["hash"] for item in first}
+    assert [(leaf["source_id"], leaf["hash"]) for leaf in record["leaves"]] == [
+        ("01", first_hashes["01"]),
+        ("03", second[0]["hash"]),
+        ("18", first_hashes["18"]),
+    ]
+    assert ledger.latest()["sources"] == 3
+    proof = ledger.prove(first_hashes["01"], round_id=record["round_id"])
+    assert proof["round_root"] == record["root"]
+    assert verify_proof(proof, round_root=record["root"])
+
+
+def test_self_consistent_forged_proof_fails_against_published_roots(tmp_path, capsys):
+    from scripts import cli
+
+    ledger = MerkleLedger(tmp_path / "merkle")
+    record = ledger.record_round([(f"S{index:02d}", _hash(0, index)) for index in range(5)], "2025-12-03T17:00:00Z")
+    day_root = ledger.load_day("2025-12-03")["root"]
+
+    # Un snapshot que nunca se registró, con raíces calculadas a partir de él mismo.
+    forged_round_root = leaf_hash("S01", "ee" * 32)
+    forged = {
+        "source_id": "S01",
+        "hash": "ee" * 32,
+        "round_id": record["round_id"],
+        "round_root": forged_round_root,
+        "round_path": [],
+        "day": "2025-12-03",
+        "day_root": leaf_hash(record["round_id"], forged_round_root),
+        "day_path": [],
+    }
+    assert not verify_proof(forged, round_root=record["root"])
+    assert not verify_proof(forged, day_root=day_root)
+
+    proof_path = tmp_path / "forged.json"
+    proof_path.write_text(json.dumps(forged), encoding="utf-8")
+    parser = cli.build_parser()
+    for extra in (["--round-root", record["root"]], ["--day-root", day_root], ["--merkle-dir", str(tmp_path / "merkle")]):
+        with pytest.raises(SystemExit):
+            cli.merkle_verify(parser.parse_args(["merkle-verify", "--proof", str(proof_path), *extra]))
+    with pytest.raises(SystemExit):
+        cli.merkle_verify(parser.parse_args(["merkle-verify", "--proof", str(proof_path)]))
+
+    capsys.readouterr()
+    genuine_path = tmp_path / "proof.json"
+    genuine_path.write_text(json.dumps(ledger.prove(_hash(0, 1))), encoding="utf-8")
+    cli.merkle_verify(parser.parse_args(["merkle-verify", "--proof", str(genuine_path), "--merkle-dir", str(tmp_path / "merkle")]))
+    assert json.loads(capsys.readouterr().out) == {"valid": True, "round_root": record["root"], "day_root": None}
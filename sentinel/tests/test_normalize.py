@@ -1,4 +1,4 @@
-from sentinel.core.normalyze import normalize_snapshot, snapshot_to_canonical_json
+from sentinel.core.normalyze import compile_field_map, normalize_snapshot, snapshot_to_canonical_json
 
 
 def test_normalization_is_deterministic():
@@ -63,3 +63,40 @@ def test_normalization_parses_nested_totals_and_candidates():
     assert snapshot.totals.total_votes == 1000
     assert snapshot.candidates[0].name == "Alice"
     assert snapshot.candidates[1].votes == 350
+
+
+def test_compiled_field_map_matches_dict_field_map():
+    field_map = {
+        "totals": {
+            "valid_votes": ["estadisticas.distribucion_votos.validos"],
+            "null_votes": ["estadisticas.distribucion_votos.nulos", "nulos"],
+            "total_votes": ["estadisticas.distribucion_votos.total"],
+        },
+        "candidate_roots": ["estadisticas.inexistente", "resultados"],
+    }
+    plan = compile_field_map(field_map)
+    payloads = [
+        {
+            "estadisticas": {"distribucion_votos": {"validos": "1,500", "total": 1600}},
+            "nulos": 70,
+            "blancos": 30,
+            "resultados": {"candidatos": [{"votos": 900, "nombre": "Alice"}, {"votos": 600}]},
+        },
+        # Un nodo intermedio que no es dict corta la ruta sin error.
+        {"estadisticas": "sin datos", "validos": 5, "resultados": {"1": 3, "2": {"votos": "4"}}},
+        {},
+    ]
+
+    for raw in payloads:
+        compiled = normalize_snapshot(raw, "Yoro", "2025-12-03T17:00:00Z", field_map=plan)
+        from_dict = normalize_snapshot(raw, "Yoro", "2025-12-03T17:00:00Z", field_map=field_map)
+        assert snapshot_to_canonical_json(compiled) == snapshot_to_canonical_json(from_dict)
+
+    first = normalize_snapshot(payloads[0], "Yoro", "2025-12-03T17:00:00Z", field_map=plan)
+    assert first.totals.valid_votes == 1500
+    assert first.totals.null_votes == 70
+    assert first.totals.blank_votes == 30
+    assert [candidate.votes for candidate in first.candidates[:2]] == [900, 600]
+    second = normalize_snapshot(payloads[1], "Yoro", "2025-12-03T17:00:00Z", field_map=plan)
+    assert second.totals.valid_votes == 0
+    assert [candidate.votes for candidate in second.candidates[:2]] == [3, 4]
@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+pytest.importorskip("apscheduler")
+
+from scripts import run_pipeline
+
+
+class FakeStages:
+    mode = "in_process"
+
+    def __init__(self, snapshot_path, payload):
+        self.snapshot_path = snapshot_path
+        self.payload = payload
+        self.calls = []
+
+    def download(self, source_ids=None):
+        self.calls.append("download")
+        return self.snapshot_path, self.payload
+
+    def normalize(self):
+        self.calls.append("normalize")
+
+    def analyze(self):
+        self.calls.append("analyze")
+        return [{"type": "NEGATIVE_DELTA", "file": "snapshot_a.json"}]
+
+    def summarize(self, alerts):
+        self.calls.append("summarize")
+        return "resumen"
+
+    def send_alert(self, summary_text, hash_path):
+        self.calls.append("send_alert")
+
+
+@pytest.fixture
+def pipeline_dirs(tmp_path, monkeypatch):
+    for name in ("DATA_DIR", "HASH_DIR", "ANALYSIS_DIR", "REPORTS_DIR"):
+        directory = tmp_path / name.lower()
+        directory.mkdir()
+        monkeypatch.setattr(run_pipeline, name, directory)
+    monkeypatch.setattr(run_pipeline, "STATE_PATH", tmp_path / "data_dir" / "pipeline_state.json")
+    monkeypatch.delenv("TELEGRAM_BOT_TOKEN", raising=False)
+    return tmp_path
+
+
+def test_run_pipeline_uses_in_memory_payload_and_records_timings(pipeline_dirs):
+    snapshot_path = pipeline_dirs / "data_dir" / "snapshot_a.json"
+    payload = {"resultados": [], "estadisticas": {}}
+    # El archivo en disco difiere: la etapa en proceso debe usar el payload en memoria.
+    snapshot_path.write_text("{}", encoding="utf-8")
+    stages = FakeStages(snapshot_path, payload)
+
+    run_pipeline.run_pipeline(stages=stages)
+
+    assert stages.calls == ["download", "normalize", "analyze", "summarize"]
+    state = json.loads(run_pipeline.STATE_PATH.read_text(encoding="utf-8"))
+    assert state["last_content_hash"] == run_pipeline.compute_content_hash(snapshot_path, payload)
+    timings = state["last_stage_timings"]
+    assert timings["mode"] == "in_process"
+    assert set(timings["stages"]) == {"download", "normalize", "analyze", "summarize", "alerts"}
+    assert timings["total_seconds"] >= sum(timings["stages"].values()) - 1e-3
+
+
+def test_load_pipeline_mode_prefers_env(tmp_path, monkeypatch):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("pipeline:\n  mode: in_process\n", encoding="utf-8")
+
+    monkeypatch.delenv("PIPELINE_MODE", raising=False)
+    assert run_pipeline.load_pipeline_mode(config_path) == "in_process"
+
+    monkeypatch.setenv("PIPELINE_MODE", "subprocess")
+    assert run_pipeline.load_pipeline_mode(config_path) == "subprocess"
+
+    monkeypatch.setenv("PIPELINE_MODE", "threads")
+    with pytest.raises(ValueError):
+        run_pipeline.load_pipeline_mode(config_path)
@@ -0,0 +1,90 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+pytest.importorskip("pandas")
+
+from scripts.analyze_rules import RULES, audit_departments, build_department_frame
+from sentinel.core.rules import RuleRun, load_rule_settings
+from scripts.benchmarks.rule_engine import legacy_audit_departments, synthetic_records
+
+
+def _edge_case_records():
+    start = datetime(2025, 12, 3, 17, 0, tzinfo=timezone.utc)
+    records = []
+    # Un departamento con una sola fila (zscore_delta en None).
+    records.append({
+        "timestamp": start,
+        "departamento": "SOLO",
+        "total_votes": 100,
+        "actas_procesadas": 5,
+        "actas_totales": 4,
+        "porcentaje_escrutado": None,
+        "valid_votes": None,
+        "null_votes": 1,
+        "blank_votes": 1,
+    })
+    # Deltas constantes (desviación cero) con actas estancadas.
+    for step in range(4):
+        records.append({
+            "timestamp": start + timedelta(hours=step),
+            "departamento": "PLANO",
+            "total_votes": 1000 + step * 50,
+            "actas_procesadas": 10,
+            "actas_totales": None,
+            "porcentaje_escrutado": 10.0 + step * 6,
+            "valid_votes": 950 + step * 50,
+            "null_votes": 30,
+            "blank_votes": 20,
+        })
+    return records
+
+
+def _canonical(results):
+    return json.dumps(results, sort_keys=True, default=str)
+
+
+@pytest.mark.parametrize(
+    "records",
+    [synthetic_records(departments=3, snapshots=400, seed=7), _edge_case_records()],
+    ids=["synthetic", "edge_cases"],
+)
+def test_vectorized_engine_matches_iterrows(records):
+    df = build_department_frame(records)
+
+    legacy = legacy_audit_departments(df)
+    vectorized = audit_departments(df)
+
+    assert vectorized.keys() == legacy.keys()
+    for departamento, expected in legacy.items():
+        result = vectorized[departamento]
+        assert _canonical(result["anomalies"]) == _canonical(expected["anomalies"])
+        assert _canonical(result["metrics"]) == _canonical(expected["metrics"])
+        assert _canonical(result["prediction"]) == _canonical(expected["prediction"])
+        for column in ["outlier_zscore", "outlier_iqr", "change_point"]:
+            assert result["flags"][column] == expected["flags"][column]
+        # zscore_delta solo va al parquet; la media por grupo puede diferir en el último ulp.
+        zscores = [value for value in result["flags"]["zscore_delta"] if value is not None]
+        expected_zscores = [value for value in expected["flags"]["zscore_delta"] if value is not None]
+        assert zscores == pytest.approx(expected_zscores, nan_ok=True)
+
+
+def test_rule_settings_toggle_rules_and_record_timings():
+    settings = load_rule_settings({"rules": {"actas_desvio": False, "scrutinio_salto": {"threshold_pct": 50}}})
+    rule_run = RuleRun(RULES, settings)
+    df = build_department_frame(_edge_case_records())
+
+    results = audit_departments(df, rule_run=rule_run)
+
+    types = {anomaly["type"] for result in results.values() for anomaly in result["anomalies"]}
+    assert types == {"VOTOS_TOTALES_MISMATCH", "ACTAS_OVERFLOW"}
+    summary = rule_run.summary()
+    assert "actas_desvio" not in summary
+    assert summary["scrutinio_salto"] == {**summary["scrutinio_salto"], "rows": len(df), "hits": 0}
+    assert summary["actas_overflow"]["hits"] == 1
+
+
+def test_rule_settings_reject_unknown_rules():
+    with pytest.raises(ValueError):
+        load_rule_settings({"rules": {"no_existe": True}})
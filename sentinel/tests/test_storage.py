@@ -1,9 +1,13 @@
 import csv
+import gzip
 import json
 
+import pytest
+
+from sentinel.core import storage
 from sentinel.core.hashchain import compute_hash
 from sentinel.core.normalyze import normalize_snapshot, snapshot_to_canonical_json
-from sentinel.core.storage import LocalSnapshotStore
+from sentinel.core.storage import LocalSnapshotStore, migrate_department_tables
 
 
 def test_store_snapshot_creates_index(tmp_path):
@@ -68,3 +72,214 @@ def test_exports_for_external_review(tmp_path):
         rows = list(csv.DictReader(csv_file))
     assert rows[0]["hash"] == snapshot_hash
     assert rows[0]["registered_voters"] == "2000"
+
+
+def _department_snapshot(department, timestamp, total_votes):
+    raw = {
+        "registered_voters": 3000,
+        "total_votes": total_votes,
+        "valid_votes": total_votes - 20,
+        "null_votes": 10,
+        "blank_votes": 10,
+        "candidates": {"1": total_votes // 2, "2": total_votes // 4},
+    }
+    return normalize_snapshot(raw, department, timestamp)
+
+
+def test_store_snapshots_bulk_matches_sequential_chain(tmp_path):
+    snapshots = [
+        _department_snapshot("Atlántida", "2025-12-03T18:00:00Z", 1200),
+        _department_snapshot("Comayagua", "2025-12-03T17:00:00Z", 900),
+        _department_snapshot("Atlántida", "2025-12-03T17:00:00Z", 1000),
+        _department_snapshot("Comayagua", "2025-12-03T18:00:00Z", 950),
+    ]
+
+    sequential = LocalSnapshotStore(str(tmp_path / "sequential.db"))
+    heads = {}
+    for snapshot in sorted(snapshots, key=lambda item: item.meta.timestamp_utc):
+        code = snapshot.meta.department_code
+        heads[code] = sequential.store_snapshot(snapshot, previous_hash=heads.get(code))
+    expected = sequential.get_index_entries()
+    sequential.close()
+
+    bulk = LocalSnapshotStore(str(tmp_path / "bulk.db"))
+    hashes = bulk.store_snapshots(snapshots)
+    entries = bulk.get_index_entries()
+
+    assert entries == expected
+    assert hashes[0] == heads["01"]
+    assert hashes[2] == entries[0]["hash"]
+
+    # Un segundo lote continúa la cadena desde el último hash guardado.
+    next_round = _department_snapshot("Atlántida", "2025-12-03T19:00:00Z", 1300)
+    [next_hash] = bulk.store_snapshots([next_round])
+    bulk.close()
+    assert next_hash == compute_hash(snapshot_to_canonical_json(next_round), previous_hash=heads["01"])
+
+
+def test_store_snapshots_rejects_backfill_without_previous_hashes(tmp_path):
+    store = LocalSnapshotStore(str(tmp_path / "snapshots.db"))
+    [first, head] = store.store_snapshots([
+        _department_snapshot("Atlántida", "2025-12-03T17:00:00Z", 1000),
+        _department_snapshot("Atlántida", "2025-12-03T18:00:00Z", 1200),
+    ])
+    backfill = _department_snapshot("Atlántida", "2025-12-03T16:00:00Z", 900)
+
+    # Sin previous_hashes quedaría enlazado después del snapshot de las 18:00.
+    with pytest.raises(ValueError):
+        store.store_snapshots([backfill])
+    with pytest.raises(ValueError):
+        store.store_snapshots([_department_snapshot("Atlántida", "2025-12-03T18:00:00Z", 1250)])
+    assert [entry["hash"] for entry in store.get_index_entries("01")] == [first, head]
+
+    # Con el eslabón explícito el backfill sí se guarda.
+    [backfilled] = store.store_snapshots([backfill], previous_hashes={"01": None})
+    store.close()
+    assert backfilled == compute_hash(snapshot_to_canonical_json(backfill), previous_hash=None)
+
+
+def test_tuned_profile_lets_readers_through_during_write(tmp_path):
+    db_path = str(tmp_path / "snapshots.db")
+    # El perfil por defecto no toca el journal de una base existente.
+    legacy = LocalSnapshotStore(db_path)
+    assert legacy.pragma("journal_mode") == "delete"
+    legacy.close()
+    assert not (tmp_path / "snapshots.db-wal").exists()
+
+    writer = LocalSnapshotStore(db_path, profile="tuned")
+    assert writer.pragma("journal_mode") == "wal"
+    assert writer.pragma("synchronous") == 1  # NORMAL
+    writer.store_snapshots([_department_snapshot("Atlántida", "2025-12-03T17:00:00Z", 1000)])
+
+    reader = LocalSnapshotStore(db_path, profile="tuned")
+    writer._connection.execute("BEGIN EXCLUSIVE")
+    try:
+        # En modo rollback esta lectura esperaría al commit del escritor.
+        assert len(reader.get_index_entries("01")) == 1
+    finally:
+        writer._connection.rollback()
+        reader.close()
+        writer.close()
+
+    with pytest.raises(ValueError):
+        LocalSnapshotStore(db_path, profile="turbo")
+
+
+def test_migrate_to_single_table_keeps_chain_and_cross_department_queries(tmp_path):
+    db_path = str(tmp_path / "snapshots.db")
+    legacy = LocalSnapshotStore(db_path)
+    legacy.store_snapshots([
+        _department_snapshot(department, f"2025-12-03T{hour}:00:00Z", 1000 + hour)
+        for department in ("Atlántida", "Comayagua", "Yoro")
+        for hour in (19, 17, 18)
+    ])
+    latest = legacy.latest_snapshots()
+    window = legacy.snapshots_between("2025-12-03T18:00:00Z", "2025-12-03T18:30:00Z")
+    chain = [(entry["department_code"], entry["hash"], entry["previous_hash"]) for entry in legacy.get_index_entries()]
+    legacy.close()
+
+    assert migrate_department_tables(db_path, drop_legacy=True) == 9
+
+    store = LocalSnapshotStore(db_path, layout="single_table")
+    assert store.latest_snapshots() == latest
+    assert [row["timestamp_utc"] for row in latest] == ["2025-12-03T19:00:00Z"] * 3
+    assert store.snapshots_between("2025-12-03T18:00:00Z", "2025-12-03T18:30:00Z") == window
+    assert [row["department_code"] for row in window] == ["01", "04", "18"]
+    assert [(entry["department_code"], entry["hash"], entry["previous_hash"]) for entry in store.get_index_entries()] == chain
+
+    # Las escrituras nuevas continúan la cadena migrada.
+    [next_hash] = store.store_snapshots([_department_snapshot("Yoro", "2025-12-03T20:00:00Z", 1100)])
+    assert store.get_index_entries("18")[-1]["previous_hash"] == latest[-1]["hash"]
+    assert store.latest_snapshots(["18"])[0]["hash"] == next_hash
+    tables = {row[0] for row in store._connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    store.close()
+    assert tables == {"snapshots", "candidate_votes"}
+
+
+def test_candidate_votes_deltas_and_rebuild(tmp_path):
+    store = LocalSnapshotStore(str(tmp_path / "snapshots.db"))
+    store.store_snapshots([
+        _department_snapshot("Atlántida", "2025-12-03T17:00:00Z", 1000),
+        _department_snapshot("Atlántida", "2025-12-03T18:00:00Z", 1200),
+        # Retroceso: ambos candidatos pierden votos.
+        _department_snapshot("Atlántida", "2025-12-03T19:00:00Z", 1100),
+        _department_snapshot("Comayagua", "2025-12-03T17:00:00Z", 900),
+    ])
+
+    series = store.candidate_series("01", slot=1)
+    assert [(row["votes"], row["previous_votes"], row["delta"]) for row in series] == [
+        (500, None, None),
+        (600, 500, 100),
+        (550, 600, -50),
+    ]
+
+    negatives = store.candidate_negative_deltas()
+    assert [(row["department_code"], row["slot"], row["delta"]) for row in negatives] == [
+        ("01", 1, -50),
+        ("01", 2, -25),
+    ]
+    assert store.candidate_negative_deltas(["04"]) == []
+    assert store.candidate_first_digit_counts("01", "2025-12-03T17:00:00Z") == {2: 1, 5: 1}
+
+    ingested = store._connection.execute("SELECT * FROM candidate_votes ORDER BY 1, 2, 3").fetchall()
+    assert store.rebuild_candidate_votes() == len(ingested) == 40  # 4 snapshots x 10 slots
+    rebuilt = store._connection.execute("SELECT * FROM candidate_votes ORDER BY 1, 2, 3").fetchall()
+    store.close()
+    assert [tuple(row) for row in rebuilt] == [tuple(row) for row in ingested]
+
+
+def test_streaming_exports_with_compression_and_time_range(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "EXPORT_CHUNK_SIZE", 2)
+    store = LocalSnapshotStore(str(tmp_path / "snapshots.db"))
+    store.store_snapshots([
+        _department_snapshot("Atlántida", f"2025-12-03T{hour}:00:00Z", 1000 + hour)
+        for hour in range(10, 15)
+    ])
+
+    json_path = tmp_path / "atlantida.json"
+    assert store.export_department_json("01", str(json_path)) == 5
+    expected = [
+        {
+            "timestamp_utc": row["timestamp_utc"],
+            "hash": row["hash"],
+            "previous_hash": row["previous_hash"],
+            "snapshot": json.loads(row["canonical_json"]),
+        }
+        for row in store._connection.execute("SELECT * FROM dept_01_snapshots ORDER BY timestamp_utc")
+    ]
+    # Mismo formato que el json.dumps(indent=2) de una sola pasada.
+    assert json_path.read_text(encoding="utf-8") == json.dumps(expected, ensure_ascii=False, indent=2)
+
+    jsonl_path = tmp_path / "atlantida.jsonl.gz"
+    count = store.export_department_jsonl(
+        "01", str(jsonl_path), start="2025-12-03T11:00:00Z", end="2025-12-03T13:00:00Z"
+    )
+    with gzip.open(jsonl_path, "rt", encoding="utf-8") as handle:
+        lines = [json.loads(line) for line in handle]
+    assert count == 3
+    assert lines == expected[1:4]
+
+    csv_path = tmp_path / "atlantida.csv"
+    assert store.export_department_csv("01", str(csv_path), start="2025-12-03T13:00:00Z") == 2
+    with csv_path.open(newline="", encoding="utf-8") as csv_file:
+        assert [row["hash"] for row in csv.DictReader(csv_file)] == [item["hash"] for item in expected[3:]]
+
+    empty_path = tmp_path / "vacio.json"
+    assert store.export_department_json("04", str(empty_path)) == 0
+    assert empty_path.read_text(encoding="utf-8") == "[]"
+
+    with pytest.raises(ValueError):
+        store.export_department_csv("01", str(tmp_path / "x.csv"), compression="bz2")
+
+    pa = pytest.importorskip("pyarrow")
+    zst_path = tmp_path / "atlantida.jsonl.zst"
+    store.export_department_jsonl("01", str(zst_path))
+    with pa.CompressedInputStream(pa.OSFile(str(zst_path)), "zstd") as handle:
+        assert len(handle.read().decode("utf-8").splitlines()) == 5
+
+    parquet_path = tmp_path / "atlantida.parquet"
+    assert store.export_department_parquet("01", str(parquet_path), end="2025-12-03T12:00:00Z") == 3
+    store.close()
+    table = pytest.importorskip("pyarrow.parquet").read_table(parquet_path)
+    assert table.column("hash").to_pylist() == [item["hash"] for item in expected[:3]]
+    assert table.column("total_votes").to_pylist() == [1010, 1011, 1012]
@@ -0,0 +1,88 @@
+import json
+
+from sentinel.core.hashchain import compute_hash
+from sentinel.core.normalyze import normalize_snapshot, snapshot_to_canonical_json
+from sentinel.core.storage import LocalSnapshotStore
+from sentinel.core.verify import load_checkpoints, verify_hashchain_file, verify_store
+
+
+def _snapshot(department, timestamp, total_votes):
+    raw = {
+        "registered_voters": 3000,
+        "total_votes": total_votes,
+        "valid_votes": total_votes - 20,
+        "null_votes": 10,
+        "blank_votes": 10,
+        "candidates": {"1": total_votes // 2, "2": total_votes // 4},
+    }
+    return normalize_snapshot(raw, department, timestamp)
+
+
+def _fill(store, hours, departments=("Atlántida", "Comayagua", "Yoro")):
+    store.store_snapshots([
+        _snapshot(department, f"2025-12-03T{hour:02d}:00:00Z", 1000 + hour)
+        for department in departments
+        for hour in hours
+    ])
+
+
+def test_verify_store_is_parallel_and_incremental(tmp_path):
+    db_path = str(tmp_path / "snapshots.db")
+    store = LocalSnapshotStore(db_path)
+    _fill(store, range(10, 15))
+
+    results = verify_store(db_path, workers=2)
+    assert sorted(results) == ["01", "04", "18"]
+    assert all(result.ok and result.length == 5 and result.verified == 5 for result in results.values())
+    assert load_checkpoints(tmp_path / "snapshots.db.verified.json")["01"]["length"] == 5
+
+    _fill(store, [15])
+    results = verify_store(db_path, workers=2)
+    assert [(result.resumed_from, result.verified, result.length) for result in results.values()] == [(5, 1, 6)] * 3
+
+    # Manipulación posterior al checkpoint: se detecta sin re-verificar lo anterior.
+    _fill(store, [16])
+    store._connection.execute(
+        "UPDATE dept_04_snapshots SET canonical_json = replace(canonical_json, '1016', '1916') "
+        "WHERE timestamp_utc = '2025-12-03T16:00:00Z'"
+    )
+    store._connection.commit()
+    results = verify_store(db_path, workers=1)
+    broken = results["04"].broken
+    assert (broken.position, broken.timestamp_utc, broken.reason) == (6, "2025-12-03T16:00:00Z", "hash_mismatch")
+    assert results["01"].ok and results["04"].verified == 0
+
+    # Manipulación anterior al checkpoint: solo --full la encuentra.
+    store._connection.execute(
+        "UPDATE dept_18_snapshots SET previous_hash = NULL WHERE timestamp_utc = '2025-12-03T12:00:00Z'"
+    )
+    store._connection.commit()
+    store.close()
+    assert verify_store(db_path, department_codes=["18"]).get("18").ok
+    broken = verify_store(db_path, department_codes=["18"], full=True)["18"].broken
+    assert (broken.position, broken.reason) == (2, "previous_mismatch")
+
+
+def test_verify_single_table_layout_and_pipeline_chain(tmp_path):
+    db_path = str(tmp_path / "snapshots.db")
+    store = LocalSnapshotStore(db_path, layout="single_table")
+    _fill(store, range(10, 13))
+    store.close()
+    assert all(result.length == 3 for result in verify_store(db_path).values())
+
+    output_dir = tmp_path / "pipeline"
+    (output_dir / "normalized").mkdir(parents=True)
+    entries, previous_hash = [], None
+    for hour in range(10, 13):
+        name = f"snapshot_{hour}"
+        canonical_json = snapshot_to_canonical_json(_snapshot("Yoro", f"2025-12-03T{hour}:00:00Z", 1000 + hour))
+        (output_dir / "normalized" / f"{name}.json").write_text(canonical_json + "\n", encoding="utf-8")
+        current_hash = compute_hash(canonical_json, previous_hash)
+        entries.append({"snapshot": name, "hash": current_hash, "previous_hash": previous_hash})
+        previous_hash = current_hash
+    (output_dir / "hashchain.json").write_text(json.dumps(entries), encoding="utf-8")
+    assert verify_hashchain_file(output_dir).ok
+
+    (output_dir / "normalized" / "snapshot_11.json").write_text('{"meta": {}}\n', encoding="utf-8")
+    broken = verify_hashchain_file(output_dir).broken
+    assert (broken.position, broken.timestamp_utc, broken.reason) == (1, "snapshot_11", "not_canonical")
@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+
+from sentinel.core.models import CandidateResult
+from sentinel.core.normalyze import normalize_snapshot, snapshot_to_dict
+from sentinel.core.storage import LocalSnapshotStore
+from sentinel.core.vote_matrix import VoteMatrix, vote_matrices
+
+
+def _snapshot(department, timestamp, votes):
+    raw = {"total_votes": sum(votes), "candidates": {str(slot): value for slot, value in enumerate(votes, start=1)}}
+    return normalize_snapshot(raw, department, timestamp, candidate_count=len(votes))
+
+
+# Slot 1 pierde 50 a las 19:00 y no recupera su máximo a las 20:00 (sube 10).
+SERIES = [
+    ("2025-12-03T17:00:00Z", [500, 250]),
+    ("2025-12-03T18:00:00Z", [600, 300]),
+    ("2025-12-03T19:00:00Z", [550, 350]),
+    ("2025-12-03T20:00:00Z", [560, 400]),
+]
+
+
+def _snapshots(department="Atlántida"):
+    return [_snapshot(department, timestamp, votes) for timestamp, votes in SERIES]
+
+
+def test_vectorized_deltas_peaks_and_shares():
+    # Orden de entrada irrelevante: las filas quedan ordenadas por timestamp.
+    matrix = VoteMatrix.from_snapshots(reversed(_snapshots()))
+
+    assert matrix.department_code == "01"
+    assert matrix.shape == (4, 2)
+    assert matrix.votes.dtype == np.int64
+    assert matrix.slots.tolist() == [1, 2]
+    assert matrix.timestamp_strings()[0] == "2025-12-03T17:00:00Z"
+    assert matrix.column(1).tolist() == [500, 600, 550, 560]
+    assert matrix.deltas()[:, 0].tolist() == [0, 100, -50, 10]
+    assert matrix.peaks()[:, 0].tolist() == [500, 600, 600, 600]
+    np.testing.assert_allclose(matrix.shares()[0], [2 / 3, 1 / 3])
+
+    assert matrix.negative_deltas()[:, 0].tolist() == [False, False, True, False]
+    assert matrix.negative_deltas(from_peak=True)[:, 0].tolist() == [False, False, True, True]
+    assert not matrix.negative_deltas(from_peak=True)[:, 1].any()
+    assert matrix.negative_delta_rows(from_peak=True) == [
+        {"department_code": "01", "timestamp_utc": "2025-12-03T19:00:00Z", "slot": 1,
+         "votes": 550, "previous_votes": 600, "delta": -50},
+        {"department_code": "01", "timestamp_utc": "2025-12-03T20:00:00Z", "slot": 1,
+         "votes": 560, "previous_votes": 600, "delta": -40},
+    ]
+    assert matrix.between("2025-12-03T18:00:00Z", "2025-12-03T19:00:00Z").column(1).tolist() == [600, 550]
+    with pytest.raises(KeyError):
+        matrix.column(3)
+
+
+def test_missing_candidate_is_not_a_loss():
+    first, second = _snapshots()[:2]
+    # El slot 2 desaparece del segundo snapshot.
+    second = type(second)(meta=second.meta, totals=second.totals, candidates=[CandidateResult(slot=1, votes=600)])
+    matrix = VoteMatrix.from_snapshots([first, second])
+
+    assert matrix.present.tolist() == [[True, True], [True, False]]
+    assert matrix.deltas()[1].tolist() == [100, -250]
+    assert not matrix.negative_deltas().any()
+
+
+def test_store_json_and_snapshots_build_the_same_matrix(tmp_path):
+    snapshots = _snapshots() + [_snapshot("Comayagua", "2025-12-03T17:00:00Z", [900, 100])]
+    store = LocalSnapshotStore(str(tmp_path / "snapshots.db"))
+    store.store_snapshots(snapshots)
+
+    from_store = VoteMatrix.from_store(store, "01")
+    matrices = vote_matrices(snapshots)
+    from_json = VoteMatrix.from_json(snapshot_to_dict(snapshot) for snapshot in snapshots[:4])
+
+    assert sorted(matrices) == ["01", "04"]
+    for matrix in (matrices["01"], from_json):
+        np.testing.assert_array_equal(matrix.votes, from_store.votes)
+        np.testing.assert_array_equal(matrix.timestamps, from_store.timestamps)
+    # Mismo resultado que la ventana LAG de SQLite.
+    assert [
+        (row["slot"], row["delta"]) for row in from_store.negative_delta_rows()
+    ] == [(row["slot"], row["delta"]) for row in store.candidate_negative_deltas(["01"])]
+    assert VoteMatrix.from_store(store, "01", start="2025-12-03T19:00:00Z").shape == (2, 2)
+    assert VoteMatrix.from_store(store, "09").shape == (0, 0)
+    store.close()
+
+    with pytest.raises(ValueError):
+        VoteMatrix.from_snapshots(snapshots)
+
+
+def test_from_parquet_matches_snapshots(tmp_path):
+    pytest.importorskip("pyarrow")
+    from sentinel.core.columnar import ColumnarSnapshotStore
+
+    store = ColumnarSnapshotStore(tmp_path)
+    store.append_many((snapshot, "ATL", None) for snapshot in _snapshots())
+
+    matrix = VoteMatrix.from_parquet(store, "01", end="2025-12-03T19:00:00Z")
+    expected = VoteMatrix.from_snapshots(_snapshots()[:3])
+    np.testing.assert_array_equal(matrix.votes, expected.votes)
+    np.testing.assert_array_equal(matrix.timestamps, expected.timestamps)
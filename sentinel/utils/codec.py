@@ -0,0 +1,94 @@
+"""
+Codec JSON compartido: usa orjson si está instalado y json de la stdlib si no.
+
+La salida equivale a json.dumps(..., ensure_ascii=False) con separadores
+compactos (o indent=2). Diferencia de orjson: los floats con exponente se
+escriben sin "+" (1e16 en lugar de 1e+16). orjson escribe NaN/Infinity como
+null, así que esos objetos se serializan con la stdlib (NaN, Infinity) en
+ambos backends.
+
+El JSON canónico y el hash de los snapshots no pasan por este módulo
+(normalyze.snapshot_to_canonical_parts): siguen siendo los bytes de la stdlib.
+"""
+
+import json
+import math
+from pathlib import Path
+from typing import Any, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dependencia opcional
+    orjson = None
+
+# orjson.JSONDecodeError hereda de json.JSONDecodeError: un solo except sirve para ambos.
+JSONDecodeError = json.JSONDecodeError
+
+
+def backend() -> str:
+    return "orjson" if orjson is not None else "json"
+
+
+def loads(data: Union[bytes, bytearray, str]) -> Any:
+    """Decodifica JSON desde bytes o str."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # NaN/Infinity, enteros de más de 64 bits o BOM: la stdlib los acepta.
+            pass
+    return json.loads(data)
+
+
+def load_path(path: Union[str, Path]) -> Any:
+    return loads(Path(path).read_bytes())
+
+
+def dumps_bytes(obj: Any, *, indent: Optional[int] = None, sort_keys: bool = False) -> bytes:
+    """
+    JSON en UTF-8. Sin indent es compacto (separadores "," y ":").
+
+    orjson solo acelera indent=None o indent=2; con otros valores, con tipos que
+    orjson no serializa (claves no str, enteros de más de 64 bits) o con floats
+    no finitos, se usa la stdlib.
+    """
+    if orjson is not None and indent in (None, 2):
+        option = (orjson.OPT_INDENT_2 if indent else 0) | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        try:
+            data = orjson.dumps(obj, option=option)
+        except TypeError:
+            pass
+        else:
+            # Solo hace falta recorrer el objeto si orjson escribió algún null.
+            if b"null" not in data or not _has_non_finite(obj):
+                return data
+    return _stdlib_dumps(obj, indent, sort_keys).encode("utf-8")
+
+
+def dumps(obj: Any, *, indent: Optional[int] = None, sort_keys: bool = False) -> str:
+    if orjson is None:
+        return _stdlib_dumps(obj, indent, sort_keys)
+    return dumps_bytes(obj, indent=indent, sort_keys=sort_keys).decode("utf-8")
+
+
+def write_path(path: Union[str, Path], obj: Any, *, indent: Optional[int] = None, sort_keys: bool = False) -> None:
+    Path(path).write_bytes(dumps_bytes(obj, indent=indent, sort_keys=sort_keys))
+
+
+def _has_non_finite(obj: Any) -> bool:
+    pending = [obj]
+    while pending:
+        value = pending.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            pending.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            pending.extend(value)
+    return False
+
+
+def _stdlib_dumps(obj: Any, indent: Optional[int], sort_keys: bool) -> str:
+    separators = (",", ":") if indent is None else None
+    return json.dumps(obj, ensure_ascii=False, indent=indent, sort_keys=sort_keys, separators=separators)